@@ -0,0 +1,166 @@
+# consumer_service/batch_writer.py
+import logging
+import time
+from collections import namedtuple
+
+from kafka import TopicPartition
+from kafka.structs import OffsetAndMetadata
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+import metrics
+from dedup import DUPLICATE
+
+logger = logging.getLogger(__name__)
+
+# 중복 키 오류 코드 (동시 upsert 경합 시 발생할 수 있음)
+DUPLICATE_KEY_ERROR = 11000
+
+# duplicates 는 쓰기 전 중복 인덱스로 걸러낸 것과 upsert 시 이미 있던 것의 합,
+# skipped 는 URL 이 없거나 처리할 수 없었던 메시지, timestamps 는 Kafka 레코드 시각(ms)
+FlushResult = namedtuple('FlushResult', ['size', 'inserted', 'duplicates', 'skipped', 'latency_ms', 'offsets',
+                                         'timestamps'])
+
+
+class BulkUpsertWriter:
+    """Buffers consumed articles and writes them as one unordered bulk upsert.
+
+    A batch is flushed once it holds ``max_batch_size`` messages or its oldest
+    message has waited ``max_batch_wait`` seconds. Offsets are only handed back
+    to the caller after the write succeeded, so they can be committed safely.
+    With a ``dedup`` index, definite duplicates are dropped before the write.
+    With a ``version_collection``, a per-collection version counter is bumped
+    whenever a flush inserted new articles, so API caches can invalidate.
+    """
+
+    def __init__(self, collection, max_batch_size=500, max_batch_wait=1.0, dedup=None,
+                 version_collection=None):
+        self.collection = collection
+        self.version_collection = version_collection
+        self.max_batch_size = max_batch_size
+        self.max_batch_wait = max_batch_wait
+        self.dedup = dedup
+        self._docs = []
+        self._verdicts = []
+        self._offsets = {}
+        self._timestamps = []
+        self._known_duplicates = 0
+        self._skipped = 0
+        self._pending = 0
+        self._first_added_at = None
+
+    def _bump_version(self):
+        # 새 기사가 들어왔음을 API 캐시에 알림 (실패해도 기사 저장은 이미 끝났으므로 경고만)
+        try:
+            self.version_collection.update_one(
+                {'_id': self.collection.name},
+                {'$inc': {'version': 1}, '$currentDate': {'updated_at': True}},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning("Could not bump collection version: %s", str(e))
+
+    def add(self, doc, topic, partition, offset, timestamp=None):
+        """Buffer one message. ``doc`` may be None for messages that are skipped
+        but whose offset still has to be committed; ``timestamp`` is the Kafka
+        record time in ms, used for the end-to-end latency."""
+        if self._first_added_at is None:
+            self._first_added_at = time.monotonic()
+        if doc is None:
+            self._skipped += 1
+        elif self.dedup is not None:
+            verdict = self.dedup.check(doc['url'])
+            if verdict == DUPLICATE:
+                self._known_duplicates += 1
+                doc = None
+        if timestamp is not None:
+            self._timestamps.append(timestamp)
+        if doc is not None:
+            self._docs.append(doc)
+            if self.dedup is not None:
+                self._verdicts.append(verdict)
+        tp = TopicPartition(topic, partition)
+        self._offsets[tp] = max(offset, self._offsets.get(tp, -1))
+        self._pending += 1
+
+    def __len__(self):
+        return self._pending
+
+    def time_until_flush(self):
+        if self._first_added_at is None:
+            return self.max_batch_wait
+        elapsed = time.monotonic() - self._first_added_at
+        return max(0.0, self.max_batch_wait - elapsed)
+
+    def should_flush(self):
+        if not self._pending:
+            return False
+        return self._pending >= self.max_batch_size or self.time_until_flush() <= 0
+
+    def flush(self):
+        """Write the buffered batch. Raises on failure and keeps the buffer so
+        the caller can retry; offsets are returned only on success."""
+        if not self._pending:
+            return None
+
+        started = time.monotonic()
+        inserted = 0
+        upserted_indexes = set()
+        if self._docs:
+            ops = [
+                UpdateOne({'url': doc['url']}, {'$setOnInsert': doc}, upsert=True)
+                for doc in self._docs
+            ]
+            try:
+                result = self.collection.bulk_write(ops, ordered=False)
+                inserted = result.upserted_count
+                upserted_indexes = set(result.upserted_ids)
+            except BulkWriteError as e:
+                # 다른 컨슈머와의 upsert 경합으로 생긴 중복 키 오류는 무시
+                errors = e.details.get('writeErrors', [])
+                if any(err.get('code') != DUPLICATE_KEY_ERROR for err in errors):
+                    metrics.write_failures.inc()
+                    raise
+                inserted = e.details.get('nUpserted', 0)
+                upserted_indexes = {item['index'] for item in e.details.get('upserted', [])}
+            except Exception:
+                metrics.write_failures.inc()
+                raise
+
+        for idx, verdict in enumerate(self._verdicts):
+            self.dedup.record_outcome(verdict, idx in upserted_indexes)
+
+        if inserted and self.version_collection is not None:
+            self._bump_version()
+
+        latency_ms = (time.monotonic() - started) * 1000
+        offsets = {
+            tp: OffsetAndMetadata(offset + 1, None)
+            for tp, offset in self._offsets.items()
+        }
+        flush_result = FlushResult(
+            size=self._pending,
+            inserted=inserted,
+            duplicates=len(self._docs) - inserted + self._known_duplicates,
+            skipped=self._skipped,
+            latency_ms=latency_ms,
+            offsets=offsets,
+            timestamps=self._timestamps,
+        )
+        metrics.record_flush(flush_result, time.time() * 1000)
+        # 배치별 로그는 디버그로만 남기고, 처리량은 컨슈머가 주기적으로 요약해 기록
+        logger.debug(
+            "Flushed batch: size=%d inserted=%d duplicates=%d skipped=%d latency=%.1fms",
+            flush_result.size, flush_result.inserted, flush_result.duplicates, flush_result.skipped,
+            flush_result.latency_ms,
+        )
+
+        self._docs = []
+        self._verdicts = []
+        self._offsets = {}
+        self._timestamps = []
+        self._known_duplicates = 0
+        self._skipped = 0
+        self._pending = 0
+        self._first_added_at = None
+        return flush_result
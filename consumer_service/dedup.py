@@ -0,0 +1,116 @@
+# consumer_service/dedup.py
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# check() 결과
+NEW = 'new'              # 블룸 필터에 없음 -> 확실히 새로운 URL
+MAYBE = 'maybe'          # 블룸 필터에 있음 -> DB upsert 로 최종 판정
+DUPLICATE = 'duplicate'  # 최근 URL LRU 에 있음 -> 확실한 중복, DB 에 보내지 않음
+
+
+def url_key(url):
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+
+class BloomFilter:
+    def __init__(self, expected_items, fp_rate):
+        expected_items = max(1, expected_items)
+        self.num_bits = max(8, int(-expected_items * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / expected_items * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key):
+        # 16바이트 다이제스트를 두 해시로 나눠 double hashing
+        h1 = int.from_bytes(key[:8], 'little')
+        h2 = int.from_bytes(key[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    @property
+    def size_bytes(self):
+        return len(self._bits)
+
+
+class UrlDedupIndex:
+    """Memory-bounded URL dedup in front of the database.
+
+    An exact LRU of recently seen URL hashes catches the repeats of hourly
+    polls without touching Mongo. Everything else goes through a Bloom filter:
+    a negative means the URL is new, a positive still goes to the url-keyed
+    upsert, and the write outcome tells whether it was a false positive.
+    """
+
+    def __init__(self, expected_items=1_000_000, fp_rate=0.01, lru_size=100_000):
+        self.bloom = BloomFilter(expected_items, fp_rate)
+        self.lru_size = lru_size
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {
+            'lru_hits': 0,         # 확실한 중복으로 버린 메시지
+            'bloom_misses': 0,     # 블룸 필터가 새 URL 로 판정
+            'bloom_hits': 0,       # 블룸 필터가 중복 가능성 판정
+            'db_duplicates': 0,    # 블룸 양성 중 DB 에서도 중복으로 확인된 수
+            'false_positives': 0,  # 블룸 양성이었지만 실제로는 새 URL
+        }
+
+    def _remember(self, key):
+        self.bloom.add(key)
+        self._lru[key] = None
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def warm(self, collection, batch_size=10000):
+        """Stream existing urls from the news collection, oldest first, so the
+        LRU ends up holding the most recent ones."""
+        started = time.monotonic()
+        count = 0
+        cursor = collection.find({'url': {'$type': 'string'}}, {'url': 1, '_id': 0}).sort('_id', 1).batch_size(batch_size)
+        with self._lock:
+            for doc in cursor:
+                self._remember(url_key(doc['url']))
+                count += 1
+        logger.info("Warmed URL dedup index with %d urls in %.1fs (bloom=%dKB, lru=%d)",
+                    count, time.monotonic() - started, self.bloom.size_bytes // 1024, len(self._lru))
+        return count
+
+    def check(self, url):
+        """Classify ``url`` and remember it, returning NEW, MAYBE or DUPLICATE."""
+        key = url_key(url)
+        with self._lock:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                self.counters['lru_hits'] += 1
+                return DUPLICATE
+            verdict = MAYBE if key in self.bloom else NEW
+            self.counters['bloom_hits' if verdict == MAYBE else 'bloom_misses'] += 1
+            self._remember(key)
+            return verdict
+
+    def record_outcome(self, verdict, inserted):
+        """Feed back the upsert result for a URL that passed check()."""
+        if verdict != MAYBE:
+            return
+        with self._lock:
+            self.counters['false_positives' if inserted else 'db_duplicates'] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self.counters)
+            stats['lru_size'] = len(self._lru)
+        # 새 URL 중 블룸 필터가 잘못 양성으로 판정한 비율
+        new_urls = stats['bloom_misses'] + stats['false_positives']
+        stats['false_positive_rate'] = stats['false_positives'] / new_urls if new_urls else 0.0
+        return stats
@@ -0,0 +1,34 @@
+# consumer_service/indexes.py
+import logging
+from collections import namedtuple
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+IndexSpec = namedtuple('IndexSpec', ['keys', 'options'])
+
+# 기사 컬렉션 인덱스 (data_api_service/database/indexes.py 의 news 항목과 동일하게 유지)
+NEWS_INDEXES = [
+    # url 기준 upsert 가 전체 스캔이 되지 않도록 unique 인덱스
+    IndexSpec([('url', 1)], {'unique': True, 'partialFilterExpression': {'url': {'$type': 'string'}}}),
+    # 클러스터 단위 조회용
+    IndexSpec([('cluster_id', 1)], {}),
+    # 최신순 정렬 및 소스별 조회용
+    IndexSpec([('published_at', -1), ('source', 1)], {}),
+    # /news 커서 페이지네이션용 (published_at, _id)
+    IndexSpec([('published_at', -1), ('_id', -1)], {}),
+    # 구독 소스별 최신 기사 조회용
+    IndexSpec([('source', 1), ('published_at', -1), ('_id', -1)], {}),
+]
+
+
+def apply_indexes(collection, specs=NEWS_INDEXES):
+    """Create every index in ``specs``; existing identical indexes are left as is."""
+    for spec in specs:
+        try:
+            name = collection.create_index(spec.keys, **spec.options)
+            logger.info("Index ready on %s: %s", collection.name, name)
+        except OperationFailure as e:
+            # 같은 이름의 다른 정의나 기존 중복 데이터가 있으면 시작은 계속함
+            logger.warning("Could not create index %s on %s: %s", spec.keys, collection.name, str(e))
@@ -1,54 +1,182 @@
-from kafka import KafkaConsumer
+from kafka import KafkaConsumer, ConsumerRebalanceListener
+from kafka.errors import CommitFailedError
 from pymongo import MongoClient
 from datetime import datetime
 import json
+import logging
+import multiprocessing
 import os
+import re
 import time
+from functools import partial
+
+import metrics
+from batch_writer import BulkUpsertWriter
+from indexes import apply_indexes
+from dedup import UrlDedupIndex
+from near_dup import NearDuplicateIndex
+from normalize import backfill_published_at, normalize_article
+from workers import PartitionWorkerPool
 
 # 환경 변수에서 설정 값 로드
-KAFKA_TOPICS = os.environ.get('KAFKA_TOPICS').replace(' ','').split(',')
-KAFKA_SERVER = os.environ.get('KAFKA_SERVER') 
+KAFKA_TOPICS = [t for t in os.environ.get('KAFKA_TOPICS', '').replace(' ','').split(',') if t]
+KAFKA_TOPIC_PATTERN = os.environ.get('KAFKA_TOPIC_PATTERN')  # 설정 시 KAFKA_TOPICS 대신 정규식으로 구독
+KAFKA_SERVER = os.environ.get('KAFKA_SERVER')
 KAFKA_GROUP_ID = os.environ.get('KAFKA_GROUP_ID')
 MONGODB_URI = os.environ.get('MONGODB_URI')
 MONGODB_COLLECTION = os.environ.get('MONGODB_COLLECTION')
+MONGODB_VERSION_COLLECTION = os.environ.get('MONGODB_VERSION_COLLECTION', 'collection_versions')  # API 캐시 무효화용 버전 카운터
+BATCH_MAX_SIZE = int(os.environ.get('CONSUMER_BATCH_MAX_SIZE', 500))  # 배치당 최대 메시지 수
+BATCH_MAX_WAIT_MS = int(os.environ.get('CONSUMER_BATCH_MAX_WAIT_MS', 1000))  # 배치 최대 대기 시간 (ms)
+CONSUMER_WORKERS = int(os.environ.get('CONSUMER_WORKERS', 4))  # 프로세스당 파티션 워커 스레드 수
+CONSUMER_PROCESSES = int(os.environ.get('CONSUMER_PROCESSES', 1))  # 같은 그룹으로 실행할 컨슈머 프로세스 수
+DEDUP_EXPECTED_ITEMS = int(os.environ.get('DEDUP_EXPECTED_ITEMS', 1_000_000))  # 블룸 필터 예상 URL 수
+DEDUP_FP_RATE = float(os.environ.get('DEDUP_FP_RATE', 0.01))  # 블룸 필터 목표 오탐률
+DEDUP_LRU_SIZE = int(os.environ.get('DEDUP_LRU_SIZE', 100_000))  # 최근 URL 해시 LRU 크기
+NEAR_DUP_CAPACITY = int(os.environ.get('NEAR_DUP_CAPACITY', 200_000))  # 유사 기사 비교 대상으로 유지할 최근 기사 수
+NEAR_DUP_THRESHOLD = float(os.environ.get('NEAR_DUP_THRESHOLD', 0.6))  # 같은 클러스터로 묶을 최소 유사도
+METRICS_PORT = int(os.environ.get('CONSUMER_METRICS_PORT', 9108))  # /metrics 포트 (프로세스마다 +1)
+SUMMARY_INTERVAL = int(os.environ.get('CONSUMER_SUMMARY_INTERVAL', 30))  # 처리량 요약 로그 간격 (초)
+LAG_INTERVAL = int(os.environ.get('CONSUMER_LAG_INTERVAL', 15))  # 파티션별 lag 계산 간격 (초)
+POLL_TIMEOUT_MS = 500
 
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def main():
-    time.sleep(60)  # 시작 지연
+
+def get_collection():
     # MongoDB 클라이언트 설정
     client = MongoClient(MONGODB_URI)
     db = client.get_default_database()
-    
+    return db[MONGODB_COLLECTION]
+
+
+def prepare_document(message, near_dup):
+    # 제공자별 형식을 표준 스키마로 변환 (published_at 은 날짜 타입)
+    msg_data = normalize_article(message.value)
+    if not msg_data.get('url'):
+        # URL 이 없으면 중복 확인이 불가능하므로 건너뜀
+        return None
+    msg_data['topic'] = message.topic
+    msg_data['created_at'] = datetime.utcnow()
+    # 다른 제공자가 보낸 같은 기사를 하나의 클러스터로 묶음
+    near_dup.assign(msg_data)
+    return msg_data
+
+
+def commit_ready(consumer, pool, reporter=None):
+    offsets = pool.pop_ready_offsets()
+    if not offsets:
+        return
+    try:
+        consumer.commit(offsets)
+        if reporter is not None:
+            reporter.committed(offsets)
+    except CommitFailedError as e:
+        # 리밸런스로 파티션이 이동한 경우 새 소유자가 다시 처리함 (upsert 라 안전)
+        logging.warning("Offset commit failed: %s", str(e))
+
+
+class DrainOnRevoke(ConsumerRebalanceListener):
+    """Writes and commits everything buffered before partitions move away."""
+
+    def __init__(self, consumer, pool, reporter=None):
+        self.consumer = consumer
+        self.pool = pool
+        self.reporter = reporter
+
+    def on_partitions_revoked(self, revoked):
+        self.pool.drain()
+        commit_ready(self.consumer, self.pool, self.reporter)
+        if self.reporter is not None:
+            self.reporter.revoked(revoked)
+
+    def on_partitions_assigned(self, assigned):
+        logging.info("Assigned partitions: %s", sorted(f"{tp.topic}[{tp.partition}]" for tp in assigned))
+
+
+def run_consumer(index=0):
+    # 처리량, 중복률, 쓰기 지연, 파티션별 lag 을 /metrics 로 노출
+    metrics.start_metrics_server(METRICS_PORT + index)
+    collection = get_collection()
+    # 기존 URL 로 중복 인덱스를 미리 채워 DB 조회 없이 중복을 걸러냄
+    dedup = UrlDedupIndex(expected_items=DEDUP_EXPECTED_ITEMS,
+                          fp_rate=DEDUP_FP_RATE,
+                          lru_size=DEDUP_LRU_SIZE)
+    dedup.warm(collection)
+    near_dup = NearDuplicateIndex(capacity=NEAR_DUP_CAPACITY, threshold=NEAR_DUP_THRESHOLD)
+    near_dup.warm(collection)
+    pool = PartitionWorkerPool(
+        CONSUMER_WORKERS,
+        writer_factory=lambda: BulkUpsertWriter(collection,
+                                                max_batch_size=BATCH_MAX_SIZE,
+                                                max_batch_wait=BATCH_MAX_WAIT_MS / 1000,
+                                                dedup=dedup,
+                                                version_collection=collection.database[MONGODB_VERSION_COLLECTION]),
+        process=partial(prepare_document, near_dup=near_dup),
+        queue_size=BATCH_MAX_SIZE * 2,
+    )
+    pool.start()
+    reporter = metrics.ConsumerReporter(summary_interval=SUMMARY_INTERVAL, lag_interval=LAG_INTERVAL, dedup=dedup)
+
+    # 모든 토픽을 하나의 Kafka Consumer 로 구독
+    consumer = KafkaConsumer(
+        bootstrap_servers=[KAFKA_SERVER],
+        auto_offset_reset='earliest',
+        enable_auto_commit=False,  # 오프셋은 배치 쓰기 성공 후 직접 커밋
+        group_id=KAFKA_GROUP_ID,  # 적절한 그룹 ID로 변경
+        value_deserializer=lambda x: json.loads(x.decode('utf-8')))
+    listener = DrainOnRevoke(consumer, pool, reporter)
+    if KAFKA_TOPIC_PATTERN:
+        consumer.subscribe(pattern=KAFKA_TOPIC_PATTERN, listener=listener)
+    else:
+        consumer.subscribe(topics=KAFKA_TOPICS, listener=listener)
+
+    # Kafka에서 메시지 읽기 및 파티션별 워커로 분배
+    try:
+        while True:
+            records = consumer.poll(timeout_ms=POLL_TIMEOUT_MS, max_records=BATCH_MAX_SIZE)
+            for tp, messages in records.items():
+                metrics.messages_consumed.inc(tp.topic, amount=len(messages))
+                for message in messages:
+                    pool.submit(message)
+            commit_ready(consumer, pool, reporter)
+            reporter.maybe_report(consumer)
+    finally:
+        pool.stop()
+        commit_ready(consumer, pool, reporter)
+        reporter.log_summary()
+        consumer.close(autocommit=False)
+
+
+def main():
+    time.sleep(60)  # 시작 지연
+    if not KAFKA_TOPICS and not KAFKA_TOPIC_PATTERN:
+        raise ValueError("Either KAFKA_TOPICS or KAFKA_TOPIC_PATTERN must be set")
+    if KAFKA_TOPIC_PATTERN:
+        re.compile(KAFKA_TOPIC_PATTERN)  # 잘못된 정규식은 시작 시점에 실패
+
+    collection = get_collection()
     # MongoDB에 컬렉션이 존재하는지 확인
-    if MONGODB_COLLECTION not in db.list_collection_names():
-        print(f"Creating new collection: {MONGODB_COLLECTION}")
-    
-    collection = db[MONGODB_COLLECTION]
-
-    # Kafka Consumer 설정
-
-    for topic in KAFKA_TOPICS :
-        consumer = KafkaConsumer(
-            topic,
-            bootstrap_servers=[KAFKA_SERVER],
-            auto_offset_reset='earliest',
-            enable_auto_commit=True,
-            group_id=KAFKA_GROUP_ID,  # 적절한 그룹 ID로 변경
-            value_deserializer=lambda x: json.loads(x.decode('utf-8')))
-
-        # Kafka에서 메시지 읽기 및 MongoDB에 저장
-        for message in consumer:
-            msg_data = message.value
-            print("Received message:", msg_data)
-            msg_data['topic'] = topic
-            msg_data['created_at'] = datetime.utcnow()
-            # URL 컬럼 기준 중복 확인
-            if collection.find_one({'url': msg_data.get('url')}) is None:
-                # MongoDB에 데이터 삽입
-                collection.insert_one(msg_data)
-                print(f"Inserted new document with URL: {msg_data.get('url')}")
-            else:
-                print(f"Document with URL: {msg_data.get('url')} already exists. Skipping insertion.")
+    if MONGODB_COLLECTION not in collection.database.list_collection_names():
+        logging.info("Creating new collection: %s", MONGODB_COLLECTION)
+    # url upsert 및 API 조회에 필요한 인덱스를 시작 시 생성 (이미 있으면 그대로 둠)
+    apply_indexes(collection)
+    backfill_published_at(collection)
+    collection.database.client.close()
+
+    if CONSUMER_PROCESSES <= 1:
+        run_consumer()
+        return
+
+    # 같은 group_id 로 여러 프로세스를 띄워 파티션을 코어별로 분산
+    processes = [
+        multiprocessing.Process(target=run_consumer, args=(i,), name=f"consumer-{i}")
+        for i in range(CONSUMER_PROCESSES)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
 
 if __name__ == "__main__":
     main()
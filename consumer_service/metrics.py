@@ -0,0 +1,259 @@
+# consumer_service/metrics.py
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+WRITE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 메시지 생성부터 저장까지는 배치 대기와 재시도가 포함되므로 더 넓게 잡음
+END_TO_END_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+
+
+class Metric:
+    """Values per label set; updated from worker threads under one lock."""
+
+    type = 'untyped'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+        self.series = {}
+
+    def _label_text(self, label_values, extra=None):
+        pairs = list(zip(self.labels, label_values)) + (extra or [])
+        if not pairs:
+            return ''
+        return '{%s}' % ','.join('%s="%s"' % (key, str(value).replace('\\', '\\\\').replace('"', '\\"'))
+                                 for key, value in pairs)
+
+    def render(self):
+        with self._lock:
+            series = {key: list(value) if isinstance(value, list) else value for key, value in self.series.items()}
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.type}']
+        if not series and not self.labels:
+            series = {(): self._empty()}
+        lines += self._samples(series)
+        return lines
+
+    def _empty(self):
+        return 0
+
+    def _samples(self, series):
+        return [f'{self.name}{self._label_text(key)} {value}' for key, value in series.items()]
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self.series[label_values] = self.series.get(label_values, 0) + amount
+
+    def total(self):
+        with self._lock:
+            return sum(self.series.values())
+
+
+class Gauge(Metric):
+    type = 'gauge'
+
+    def set(self, value, *label_values):
+        with self._lock:
+            self.series[label_values] = value
+
+    def remove(self, *label_values):
+        with self._lock:
+            self.series.pop(label_values, None)
+
+    def values(self):
+        with self._lock:
+            return dict(self.series)
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=WRITE_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = buckets
+
+    def observe_many(self, values, *label_values):
+        with self._lock:
+            data = self.series.get(label_values)
+            if data is None:
+                data = self.series[label_values] = self._empty()
+            for value in values:
+                for i, bound in enumerate(self.buckets):
+                    if value <= bound:
+                        data[i] += 1
+                data[-2] += value
+                data[-1] += 1
+
+    def observe(self, value, *label_values):
+        self.observe_many((value,), *label_values)
+
+    def _empty(self):
+        # 버킷별 개수, 합계, 개수
+        return [0] * len(self.buckets) + [0.0, 0]
+
+    def _samples(self, series):
+        lines = []
+        for key, data in series.items():
+            for bound, count in zip(self.buckets, data):
+                lines.append(f'{self.name}_bucket{self._label_text(key, [("le", repr(bound))])} {count}')
+            lines.append(f'{self.name}_bucket{self._label_text(key, [("le", "+Inf")])} {data[-1]}')
+            lines.append(f'{self.name}_sum{self._label_text(key)} {data[-2]}')
+            lines.append(f'{self.name}_count{self._label_text(key)} {data[-1]}')
+        return lines
+
+
+messages_consumed = Counter('consumer_messages_total', 'Kafka records handed to the partition workers.', ('topic',))
+articles = Counter('consumer_articles_total', 'Consumed records by outcome (inserted, duplicate, skipped).',
+                   ('outcome',))
+batches = Counter('consumer_batches_total', 'Bulk writes to MongoDB.')
+write_failures = Counter('consumer_write_failures_total', 'Failed bulk writes (retried).')
+write_latency = Histogram('consumer_write_duration_seconds', 'Duration of one bulk upsert.')
+end_to_end_latency = Histogram('consumer_end_to_end_seconds',
+                               'Kafka record timestamp to the MongoDB write being acknowledged.',
+                               buckets=END_TO_END_BUCKETS)
+partition_lag = Gauge('consumer_lag_messages', 'Latest offset minus the committed offset per partition.',
+                      ('topic', 'partition'))
+METRICS = (messages_consumed, articles, batches, write_failures, write_latency, end_to_end_latency, partition_lag)
+
+
+def render():
+    lines = []
+    for metric in METRICS:
+        lines += metric.render()
+    return '\n'.join(lines) + '\n'
+
+
+def record_flush(result, now_ms):
+    """Export one successful FlushResult of the batch writer."""
+    batches.inc()
+    articles.inc('inserted', amount=result.inserted)
+    articles.inc('duplicate', amount=result.duplicates)
+    articles.inc('skipped', amount=result.skipped)
+    write_latency.observe(result.latency_ms / 1000)
+    if result.timestamps:
+        end_to_end_latency.observe_many([max(0.0, (now_ms - ts) / 1000) for ts in result.timestamps])
+
+
+class ConsumerReporter:
+    """Updates per-partition lag and logs a throughput summary, from the polling thread.
+
+    Lag is the latest offset of each assigned partition minus the offset this
+    process last committed for it (fetched from the group once when unknown),
+    i.e. what the consumer group still has to write.
+    """
+
+    def __init__(self, summary_interval=30, lag_interval=15, dedup=None):
+        self.summary_interval = summary_interval
+        self.lag_interval = lag_interval
+        self.dedup = dedup
+        self._committed = {}
+        self._next_lag = 0.0
+        self._next_summary = time.monotonic() + summary_interval
+        self._last = self._totals()
+        self._last_at = time.monotonic()
+
+    def committed(self, offsets):
+        for tp, meta in offsets.items():
+            self._committed[tp] = meta.offset
+
+    def revoked(self, partitions):
+        for tp in partitions:
+            self._committed.pop(tp, None)
+            partition_lag.remove(tp.topic, str(tp.partition))
+
+    def update_lag(self, consumer):
+        assignment = list(consumer.assignment())
+        if not assignment:
+            return
+        end_offsets = consumer.end_offsets(assignment)
+        for tp in assignment:
+            committed = self._committed.get(tp)
+            if committed is None:
+                committed = consumer.committed(tp)
+                if committed is None:
+                    committed = consumer.position(tp)
+                self._committed[tp] = committed
+            partition_lag.set(max(0, end_offsets.get(tp, committed) - committed), tp.topic, str(tp.partition))
+
+    @staticmethod
+    def _totals():
+        with write_latency._lock:
+            write = write_latency.series.get((), write_latency._empty())
+            write_sum, write_count = write[-2], write[-1]
+        with articles._lock:
+            outcomes = dict(articles.series)
+        return {
+            'consumed': messages_consumed.total(),
+            'inserted': outcomes.get(('inserted',), 0),
+            'duplicate': outcomes.get(('duplicate',), 0),
+            'skipped': outcomes.get(('skipped',), 0),
+            'batches': write_count,
+            'write_seconds': write_sum,
+        }
+
+    def log_summary(self):
+        now = time.monotonic()
+        totals = self._totals()
+        delta = {key: totals[key] - self._last[key] for key in totals}
+        elapsed = max(now - self._last_at, 1e-9)
+        avg_write_ms = delta['write_seconds'] / delta['batches'] * 1000 if delta['batches'] else 0.0
+        logger.info(
+            "Consumed %d records in %.0fs (%.1f/s): inserted=%d duplicates=%d skipped=%d "
+            "batches=%d avg_write=%.1fms lag=%d",
+            delta['consumed'], elapsed, delta['consumed'] / elapsed, delta['inserted'], delta['duplicate'],
+            delta['skipped'], delta['batches'], avg_write_ms, sum(partition_lag.values().values()),
+        )
+        if self.dedup is not None:
+            logger.info("Dedup index stats: %s", self.dedup.stats())
+        self._last, self._last_at = totals, now
+
+    def maybe_report(self, consumer):
+        now = time.monotonic()
+        if now >= self._next_lag:
+            self._next_lag = now + self.lag_interval
+            try:
+                self.update_lag(consumer)
+            except Exception as e:
+                logger.warning("Could not compute consumer lag: %s", str(e))
+        if now >= self._next_summary:
+            self._next_summary = now + self.summary_interval
+            self.log_summary()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 수집 요청마다 로그를 남기지 않음
+        pass
+
+
+def start_metrics_server(port):
+    """Serve /metrics from a daemon thread; returns the server or None if the port is taken."""
+    try:
+        server = ThreadingHTTPServer(('0.0.0.0', port), _Handler)
+    except OSError as e:
+        logger.warning("Metrics server not started on port %d: %s", port, str(e))
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    logger.info("Serving metrics on :%d/metrics", port)
+    return server
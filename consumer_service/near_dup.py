@@ -0,0 +1,177 @@
+# consumer_service/near_dup.py
+import hashlib
+import logging
+import random
+import re
+import struct
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+# 같은 기사를 가리키지만 URL 만 달라지게 만드는 추적용 쿼리 파라미터
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ocid', 'cmpid', 'ref', 'ref_src', 'ref_url', 'src', 'smid', 'cid',
+    'guccounter', 'guce_referrer', 'guce_referrer_sig', 'taid', 'mod',
+}
+TRACKING_PREFIXES = ('utm_', 'at_', 'pk_', 'mtm_')
+
+NUM_PERM = 32       # MinHash 시그니처 길이
+NUM_BANDS = 8       # LSH 밴드 수 (밴드당 NUM_PERM // NUM_BANDS 개 값)
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240314)  # 프로세스/재시작과 무관하게 같은 해시 함수 사용
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERM)
+]
+_SIGNATURE_FORMAT = f'<{NUM_PERM}I'
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def canonicalize_url(url):
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    path = parts.path.rstrip('/') or '/'
+    # http/https 차이와 fragment 는 같은 기사로 취급
+    return urlunsplit(('https', host, path, urlencode(query), ''))
+
+
+def normalize_text(*values):
+    return _WORD_RE.findall(' '.join(v for v in values if v).lower())
+
+
+def _feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def minhash(tokens):
+    """MinHash signature over the set of normalized words, or None if empty."""
+    hashes = {_feature_hash(token) % _MERSENNE_PRIME for token in set(tokens)}
+    if not hashes:
+        return None
+    return tuple(
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) & 0xFFFFFFFF
+        for a, b in _PERMUTATIONS
+    )
+
+
+def similarity(sig_a, sig_b):
+    """Estimated Jaccard similarity of two signatures."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def pack_signature(signature):
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data):
+    return struct.unpack(_SIGNATURE_FORMAT, data)
+
+
+def cluster_key(canonical_url):
+    return hashlib.blake2b(canonical_url.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class NearDuplicateIndex:
+    """Clusters the same story published by different providers.
+
+    Articles are matched first by canonical URL and then by MinHash of their
+    normalized title and description. Signatures are split into bands and
+    indexed in buckets, so a lookup only compares against articles sharing a
+    whole band instead of scanning the window. The index keeps the most
+    recent ``capacity`` articles.
+    """
+
+    def __init__(self, capacity=200_000, threshold=0.6):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._entries = OrderedDict()  # canonical_url -> (signature, cluster_id)
+        self._buckets = {}             # (band, band values) -> set(canonical_url)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bands(signature):
+        return [
+            (band, signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+            for band in range(NUM_BANDS)
+        ]
+
+    def _add(self, canonical_url, signature, cluster_id):
+        self._entries[canonical_url] = (signature, cluster_id)
+        if signature:
+            for key in self._bands(signature):
+                self._buckets.setdefault(key, set()).add(canonical_url)
+        if len(self._entries) > self.capacity:
+            old_url, (old_signature, _) = self._entries.popitem(last=False)
+            if old_signature:
+                for key in self._bands(old_signature):
+                    bucket = self._buckets.get(key)
+                    if bucket is not None:
+                        bucket.discard(old_url)
+                        if not bucket:
+                            del self._buckets[key]
+
+    def _find_similar(self, signature):
+        best_score, best_cluster = 0.0, None
+        seen = set()
+        for key in self._bands(signature):
+            for candidate in self._buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                candidate_signature, cluster_id = self._entries[candidate]
+                score = similarity(signature, candidate_signature)
+                if score >= self.threshold and score > best_score:
+                    best_score, best_cluster = score, cluster_id
+        return best_cluster
+
+    def warm(self, collection):
+        """Load the latest clustered articles so clusters survive restarts."""
+        cursor = collection.find(
+            {'cluster_id': {'$exists': True}},
+            {'canonical_url': 1, 'minhash': 1, 'cluster_id': 1, '_id': 0},
+        ).sort('_id', -1).limit(self.capacity)
+        docs = list(cursor)
+        with self._lock:
+            for doc in reversed(docs):
+                if doc.get('canonical_url'):
+                    signature = unpack_signature(doc['minhash']) if doc.get('minhash') else None
+                    self._add(doc['canonical_url'], signature, doc['cluster_id'])
+        logger.info("Warmed near-duplicate index with %d articles", len(docs))
+
+    def assign(self, article):
+        """Set ``canonical_url``, ``minhash``, ``cluster_id`` and ``is_duplicate``
+        on ``article`` in place."""
+        canonical_url = canonicalize_url(article['url'])
+        signature = minhash(normalize_text(article.get('title'), article.get('description')))
+
+        with self._lock:
+            entry = self._entries.get(canonical_url)
+            if entry is not None:
+                self._entries.move_to_end(canonical_url)
+                cluster_id, is_duplicate = entry[1], True
+            else:
+                cluster_id = self._find_similar(signature) if signature else None
+                is_duplicate = cluster_id is not None
+                if cluster_id is None:
+                    cluster_id = cluster_key(canonical_url)
+                self._add(canonical_url, signature, cluster_id)
+
+        article['canonical_url'] = canonical_url
+        if signature:
+            article['minhash'] = pack_signature(signature)
+        article['cluster_id'] = cluster_id
+        article['is_duplicate'] = is_duplicate
+        return article
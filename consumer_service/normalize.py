@@ -0,0 +1,135 @@
+# consumer_service/normalize.py
+import logging
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+# 모든 제공자의 기사를 이 스키마로 통일
+CANONICAL_FIELDS = (
+    'title', 'description', 'content', 'url', 'image', 'author',
+    'source', 'publisher', 'category', 'language', 'country', 'published_at',
+)
+
+# 제공자별 필드 매핑: 표준 필드 -> 원본 필드 후보 (앞에서부터 처음 값이 있는 것을 사용)
+PROVIDER_FIELD_MAPS = {
+    'GNews': {
+        'title': ('title',), 'description': ('description',), 'content': ('content',),
+        'url': ('url',), 'image': ('image',), 'published_at': ('published_at', 'publishedAt'),
+        'publisher': ('publisher',),
+    },
+    'NewsAPI': {
+        'title': ('title',), 'description': ('description',), 'content': ('content',),
+        'url': ('url',), 'image': ('urlToImage', 'image'), 'author': ('author',),
+        'published_at': ('publishedAt', 'published_at'), 'publisher': ('publisher',),
+    },
+    'MediaStack': {
+        'title': ('title',), 'description': ('description',), 'url': ('url',),
+        'image': ('image',), 'author': ('author',), 'category': ('category',),
+        'language': ('language',), 'country': ('country',),
+        'published_at': ('published_at',), 'publisher': ('publisher',),
+    },
+}
+# 알 수 없는 제공자는 모든 후보 필드를 시도
+_GENERIC_FIELD_MAP = {}
+for _field_map in PROVIDER_FIELD_MAPS.values():
+    for _field, _candidates in _field_map.items():
+        _GENERIC_FIELD_MAP.setdefault(_field, ())
+        _GENERIC_FIELD_MAP[_field] += tuple(c for c in _candidates if c not in _GENERIC_FIELD_MAP[_field])
+
+_DATETIME_FORMATS = (
+    '%Y-%m-%dT%H:%M:%S.%f%z',
+    '%Y-%m-%dT%H:%M:%S%z',
+    '%Y-%m-%d %H:%M:%S%z',
+    '%Y-%m-%d %H:%M:%S',
+    '%Y-%m-%d',
+)
+
+
+def parse_published_at(value):
+    """Parse a provider timestamp into a naive UTC datetime (BSON date), or None."""
+    if isinstance(value, datetime):
+        parsed = value
+    elif not isinstance(value, str) or not value.strip():
+        return None
+    else:
+        text = value.strip()
+        if text.endswith('Z'):
+            text = text[:-1] + '+00:00'
+        try:
+            parsed = datetime.fromisoformat(text)
+        except ValueError:
+            parsed = None
+            for fmt in _DATETIME_FORMATS:
+                try:
+                    parsed = datetime.strptime(text, fmt)
+                    break
+                except ValueError:
+                    continue
+            if parsed is None:
+                try:
+                    parsed = parsedate_to_datetime(value)  # RFC 2822
+                except (TypeError, ValueError):
+                    return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def detect_provider(article):
+    source = article.get('source')
+    if isinstance(source, dict):
+        # NewsAPI 원본은 source 가 {'id', 'name'} 객체
+        return 'NewsAPI'
+    if source in PROVIDER_FIELD_MAPS:
+        return source
+    return source or 'unknown'
+
+
+def normalize_article(article):
+    """Map one provider payload onto the canonical article schema."""
+    provider = detect_provider(article)
+    field_map = PROVIDER_FIELD_MAPS.get(provider, _GENERIC_FIELD_MAP)
+
+    normalized = dict.fromkeys(CANONICAL_FIELDS)
+    for field, candidates in field_map.items():
+        for key in candidates:
+            value = article.get(key)
+            if value not in (None, ''):
+                normalized[field] = value
+                break
+
+    source = article.get('source')
+    if isinstance(source, dict) and not normalized['publisher']:
+        normalized['publisher'] = source.get('name')
+    normalized['source'] = provider
+
+    raw_published_at = normalized['published_at']
+    normalized['published_at'] = parse_published_at(raw_published_at)
+    if raw_published_at and normalized['published_at'] is None:
+        logger.warning("Unparseable published_at %r from %s", raw_published_at, provider)
+        normalized['published_at_raw'] = raw_published_at
+    return normalized
+
+
+def backfill_published_at(collection, batch_size=1000):
+    """Convert string published_at values written before normalization into dates."""
+    cursor = collection.find({'published_at': {'$type': 'string'}}, {'published_at': 1}).batch_size(batch_size)
+    ops = []
+    converted = 0
+    for doc in cursor:
+        parsed = parse_published_at(doc['published_at'])
+        update = {'$set': {'published_at': parsed}}
+        if parsed is None:
+            update['$set']['published_at_raw'] = doc['published_at']
+        ops.append(UpdateOne({'_id': doc['_id']}, update))
+        if len(ops) >= batch_size:
+            converted += collection.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        converted += collection.bulk_write(ops, ordered=False).modified_count
+    if converted:
+        logger.info("Converted %d string published_at values to dates", converted)
+    return converted
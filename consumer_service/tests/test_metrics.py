@@ -0,0 +1,26 @@
+# consumer_service/tests/test_metrics.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import metrics  # noqa: E402
+
+
+def test_render_fresh_registry():
+    # 첫 배치를 쓰기 전에도 수집 요청이 실패하지 않아야 함
+    text = metrics.render()
+    assert 'consumer_write_duration_seconds_bucket{le="+Inf"} 0' in text
+    assert 'consumer_write_duration_seconds_count 0' in text
+    assert 'consumer_end_to_end_seconds_sum 0.0' in text
+    assert 'consumer_batches_total 0' in text
+
+
+def test_render_histogram_after_observation():
+    histogram = metrics.Histogram('test_seconds', 'Test.', buckets=(0.1, 1.0))
+    assert 'test_seconds_count 0' in '\n'.join(histogram.render())
+    histogram.observe(0.5)
+    lines = histogram.render()
+    assert 'test_seconds_bucket{le="0.1"} 0' in lines
+    assert 'test_seconds_bucket{le="1.0"} 1' in lines
+    assert 'test_seconds_count 1' in lines
@@ -0,0 +1,107 @@
+# consumer_service/workers.py
+import logging
+import queue
+import threading
+import time
+import zlib
+
+logger = logging.getLogger(__name__)
+
+FLUSH_RETRY_INTERVAL = 5  # 쓰기 실패 시 재시도 간격 (초)
+_FLUSH = object()  # 워커에게 즉시 flush 를 요청하는 마커
+_STOP = object()
+
+
+class PartitionWorkerPool:
+    """Dispatches Kafka records to a fixed set of worker threads.
+
+    Records of the same (topic, partition) always go to the same worker, so
+    ordering holds per partition while different partitions are written
+    concurrently. Each worker owns its own writer; offsets of successfully
+    flushed batches are collected and handed back to the polling thread,
+    because KafkaConsumer itself must only be used from that thread.
+    """
+
+    def __init__(self, num_workers, writer_factory, process, queue_size=1000):
+        self.num_workers = max(1, num_workers)
+        self._writer_factory = writer_factory
+        self._process = process
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in range(self.num_workers)]
+        self._threads = []
+        self._ready_offsets = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        for idx in range(self.num_workers):
+            thread = threading.Thread(target=self._run, args=(idx,), name=f"partition-worker-{idx}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker_index(self, topic, partition):
+        # 프로세스 간에도 동일한 배정을 위해 crc32 사용 (hash() 는 프로세스마다 달라짐)
+        return zlib.crc32(f"{topic}:{partition}".encode('utf-8')) % self.num_workers
+
+    def submit(self, message):
+        # 큐가 가득 차면 블록되어 poll 속도가 자연스럽게 조절됨
+        self._queues[self._worker_index(message.topic, message.partition)].put(message)
+
+    def pop_ready_offsets(self):
+        with self._lock:
+            offsets, self._ready_offsets = self._ready_offsets, {}
+        return offsets
+
+    def drain(self):
+        """Flush every worker and wait until all submitted records are written."""
+        for q in self._queues:
+            q.put(_FLUSH)
+        for q in self._queues:
+            q.join()
+
+    def stop(self):
+        for q in self._queues:
+            q.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+
+    def _flush(self, writer):
+        while True:
+            try:
+                result = writer.flush()
+                break
+            except Exception as e:
+                logger.error("Batch write failed, retrying in %ss: %s", FLUSH_RETRY_INTERVAL, str(e))
+                time.sleep(FLUSH_RETRY_INTERVAL)
+        if result and result.offsets:
+            with self._lock:
+                self._ready_offsets.update(result.offsets)
+
+    def _run(self, idx):
+        q = self._queues[idx]
+        writer = self._writer_factory()
+        while True:
+            try:
+                item = q.get(timeout=writer.time_until_flush())
+            except queue.Empty:
+                item = None
+
+            try:
+                if item is _STOP:
+                    self._flush(writer)
+                    return
+                if item is _FLUSH:
+                    self._flush(writer)
+                elif item is not None:
+                    try:
+                        doc = self._process(item)
+                    except Exception as e:
+                        # 처리할 수 없는 메시지는 오프셋만 넘기고 건너뜀
+                        logger.error("Skipping record %s[%d]@%d: %s", item.topic, item.partition, item.offset, str(e))
+                        doc = None
+                    writer.add(doc, item.topic, item.partition, item.offset, item.timestamp)
+                if writer.should_flush():
+                    self._flush(writer)
+            except Exception as e:
+                logger.error("Worker %d failed to process record: %s", idx, str(e))
+            finally:
+                if item is not None:
+                    q.task_done()
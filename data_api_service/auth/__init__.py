@@ -0,0 +1,3 @@
+# data_api_service/auth/__init__.py
+from .passwords import AuthBusy, password_hasher
+from .tokens import token_cache
@@ -0,0 +1,92 @@
+# data_api_service/auth/passwords.py
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+
+class AuthBusy(Exception):
+    """Raised when too many password operations are already queued."""
+
+
+def _hash(password):
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def _check(password, hashed):
+    return bcrypt.checkpw(password, hashed)
+
+
+class PasswordHasher:
+    """Runs bcrypt in a small process pool so it never blocks the event loop.
+
+    At most ``max_pending`` operations may be queued or running; a caller
+    waits up to ``admission_timeout`` seconds for a slot and then gets
+    AuthBusy, so a login storm turns into fast 503s instead of an unbounded
+    backlog. The pool uses the forkserver start method because the API
+    process already runs driver threads when it starts.
+    """
+
+    def __init__(self, workers=2, max_pending=32, admission_timeout=2.0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.admission_timeout = admission_timeout
+        self._pool = None
+        self._slots = None
+        self.counters = {'hashed': 0, 'verified': 0, 'rejected': 0}
+
+    async def start(self):
+        context = multiprocessing.get_context('forkserver')
+        # 기본값(__main__ 전체)을 미리 임포트하지 않고 bcrypt 만 올려 둠
+        context.set_forkserver_preload([__name__])
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        self._slots = asyncio.Semaphore(self.max_pending)
+        # 첫 로그인 요청이 프로세스 생성 비용을 내지 않도록 미리 띄움
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, os.getpid) for _ in range(self.workers)))
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    async def _run(self, func, *args):
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.admission_timeout)
+        except asyncio.TimeoutError:
+            self.counters['rejected'] += 1
+            raise AuthBusy("Too many concurrent password operations")
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+        finally:
+            self._slots.release()
+
+    async def hash(self, password):
+        hashed = await self._run(_hash, password.encode('utf-8'))
+        self.counters['hashed'] += 1
+        return hashed
+
+    async def verify(self, password, hashed):
+        if isinstance(hashed, str):
+            hashed = hashed.encode('utf-8')
+        result = await self._run(_check, password.encode('utf-8'), hashed)
+        self.counters['verified'] += 1
+        return result
+
+    def stats(self):
+        stats = dict(self.counters)
+        in_use = self.max_pending - self._slots._value if self._slots is not None else 0
+        stats.update(workers=self.workers, pending=in_use)
+        return stats
+
+
+password_hasher = PasswordHasher(
+    workers=int(os.getenv('AUTH_HASH_WORKERS', 2)),
+    max_pending=int(os.getenv('AUTH_HASH_MAX_PENDING', 32)),
+    admission_timeout=float(os.getenv('AUTH_ADMISSION_TIMEOUT', 2.0)),
+)
@@ -0,0 +1,55 @@
+# data_api_service/auth/tokens.py
+import hashlib
+import os
+import time
+from collections import OrderedDict
+
+
+class TokenCache:
+    """Short-lived LRU of verified JWT claims keyed by the token's SHA-256.
+
+    An entry lives at most ``ttl`` seconds and never past the token's own
+    ``exp``, so a cached token is never accepted after it expired.
+    """
+
+    def __init__(self, max_entries=10000, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()  # digest -> (claims, expires_at)
+        self.counters = {'hits': 0, 'misses': 0}
+
+    @staticmethod
+    def _key(token):
+        return hashlib.sha256(token.encode('utf-8')).digest()
+
+    def get(self, token):
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            if entry is not None:
+                del self._entries[key]
+            self.counters['misses'] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.counters['hits'] += 1
+        return entry[0]
+
+    def put(self, token, claims):
+        expires_at = time.time() + self.ttl
+        if isinstance(claims.get('exp'), (int, float)):
+            expires_at = min(expires_at, claims['exp'])
+        self._entries[self._key(token)] = (claims, expires_at)
+        self._entries.move_to_end(self._key(token))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats['entries'] = len(self._entries)
+        return stats
+
+
+token_cache = TokenCache(
+    max_entries=int(os.getenv('AUTH_TOKEN_CACHE_SIZE', 10000)),
+    ttl=float(os.getenv('AUTH_TOKEN_CACHE_TTL', 60)),
+)
@@ -0,0 +1,100 @@
+# data_api_service/benchmarks/login_storm_bench.py
+"""Measure GET /news/ latency on a running API before and during a login storm.
+
+With bcrypt on the event loop every login stalls all other requests of the
+worker for the length of a hash; with the process pool the feed latency
+should stay roughly flat while logins run.
+
+Run from data_api_service:
+    python -m benchmarks.login_storm_bench --url http://localhost:8001 \\
+        --email bench@example.com --password secret
+The account is created through /users/signup when it does not exist yet.
+"""
+import argparse
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+
+def request(url, body=None):
+    data = json.dumps(body).encode('utf-8') if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def measure_feed(url, duration, interval):
+    # 피드를 순차적으로 호출하며 지연 시간(ms)을 기록
+    latencies = []
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        started = time.perf_counter()
+        request(f'{url}/news/?page=1&page_size=10')
+        latencies.append((time.perf_counter() - started) * 1000)
+        time.sleep(interval)
+    return latencies
+
+
+def storm(url, credentials, concurrency, stop, statuses):
+    def loop():
+        while not stop.is_set():
+            statuses[request(f'{url}/users/login', credentials)] += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(loop)
+
+
+def report(name, latencies):
+    print(f"{name:>8}: n={len(latencies):<5} p50={percentile(latencies, 0.5):7.1f}ms "
+          f"p95={percentile(latencies, 0.95):7.1f}ms p99={percentile(latencies, 0.99):7.1f}ms "
+          f"max={max(latencies):7.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', default='http://localhost:8001')
+    parser.add_argument('--email', default='login-storm@example.com')
+    parser.add_argument('--password', default='login-storm-password')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--interval', type=float, default=0.01)
+    args = parser.parse_args()
+
+    credentials = {'email': args.email, 'password': args.password}
+    request(f'{args.url}/users/signup', {'username': args.email.split('@')[0], **credentials})
+    if request(f'{args.url}/users/login', credentials) != 200:
+        raise SystemExit(f"Cannot log in as {args.email}")
+
+    report('baseline', measure_feed(args.url, args.duration, args.interval))
+
+    stop = threading.Event()
+    statuses = Counter()
+    worker = threading.Thread(target=storm, args=(args.url, credentials, args.concurrency, stop, statuses))
+    worker.start()
+    try:
+        during = measure_feed(args.url, args.duration, args.interval)
+    finally:
+        stop.set()
+        worker.join()
+    report('storm', during)
+    total = sum(statuses.values())
+    print(f"  logins: {total} in {args.duration:.0f}s ({total / args.duration:.1f}/s), "
+          f"status codes {dict(sorted(statuses.items()))}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# data_api_service/benchmarks/serialization_bench.py
+"""Compare the Pydantic and orjson serialization paths of GET /news/.
+
+Run from data_api_service:  python -m benchmarks.serialization_bench
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from news.schemas import NewsData, NewsResponse
+from news.serialization import dumps
+
+
+def make_documents(count):
+    now = datetime.utcnow().replace(microsecond=0)
+    return [
+        {
+            '_id': ObjectId(),
+            'author': f'Author {i}',
+            'title': f'Sample headline number {i} about the markets',
+            'description': 'A short description of the article that is about as long as a real one. ' * 2,
+            'url': f'https://news.example.com/2024/articles/{i}',
+            'source': 'Example News',
+            'image': f'https://cdn.example.com/images/{i}.jpg',
+            'category': 'business',
+            'language': 'en',
+            'country': 'us',
+            'published_at': now - timedelta(minutes=i),
+            'cluster_id': f'{i:016x}',
+        }
+        for i in range(count)
+    ]
+
+
+def pydantic_path(docs):
+    # 기존 경로: 문서마다 jsonable_encoder + NewsData 검증 후 NewsResponse 재검증
+    news_list = [NewsData(**jsonable_encoder(doc, custom_encoder={ObjectId: str})) for doc in docs]
+    response = NewsResponse(newsList=news_list, totalItems=len(docs))
+    return json.dumps(jsonable_encoder(response, custom_encoder={ObjectId: str})).encode('utf-8')
+
+
+def fast_path(docs):
+    return dumps({'newsList': docs, 'totalItems': len(docs), 'nextCursor': None})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--page-size', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+
+    docs = make_documents(args.page_size)
+    results = {}
+    for name, func in (('pydantic', pydantic_path), ('orjson', fast_path)):
+        best = min(timeit.repeat(lambda: func(docs), repeat=args.repeat, number=args.number))
+        results[name] = best / args.number * 1e6
+        print(f"{name:>8}: {results[name]:9.1f} us/page ({len(func(docs))} bytes)")
+    print(f"speedup: {results['pydantic'] / results['orjson']:.1f}x for page_size={args.page_size}")
+
+
+if __name__ == '__main__':
+    main()
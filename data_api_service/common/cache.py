@@ -0,0 +1,225 @@
+# data_api_service/common/cache.py
+import asyncio
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+
+from fastapi import Request, Response
+
+from .metrics import mark
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis 는 공유 캐시를 쓸 때만 필요
+    aioredis = None
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry:
+    __slots__ = ('body', 'etag', 'version', 'stored_at')
+
+    def __init__(self, body, version):
+        self.body = body
+        self.etag = '"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest()
+        self.version = version
+        self.stored_at = time.monotonic()
+
+
+class ResponseCache:
+    """LRU cache of serialized responses, invalidated by a collection version.
+
+    Entries expire after ``ttl`` seconds or as soon as the consumer bumps the
+    version counter of the news collection, which a background task polls.
+    Expired entries younger than ``stale_ttl`` are still usable: the refresh
+    runs in the background and the stale body is returned if it does not
+    finish within ``stale_wait`` seconds. Concurrent misses of the same key
+    share a single build. With ``redis_url`` the bodies are also shared
+    between workers through Redis.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=32 * 1024 * 1024, ttl=30, stale_ttl=300,
+                 stale_wait=0.2, version_poll_interval=2, redis_url=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.stale_wait = stale_wait
+        self.version_poll_interval = version_poll_interval
+        self.redis_url = redis_url
+        self.version = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._inflight = {}
+        self._redis = None
+        self._task = None
+        self.counters = {'hits': 0, 'misses': 0, 'stale': 0, 'shared_hits': 0, 'evictions': 0}
+
+    def _is_fresh(self, entry):
+        return entry.version == self.version and time.monotonic() - entry.stored_at < self.ttl
+
+    def _store(self, key, entry):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= len(old.body)
+        self._entries[key] = entry
+        self._bytes += len(entry.body)
+        # 항목 수와 전체 바이트 수 모두 제한
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted.body)
+            self.counters['evictions'] += 1
+
+    def _shared_key(self, key, version):
+        return f"response-cache:{version}:{key}"
+
+    async def _shared_get(self, key):
+        if self._redis is None:
+            return None
+        try:
+            return await self._redis.get(self._shared_key(key, self.version))
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", str(e))
+            return None
+
+    async def _shared_set(self, key, entry):
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(self._shared_key(key, entry.version), entry.body, ex=self.ttl)
+        except Exception as e:
+            logger.warning("Shared cache write failed: %s", str(e))
+
+    async def _run_build(self, key, build):
+        try:
+            # 조회 전에 버전을 기록해야 조회 중에 들어온 기사로 인한 무효화를 놓치지 않음
+            version = self.version
+            entry = CacheEntry(await build(), version)
+            self._store(key, entry)
+            await self._shared_set(key, entry)
+            return entry
+        finally:
+            self._inflight.pop(key, None)
+
+    @staticmethod
+    def _log_failure(key, task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Cache build failed for %s: %s", key, task.exception())
+
+    def _build(self, key, build):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_build(key, build))
+            task.add_done_callback(lambda t: self._log_failure(key, t))
+            self._inflight[key] = task
+        return task
+
+    async def get_or_build(self, key, build):
+        """Return the entry for ``key``; ``build`` is a coroutine function
+        producing the serialized body when the cache cannot answer."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if self._is_fresh(entry):
+                self.counters['hits'] += 1
+                return entry
+            if time.monotonic() - entry.stored_at < self.stale_ttl:
+                # 갱신은 백그라운드에서 진행하고, 오래 걸리면 이전 응답을 반환
+                task = self._build(key, build)
+                try:
+                    return await asyncio.wait_for(asyncio.shield(task), self.stale_wait)
+                except asyncio.TimeoutError:
+                    # 조회 자체의 오류(404, 잘못된 커서 등)는 이전 응답으로 가리지 않고 그대로 전달
+                    self.counters['stale'] += 1
+                    return entry
+
+        body = await self._shared_get(key)
+        if body is not None:
+            self.counters['shared_hits'] += 1
+            entry = CacheEntry(body, self.version)
+            self._store(key, entry)
+            return entry
+
+        self.counters['misses'] += 1
+        return await asyncio.shield(self._build(key, build))
+
+    async def _poll_version(self, collection, name):
+        while True:
+            try:
+                doc = await collection.find_one({'_id': name})
+                self.version = doc.get('version', 0) if doc else 0
+            except Exception as e:
+                logger.warning("Failed to read collection version: %s", str(e))
+            await asyncio.sleep(self.version_poll_interval)
+
+    def start(self, version_collection, name):
+        """Follow the version counter ``name`` in ``version_collection``."""
+        if self.redis_url:
+            if aioredis is None:
+                logger.warning("REDIS_URL is set but the redis package is not installed; using local cache only")
+            else:
+                self._redis = aioredis.from_url(self.redis_url)
+        if self._task is None:
+            self._task = asyncio.create_task(self._poll_version(version_collection, name))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats.update(entries=len(self._entries), bytes=self._bytes, version=self.version)
+        return stats
+
+
+def cache_key(request: Request):
+    query = '&'.join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{request.url.path}?{query}"
+
+
+def etag_matches(request: Request, etag):
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    candidates = [tag.strip() for tag in header.split(',')]
+    # 약한 비교 (W/ 접두사 무시)
+    return '*' in candidates or any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+async def cached_response(request: Request, build):
+    """Serve ``build()`` through the response cache with ETag revalidation."""
+    built = False
+
+    async def tracked_build():
+        nonlocal built
+        built = True
+        return await build()
+
+    entry = await response_cache.get_or_build(cache_key(request), tracked_build)
+    # Server-Timing 에 캐시 적중 여부 표시
+    mark('cache', 'miss' if built else 'hit')
+    headers = {'ETag': entry.etag, 'Cache-Control': 'no-cache'}
+    if etag_matches(request, entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type='application/json', headers=headers)
+
+
+response_cache = ResponseCache(
+    max_entries=int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', 1024)),
+    max_bytes=int(os.getenv('RESPONSE_CACHE_MAX_BYTES', 32 * 1024 * 1024)),
+    ttl=float(os.getenv('RESPONSE_CACHE_TTL', 30)),
+    stale_ttl=float(os.getenv('RESPONSE_CACHE_STALE_TTL', 300)),
+    stale_wait=float(os.getenv('RESPONSE_CACHE_STALE_WAIT', 0.2)),
+    version_poll_interval=float(os.getenv('RESPONSE_CACHE_VERSION_POLL_INTERVAL', 2)),
+    redis_url=os.getenv('REDIS_URL'),
+)
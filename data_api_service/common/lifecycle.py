@@ -0,0 +1,80 @@
+# data_api_service/common/lifecycle.py
+import asyncio
+import logging
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class Lifecycle:
+    """Startup timings, readiness and drain state of one API worker.
+
+    ``drain()`` runs once, on SIGTERM/SIGINT or at shutdown: the worker
+    reports itself not ready and the registered callbacks close long-lived
+    responses (SSE streams) so the server can finish in-flight requests and
+    exit within its graceful-shutdown timeout.
+    """
+
+    def __init__(self):
+        # 모듈 임포트 시각 (main.py 가 가장 먼저 임포트)
+        self._created = time.perf_counter()
+        self.ready = False
+        self.draining = False
+        self.timings = {}
+        self._drain_callbacks = []
+
+    @contextmanager
+    def step(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    def mark_imported(self):
+        self.timings['imports'] = round((time.perf_counter() - self._created) * 1000, 1)
+
+    def mark_ready(self):
+        self.ready = True
+        self.timings['total'] = round((time.perf_counter() - self._created) * 1000, 1)
+        logger.info("Worker ready in %.0f ms %s", self.timings['total'], self.timings)
+
+    def on_drain(self, callback):
+        self._drain_callbacks.append(callback)
+
+    def drain(self):
+        if self.draining:
+            return
+        self.draining = True
+        self.ready = False
+        logger.info("Draining worker")
+        for callback in self._drain_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error("Drain callback failed: %s", str(e))
+
+    def install_signal_handlers(self):
+        """Chain a drain in front of the server's own SIGTERM/SIGINT handlers."""
+        if threading.current_thread() is not threading.main_thread():
+            # 테스트 클라이언트처럼 다른 스레드에서 앱을 돌리면 시그널을 다룰 수 없음
+            return
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            previous = signal.getsignal(sig)
+            if not callable(previous):
+                # 서버가 핸들러를 두지 않았으면 기본 동작을 바꾸지 않음
+                continue
+
+            def handler(signum, frame, previous=previous):
+                # 시그널 핸들러 안에서 루프 상태를 건드리지 않도록 루프에 예약
+                loop.call_soon_threadsafe(self.drain)
+                previous(signum, frame)
+
+            signal.signal(sig, handler)
+
+
+lifecycle = Lifecycle()
@@ -0,0 +1,133 @@
+# data_api_service/common/logs.py
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import time
+import traceback
+
+import orjson
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+# 로거별 레벨, 예: "news.search=DEBUG,pymongo=WARNING"
+LOG_LEVELS = os.getenv('LOG_LEVELS', 'pymongo=WARNING,multipart=WARNING,uvicorn.access=WARNING')
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+LOG_SAMPLE_RATE = float(os.getenv('LOG_SAMPLE_RATE', 0.01))
+LOG_SLOW_REQUEST_MS = float(os.getenv('LOG_SLOW_REQUEST_MS', 500))
+
+# LogRecord 기본 속성 (나머지는 extra 로 넘어온 필드)
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message and extra fields."""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return orjson.dumps(entry, default=str).decode('utf-8')
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        # 호출 스레드에서는 메시지와 예외만 문자열로 만들고 포맷은 리스너 스레드에서 수행
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = ''.join(traceback.format_exception(*record.exc_info)).rstrip()
+            record.exc_info = None
+        return record
+
+
+def parse_levels(spec):
+    """``"a=DEBUG,b.c=WARNING"`` -> ``{'a': 'DEBUG', 'b.c': 'WARNING'}``."""
+    levels = {}
+    for item in spec.split(','):
+        name, _, level = item.partition('=')
+        if name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def configure_logging():
+    """Send every record through a queue to one writer thread; safe to call twice."""
+    global _listener
+    if _listener is not None:
+        return
+    handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(name)s - %(message)s'))
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=False)
+    _listener.start()
+    # 종료 시 큐에 남은 기록을 모두 쓰고 끝냄
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_QueueHandler(log_queue))
+    root.setLevel(LOG_LEVEL)
+    for name, level in parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+    # uvicorn 로거도 핸들러 없이 루트 큐로 전달
+    for name in ('uvicorn', 'uvicorn.error', 'uvicorn.access'):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+
+
+class RequestLogMiddleware:
+    """Pure ASGI middleware that logs a sample of requests.
+
+    Only the ``http.response.start`` message is inspected for the status;
+    body messages are passed through untouched. Errors (5xx) and requests
+    slower than ``slow_ms`` are always logged, others with ``sample_rate``.
+    """
+
+    def __init__(self, app, sample_rate=LOG_SAMPLE_RATE, slow_ms=LOG_SLOW_REQUEST_MS):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.logger = logging.getLogger('api.requests')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if status >= 500 or duration_ms >= self.slow_ms or random.random() < self.sample_rate:
+                self.logger.info(
+                    "%s %s %d", scope['method'], scope['path'], status,
+                    extra={'method': scope['method'], 'path': scope['path'], 'status': status,
+                           'duration_ms': round(duration_ms, 1)},
+                )
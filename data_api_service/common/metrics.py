@@ -0,0 +1,324 @@
+# data_api_service/common/metrics.py
+import asyncio
+import contextvars
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from pymongo import monitoring
+
+from .profiling import request_profiler
+
+logger = logging.getLogger(__name__)
+
+# serve.py 가 워커들이 공유할 디렉터리를 지정 (없으면 이 프로세스 값만 노출)
+METRICS_DIR = os.getenv('METRICS_DIR', '')
+METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, in Prometheus terms."""
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self.series = {}  # label values -> [bucket counts..., sum, count]
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            data = self.series.get(label_values)
+            if data is None:
+                data = self.series[label_values] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += value
+            data[-1] += 1
+
+    def samples(self, series):
+        for label_values, data in series.items():
+            labels = dict(zip(self.labels, label_values))
+            for bound, count in zip(self.buckets, data):
+                yield '_bucket', {**labels, 'le': repr(bound)}, count
+            yield '_bucket', {**labels, 'le': '+Inf'}, data[-1]
+            yield '_sum', labels, data[-2]
+            yield '_count', labels, data[-1]
+
+    @staticmethod
+    def merge(left, right):
+        return [a + b for a, b in zip(left, right)]
+
+
+class Counter:
+    type = 'counter'
+
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._lock = threading.Lock()
+        self.series = {}
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self.series[label_values] = self.series.get(label_values, 0) + amount
+
+    def samples(self, series):
+        for label_values, value in series.items():
+            yield '', dict(zip(self.labels, label_values)), value
+
+    @staticmethod
+    def merge(left, right):
+        return left + right
+
+
+class Gauge(Counter):
+    type = 'gauge'
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+
+request_latency = Histogram('api_request_duration_seconds', 'Time until the response is complete.',
+                            ('method', 'route', 'status'))
+requests_in_flight = Gauge('api_requests_in_flight', 'Requests being processed.')
+mongo_latency = Histogram('api_mongo_command_duration_seconds', 'MongoDB command round trips.',
+                          ('command', 'collection'))
+mongo_failures = Counter('api_mongo_command_failures_total', 'Failed MongoDB commands.', ('command',))
+METRICS = (request_latency, requests_in_flight, mongo_latency, mongo_failures)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _snapshot():
+    snapshot = {}
+    for metric in METRICS:
+        # 다른 스레드에서 파일로 쓰므로 잠금 안에서 복사
+        with metric._lock:
+            snapshot[metric.name] = [[list(key), list(value) if isinstance(value, list) else value]
+                                     for key, value in metric.series.items()]
+    return snapshot
+
+
+def _merge_snapshots(snapshots):
+    merged = {metric.name: {} for metric in METRICS}
+    by_name = {metric.name: metric for metric in METRICS}
+    for snapshot in snapshots:
+        for name, series in snapshot.items():
+            if name not in by_name:
+                continue
+            target = merged[name]
+            for key, value in series:
+                key = tuple(key)
+                target[key] = by_name[name].merge(target[key], value) if key in target else value
+    return merged
+
+
+def render():
+    """Prometheus text exposition of this process, plus the other workers' last snapshots."""
+    snapshots = [_snapshot()]
+    if METRICS_DIR:
+        own = os.path.join(METRICS_DIR, f'{os.getpid()}.json')
+        for path in glob.glob(os.path.join(METRICS_DIR, '*.json')):
+            if path == own:
+                continue
+            try:
+                with open(path) as file:
+                    snapshots.append(json.load(file))
+            except (OSError, ValueError):
+                continue
+    merged = _merge_snapshots(snapshots)
+    lines = []
+    for metric in METRICS:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.type}')
+        series = merged[metric.name]
+        if not series and not metric.labels:
+            series = {(): 0}
+        for suffix, labels, value in metric.samples(series):
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            lines.append(f'{metric.name}{suffix}{{{label_text}}} {value}' if label_text
+                         else f'{metric.name}{suffix} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsWriter:
+    """Periodically writes this worker's metrics to METRICS_DIR for /metrics on other workers."""
+
+    def __init__(self, directory, interval=5):
+        self.directory = directory
+        self.interval = interval
+        self._task = None
+
+    def flush(self):
+        path = os.path.join(self.directory, f'{os.getpid()}.json')
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(_snapshot(), file)
+        os.replace(tmp_path, path)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except OSError as e:
+                logger.warning("Failed to write metrics snapshot: %s", str(e))
+
+    def start(self):
+        if self.directory and self._task is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            # 종료한 워커의 누적 값도 계속 합산되도록 마지막 값을 남김
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning("Failed to write metrics snapshot: %s", str(e))
+
+
+metrics_writer = MetricsWriter(METRICS_DIR, METRICS_FLUSH_INTERVAL)
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Feeds pymongo command events into the Mongo latency histogram."""
+
+    def __init__(self):
+        self._collections = {}  # (connection, request_id) -> collection
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        if isinstance(target, str):
+            self._collections[(event.connection_id, event.request_id)] = target
+
+    def succeeded(self, event):
+        collection = self._collections.pop((event.connection_id, event.request_id), '')
+        mongo_latency.observe(event.duration_micros / 1e6, event.command_name, collection)
+
+    def failed(self, event):
+        self._collections.pop((event.connection_id, event.request_id), None)
+        mongo_failures.inc(event.command_name)
+
+
+mongo_command_metrics = MongoCommandMetrics()
+
+
+# 요청 한 건의 Server-Timing 구간: 이름 -> [누적 ms, 설명]
+_spans = contextvars.ContextVar('server_timing_spans', default=None)
+
+
+@contextmanager
+def timed(name):
+    """Add the duration of the block to the current request's Server-Timing."""
+    spans = _spans.get()
+    if spans is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        span = spans.setdefault(name, [0.0, None])
+        span[0] += (time.perf_counter() - started) * 1000
+
+
+async def measure(name, awaitable):
+    """Await ``awaitable`` inside ``timed(name)``; for use in ``asyncio.gather``."""
+    with timed(name):
+        return await awaitable
+
+
+def mark(name, description):
+    """Add a duration-less Server-Timing entry such as ``cache;desc="hit"``."""
+    spans = _spans.get()
+    if spans is not None:
+        spans.setdefault(name, [None, None])[1] = description
+
+
+def _server_timing(spans, total_ms):
+    parts = []
+    for name, (duration, description) in spans.items():
+        part = name
+        if description is not None:
+            part += f';desc="{description}"'
+        if duration is not None:
+            part += f';dur={duration:.1f}'
+        parts.append(part)
+    parts.append(f'app;dur={total_ms:.1f}')
+    return ', '.join(parts).encode('latin-1')
+
+
+def route_template(scope):
+    """``/news/details/{news_id}`` for ``/news/details/6650...``; 'unmatched' without a route."""
+    route = scope.get('route')
+    # include_router 가 prefix 를 포함한 경로 템플릿으로 route 를 등록함
+    return getattr(route, 'path', None) or 'unmatched'
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: latency histogram, in-flight gauge and Server-Timing.
+
+    The route label is the matched path template (``/news/details/{news_id}``),
+    so ids do not create new series. Event streams are left out of the
+    latency histogram because their duration is the connection lifetime.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        spans = {}
+        token = _spans.set(spans)
+        recording = request_profiler.begin()
+        requests_in_flight.inc()
+        status = 500
+        streaming = False
+
+        async def send_with_timing(message):
+            nonlocal status, streaming
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                headers = list(message.get('headers', []))
+                streaming = any(key == b'content-type' and value.startswith(b'text/event-stream')
+                                for key, value in headers)
+                total_ms = (time.perf_counter() - started) * 1000
+                headers.append((b'server-timing', _server_timing(spans, total_ms)))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            requests_in_flight.dec()
+            _spans.reset(token)
+            duration = time.perf_counter() - started
+            route_path = route_template(scope)
+            if not streaming:
+                request_latency.observe(duration, scope['method'], route_path, str(status))
+            if recording is not None:
+                request_profiler.end(recording, f"{scope['method']} {route_path}", duration * 1000)
@@ -0,0 +1,96 @@
+# data_api_service/common/profiling.py
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+
+def collapse(frame):
+    """``root;...;leaf`` stack line in the folded format read by flamegraph tools."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class RequestProfiler:
+    """Opt-in sampling profiler for a fraction of requests.
+
+    While at least one sampled request is in flight, a thread records the
+    event loop thread's stack every ``interval`` seconds into each of those
+    requests. Requests that take ``slow_ms`` or longer get their stacks
+    written to ``directory`` as folded stacks (flamegraph.pl, speedscope).
+    The loop thread runs other requests too, so a profile shows everything
+    the worker did meanwhile -- which is what makes a request slow.
+    """
+
+    def __init__(self, sample_rate=0.0, interval=0.005, slow_ms=500, directory='data/profiles', max_files=200):
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.slow_ms = slow_ms
+        self.directory = directory
+        self.max_files = max_files
+        self._active = {}  # id -> recording
+        self._lock = threading.Lock()
+        self._thread = None
+        self._target = None
+        self.counters = {'sampled': 0, 'written': 0}
+
+    def begin(self):
+        """A recording for this request, or None when it is not sampled."""
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return None
+        recording = Counter()
+        with self._lock:
+            self._target = threading.get_ident()
+            self._active[id(recording)] = recording
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._sample, name='request-profiler', daemon=True)
+                self._thread.start()
+        self.counters['sampled'] += 1
+        return recording
+
+    def _sample(self):
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._thread = None
+                    return
+                recordings = list(self._active.values())
+                target = self._target
+            frame = sys._current_frames().get(target)
+            if frame is not None:
+                stack = collapse(frame)
+                for recording in recordings:
+                    recording[stack] += 1
+            del frame
+            time.sleep(self.interval)
+
+    def end(self, recording, name, duration_ms):
+        with self._lock:
+            self._active.pop(id(recording), None)
+        if duration_ms < self.slow_ms or not recording or self.counters['written'] >= self.max_files:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        filename = '%d-%d-%s.folded' % (time.time() * 1000, os.getpid(),
+                                         ''.join(c if c.isalnum() else '_' for c in name).strip('_'))
+        with open(os.path.join(self.directory, filename), 'w') as file:
+            for stack, count in recording.most_common():
+                file.write(f'{stack} {count}\n')
+        self.counters['written'] += 1
+        logger.info("Wrote profile of %s (%.0f ms) to %s", name, duration_ms, filename)
+
+
+request_profiler = RequestProfiler(
+    sample_rate=float(os.getenv('PROFILE_SAMPLE_RATE', 0)),
+    interval=float(os.getenv('PROFILE_INTERVAL', 0.005)),
+    slow_ms=float(os.getenv('PROFILE_SLOW_MS', 500)),
+    directory=os.getenv('PROFILE_DIR', 'data/profiles'),
+)
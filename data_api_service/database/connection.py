@@ -1,26 +1,57 @@
 # connection.py
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 import os
 
+from common.metrics import mongo_command_metrics
+from .pool_stats import pool_stats
+
 class Database:
+    """Holds the Motor clients of the API.
+
+    Clients are created by ``connect()`` from the application lifespan, so
+    importing this module never opens a connection and every client is bound
+    to the running event loop.
+    """
+
     def __init__(self):
+        self.client = None
+        self.user_client = None
+
+    def connect(self):
+        pool_options = {
+            'maxPoolSize': int(os.getenv('MONGODB_MAX_POOL_SIZE', 100)),
+            'minPoolSize': int(os.getenv('MONGODB_MIN_POOL_SIZE', 0)),
+            # 풀 상태는 /pool/stats, 명령별 소요 시간은 /metrics 로 확인
+            'event_listeners': [pool_stats, mongo_command_metrics],
+        }
+
         # 일반 데이터베이스 연결
-        self.client = MongoClient(os.getenv('MONGODB_URI'))
+        self.client = AsyncIOMotorClient(os.getenv('MONGODB_URI'), **pool_options)
         self.db = self.client[os.getenv('MONGODB_DATABASE')]
         self.news_collection = self.db[os.getenv('MONGODB_COLLECTION')]
         self.news_list_collection = self.db[os.getenv('MONGODB_COLLECTION_NEWS_LIST')]
 
         # 사용자 정보 데이터베이스 연결
-        self.user_client = MongoClient(os.getenv('MONGODB_USER_URI'))
+        self.user_client = AsyncIOMotorClient(os.getenv('MONGODB_USER_URI'), **pool_options)
         self.user_db = self.user_client[os.getenv('MONGODB_USER_DATABASE')]
         self.user_collection = self.user_db[os.getenv('MONGODB_USER_INFO_COLLECTION')]
         self.user_subscriptions_collection = self.db[os.getenv('MONGODB_USER_SUBSCRIPTIONS_COLLECTION')]
 
         self.subscriptions_collection = self.user_db[os.getenv('MONGODB_SUBSCRIPTIONS_COLLECTION')]
         self.subscriptions_list_collection = self.db[os.getenv('MONGODB_SUBSCRIPTION_LIST_COLLECTION')]
-        
+
         self.user_click_event = self.db[os.getenv('MONGODB_USER_CLICK_EVENT_COLLECTION')]
 
+        # 컨슈머가 기사 저장 후 올리는 컬렉션 버전 카운터 (응답 캐시 무효화용)
+        self.version_collection = self.db[os.getenv('MONGODB_VERSION_COLLECTION', 'collection_versions')]
+
+    def close(self):
+        if self.client is not None:
+            self.client.close()
+        if self.user_client is not None:
+            self.user_client.close()
+        self.client = self.user_client = None
+
     def get_collection_name(self, env_var, default):
         name = os.getenv(env_var)
         if name is None:
@@ -42,7 +73,7 @@ class Database:
 
     def get_user_subscription(self):
         return self.user_collection
-    
+
     def get_users_subscriptions_collection(self):
         return self.user_subscriptions_collection
 
@@ -51,12 +82,9 @@ class Database:
 
     def get_subscriptions_list_collection(self):
         return self.subscriptions_list_collection
-    
+
     def get_click_event_collection(self):
         return self.user_click_event
 
-    def get_subscriptions_collection(self):
-        return self.subscriptions_collection
-
-# 데이터베이스 인스턴스 생성
-db = Database()
\ No newline at end of file
+    def get_version_collection(self):
+        return self.version_collection
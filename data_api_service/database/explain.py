@@ -0,0 +1,95 @@
+# data_api_service/database/explain.py
+"""Run explain() on the queries issued by the models and report the ones
+that are not served by an index.
+
+Run from data_api_service:  python -m database.explain
+"""
+import asyncio
+import sys
+from collections import namedtuple
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import DESCENDING
+
+from database import db
+from database.indexes import apply_indexes
+from news.pagination import FEED_SORT, after_filter, encode_cursor
+
+ModelQuery = namedtuple('ModelQuery', ['name', 'getter', 'filter', 'sort'])
+
+SAMPLE_ID = ObjectId()
+SAMPLE_CURSOR = encode_cursor({'_id': SAMPLE_ID, 'published_at': datetime.utcnow()})
+
+# 모델이 실제로 보내는 조회와 같은 형태 (값은 임의)
+QUERIES = [
+    ModelQuery('news.get_news', 'get_news_collection', {'is_duplicate': {'$ne': True}}, FEED_SORT),
+    ModelQuery('news.get_news(after)', 'get_news_collection',
+               {'$and': [{'is_duplicate': {'$ne': True}}, after_filter(SAMPLE_CURSOR)]}, FEED_SORT),
+    ModelQuery('news.find_by_id', 'get_news_collection', {'_id': SAMPLE_ID}, None),
+    ModelQuery('consumer.upsert_by_url', 'get_news_collection', {'url': 'https://example.com/a'}, None),
+    ModelQuery('subscriptions.get_subscribed_news', 'get_news_collection',
+               {'source': {'$in': ['example', 'other']}, 'is_duplicate': {'$ne': True}}, FEED_SORT),
+    ModelQuery('subscriptions.feed_sources', 'get_users_subscriptions_collection',
+               {'user_id': SAMPLE_ID, 'is_subscribe': True}, None),
+    ModelQuery('subscriptions.find_subscriptions', 'get_users_subscriptions_collection',
+               {'user_id': SAMPLE_ID, 'is_subscribe': True}, [('created_at', DESCENDING)]),
+    ModelQuery('subscriptions.find_one', 'get_users_subscriptions_collection',
+               {'news_id': str(SAMPLE_ID), 'user_id': SAMPLE_ID}, None),
+    # email 인덱스는 부분 인덱스이므로 문자열 값 조회여야 사용됨
+    ModelQuery('users.find_by_email', 'get_user_collection', {'email': 'user@example.com'}, None),
+    ModelQuery('users.find_by_username', 'get_user_collection', {'username': 'user'}, None),
+    ModelQuery('users.get_user_subscriptions', 'get_user_collection',
+               {'user_id': SAMPLE_ID, 'is_subscribe': True}, None),
+    # email 이 없는 구독 문서의 upsert (email 부분 인덱스에 들어가지 않음)
+    ModelQuery('users.update_user_subscription', 'get_user_collection',
+               {'user_id': SAMPLE_ID, 'news_source_id': 'example'}, None),
+]
+
+
+def plan_stages(plan):
+    """All stage names of a (possibly nested) winning plan."""
+    if not isinstance(plan, dict):
+        return []
+    stages = [plan['stage']] if 'stage' in plan else []
+    for key in ('inputStage', 'queryPlan'):
+        stages += plan_stages(plan.get(key))
+    for child in plan.get('inputStages', []):
+        stages += plan_stages(child)
+    return stages
+
+
+async def explain(query):
+    cursor = getattr(db, query.getter)().find(query.filter)
+    if query.sort:
+        cursor = cursor.sort(query.sort)
+    result = await cursor.explain()
+    stages = plan_stages(result['queryPlanner']['winningPlan'])
+    problems = []
+    if 'COLLSCAN' in stages:
+        problems.append('collection scan')
+    if 'SORT' in stages:
+        problems.append('in-memory sort')
+    return stages, problems
+
+
+async def main():
+    db.connect()
+    try:
+        if '--apply' in sys.argv:
+            await apply_indexes(db)
+        failures = 0
+        for query in QUERIES:
+            stages, problems = await explain(query)
+            status = 'OK  ' if not problems else 'FAIL'
+            failures += bool(problems)
+            detail = f" ({', '.join(problems)})" if problems else ''
+            print(f"{status} {query.name:<40} {' <- '.join(stages)}{detail}")
+        print(f"{len(QUERIES) - failures}/{len(QUERIES)} queries use an index")
+        return 1 if failures else 0
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,46 @@
+# data_api_service/database/indexes.py
+import logging
+from collections import namedtuple
+
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+IndexSpec = namedtuple('IndexSpec', ['keys', 'options'])
+
+# Database 의 컬렉션 getter 이름 -> 인덱스 목록
+# news 항목은 consumer_service/indexes.py 와 동일하게 유지 (어느 쪽이 먼저 떠도 같은 인덱스)
+INDEXES = {
+    'get_news_collection': [
+        IndexSpec([('url', 1)], {'unique': True, 'partialFilterExpression': {'url': {'$type': 'string'}}}),
+        IndexSpec([('cluster_id', 1)], {}),
+        IndexSpec([('published_at', -1), ('source', 1)], {}),
+        IndexSpec([('published_at', -1), ('_id', -1)], {}),
+        IndexSpec([('source', 1), ('published_at', -1), ('_id', -1)], {}),
+    ],
+    'get_user_collection': [
+        # 같은 컬렉션에 email 없는 구독 문서(users.models.SubscriptionModel)도 있으므로 문자열만 유일성 검사
+        IndexSpec([('email', 1)], {'unique': True, 'partialFilterExpression': {'email': {'$type': 'string'}}}),
+        IndexSpec([('username', 1)], {}),
+        # users.models.SubscriptionModel 이 같은 컬렉션에서 구독 상태를 조회
+        IndexSpec([('user_id', 1), ('is_subscribe', 1)], {}),
+        IndexSpec([('user_id', 1), ('news_source_id', 1)], {}),
+    ],
+    'get_users_subscriptions_collection': [
+        IndexSpec([('user_id', 1), ('is_subscribe', 1), ('created_at', -1)], {}),
+        IndexSpec([('user_id', 1), ('news_id', 1)], {}),
+    ],
+}
+
+
+async def apply_indexes(database):
+    """Create every registered index; existing identical indexes are left as is."""
+    for getter, specs in INDEXES.items():
+        collection = getattr(database, getter)()
+        for spec in specs:
+            try:
+                name = await collection.create_index(spec.keys, **spec.options)
+                logger.info("Index ready on %s: %s", collection.name, name)
+            except OperationFailure as e:
+                # 기존 중복 데이터나 다른 정의의 같은 이름 인덱스가 있어도 API 는 계속 시작
+                logger.warning("Could not create index %s on %s: %s", spec.keys, collection.name, str(e))
@@ -0,0 +1,64 @@
+# data_api_service/database/pool_stats.py
+import threading
+from collections import defaultdict
+
+from pymongo import monitoring
+
+COUNTERS = ('open', 'in_use', 'waiting', 'created', 'closed', 'checkouts', 'checkout_failures', 'cleared')
+
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """Connection pool counters per server, fed by pymongo pool events.
+
+    Events arrive on driver threads, so updates are taken under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._servers = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+
+    def _update(self, address, **deltas):
+        with self._lock:
+            counters = self._servers['%s:%s' % address]
+            for name, delta in deltas.items():
+                counters[name] += delta
+
+    def pool_created(self, event):
+        self._update(event.address)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._update(event.address, cleared=1)
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._update(event.address, open=1, created=1)
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._update(event.address, open=-1, closed=1)
+
+    def connection_check_out_started(self, event):
+        self._update(event.address, waiting=1)
+
+    def connection_check_out_failed(self, event):
+        self._update(event.address, waiting=-1, checkout_failures=1)
+
+    def connection_checked_out(self, event):
+        self._update(event.address, waiting=-1, in_use=1, checkouts=1)
+
+    def connection_checked_in(self, event):
+        self._update(event.address, in_use=-1)
+
+    def stats(self):
+        with self._lock:
+            return {address: dict(counters) for address, counters in self._servers.items()}
+
+
+pool_stats = PoolStats()
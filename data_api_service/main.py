@@ -1,33 +1,102 @@
 # data_api_service/main.py
+import asyncio
 import logging
-from fastapi import FastAPI
+import os
+from contextlib import asynccontextmanager
+
+# 콜드 스타트 측정을 위해 가장 먼저 임포트
+from common.lifecycle import lifecycle
+
+from fastapi import FastAPI, Response
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.base import BaseHTTPMiddleware
+
+from auth import password_hasher, token_cache
+from database import db
+from database.indexes import apply_indexes
+from database.pool_stats import pool_stats
+from news.counters import news_counts
+from common.cache import response_cache
+from common.logs import RequestLogMiddleware, configure_logging
+from common.metrics import MetricsMiddleware, metrics_writer, render as render_metrics
+from common.profiling import request_profiler
+from news.search import SEARCH_SNAPSHOT_PATH, search_index, search_snapshots
+from news.stream import news_stream
+from news.tailer import article_tailer, click_tailer
+from news.trending import trending
+from users.clicks import click_buffer
+from users.models import ClickEventModel
 
 # 라우터 임포트
 from users.routes import router as user_router
 from news.routes import router as news_router
 from subscriptions.routes import router as subscription_router
 
-# 로거 설정
+# 로깅 설정: 큐를 거쳐 별도 스레드에서 JSON 으로 기록 (LOG_LEVEL, LOG_LEVELS, LOG_FORMAT)
+configure_logging()
 logger = logging.getLogger(__name__)
-# 로깅 설정
-logging.basicConfig(level=logging.DEBUG,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
 
+# serve.py 가 워커를 띄우기 전에 한 번 인덱스를 만들면 워커는 건너뜀
+APPLY_INDEXES_ON_STARTUP = os.getenv('APPLY_INDEXES_ON_STARTUP', '1') != '0'
+READINESS_TIMEOUT = float(os.getenv('READINESS_TIMEOUT', 1.0))
+
+lifecycle.mark_imported()
+# 종료 시작 시 SSE 연결을 닫아 서버가 진행 중인 요청만 마무리하고 내려가게 함
+lifecycle.on_drain(news_stream.close)
 
-app = FastAPI()
 
-# 간단한 로그 미들웨어 추가
-class LogMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request, call_next):
-        logger = logging.getLogger("uvicorn")
-        logger.debug(f"Request path: {request.url.path}")
-        response = await call_next(request)
-        logger.debug(f"Response status: {response.status_code}")
-        return response
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    lifecycle.install_signal_handlers()
+    # bcrypt 는 이벤트 루프를 막지 않도록 별도 프로세스 풀에서 실행 (드라이버 스레드가 뜨기 전에 시작)
+    with lifecycle.step('password_pool'):
+        await password_hasher.start()
+    # MongoDB 커넥션 풀은 워커마다 시작 시 열고 (연결은 첫 사용 시 생성) 종료 시 닫음
+    db.connect()
+    if APPLY_INDEXES_ON_STARTUP:
+        # 모델 조회에 필요한 인덱스를 생성 (이미 있으면 그대로 둠)
+        with lifecycle.step('indexes'):
+            await apply_indexes(db)
+    news_counts.start()
+    # 컨슈머가 올리는 뉴스 컬렉션 버전을 따라가며 응답 캐시를 무효화
+    response_cache.start(db.get_version_collection(), db.get_news_collection().name)
+    # 검색 인덱스는 스냅샷에서 복원한 뒤 그 이후 저장된 기사만 따라가며 추가
+    with lifecycle.step('search_snapshot'):
+        search_index.load(SEARCH_SNAPSHOT_PATH)
+    article_tailer.subscribe(search_index.add_many)
+    # 새 기사를 /news/stream 구독자에게 전달
+    article_tailer.subscribe(news_stream.publish)
+    article_tailer.start(db.get_news_collection, start_after=search_index.last_id)
+    search_snapshots.start()
+    # 클릭 이벤트는 버퍼에 모아 배치로 저장
+    click_buffer.start(ClickEventModel().insert_many)
+    # 저장된 클릭을 따라가며 인기 기사 점수를 갱신 (모든 워커가 모든 클릭을 봄, 시작 시 최근 클릭부터 재생)
+    click_tailer.subscribe(trending.record_clicks)
+    click_tailer.start(db.get_click_event_collection, start_after=trending.replay_from())
+    trending.start(db.get_news_collection)
+    # 다른 워커의 /metrics 가 합산할 수 있도록 주기적으로 스냅샷을 기록
+    metrics_writer.start()
+    lifecycle.mark_ready()
+    yield
+    lifecycle.drain()
+    await click_buffer.stop()
+    await click_tailer.stop()
+    await trending.stop()
+    await article_tailer.stop()
+    await search_snapshots.stop()
+    await response_cache.stop()
+    await news_counts.stop()
+    db.close()
+    password_hasher.stop()
+    await metrics_writer.stop()
 
-app.add_middleware(LogMiddleware)
+
+app = FastAPI(lifespan=lifespan)
+
+# 요청 로그는 오류/느린 요청 전부와 일부 표본만 기록 (LOG_SAMPLE_RATE, LOG_SLOW_REQUEST_MS)
+app.add_middleware(RequestLogMiddleware)
+# 라우트별 지연 시간 히스토그램, 처리 중 요청 수, Server-Timing 헤더, 샘플링 프로파일러 (PROFILE_SAMPLE_RATE)
+app.add_middleware(MetricsMiddleware)
 
 # CORS 미들웨어 설정
 app.add_middleware(
@@ -43,7 +112,52 @@ app.include_router(user_router, prefix="/users", tags=["Users"])
 app.include_router(news_router, prefix="/news", tags=["News"])
 app.include_router(subscription_router, prefix="/subscriptions", tags=["Subscriptions"])
 
-# 헬스 체크 엔드포인트
+# 헬스 체크 엔드포인트 (프로세스 생존 여부)
 @app.get("/healthcheck")
 def healthcheck():
-    return {"status": "OK"}
\ No newline at end of file
+    return {"status": "OK"}
+
+# 트래픽을 받을 준비 여부: 시작 완료, 종료 중 아님, MongoDB 응답
+@app.get("/readiness")
+async def readiness(response: Response):
+    body = {"status": "ready", "startup_ms": lifecycle.timings}
+    if not lifecycle.ready:
+        body["status"] = "draining" if lifecycle.draining else "starting"
+    else:
+        try:
+            await asyncio.wait_for(db.client.admin.command("ping"), READINESS_TIMEOUT)
+        except Exception as e:
+            body.update(status="unavailable", error=str(e))
+    if body["status"] != "ready":
+        response.status_code = 503
+    return body
+
+# Prometheus 수집용 지표 (모든 워커 합산)
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+# 프로파일러 상태 확인용
+@app.get("/profiler/stats")
+def profiler_stats():
+    return request_profiler.counters
+
+# MongoDB 커넥션 풀 상태 확인용 (워커별)
+@app.get("/pool/stats")
+def connection_pool_stats():
+    return {"pid": os.getpid(), "servers": pool_stats.stats()}
+
+# 응답 캐시 상태 확인용
+@app.get("/cache/stats")
+def cache_stats():
+    return response_cache.stats()
+
+# 클릭 버퍼 상태 확인용
+@app.get("/clicks/stats")
+def click_stats():
+    return click_buffer.stats()
+
+# 인증 처리 상태 확인용
+@app.get("/auth/stats")
+def auth_stats():
+    return {"passwords": password_hasher.stats(), "tokens": token_cache.stats()}
@@ -0,0 +1,62 @@
+# data_api_service/news/counters.py
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class CountCache:
+    """Collection counts served from memory and refreshed in the background.
+
+    The first request for a count computes it once; afterwards a background
+    task recomputes every registered count each ``refresh_interval`` seconds,
+    so page requests never pay for a collection-wide count. Counts of an
+    empty filter use the collection metadata estimate.
+    """
+
+    def __init__(self, refresh_interval=30):
+        self.refresh_interval = refresh_interval
+        self._counts = {}
+        self._sources = {}  # name -> (collection getter, query)
+        self._task = None
+
+    @staticmethod
+    async def _count(collection, query):
+        if not query:
+            return await collection.estimated_document_count()
+        return await collection.count_documents(query)
+
+    async def get(self, name, get_collection, query):
+        if name not in self._counts:
+            self._sources[name] = (get_collection, query)
+            self._counts[name] = await self._count(get_collection(), query)
+        return self._counts[name]
+
+    async def refresh(self):
+        for name, (get_collection, query) in list(self._sources.items()):
+            try:
+                self._counts[name] = await self._count(get_collection(), query)
+            except Exception as e:
+                logger.warning("Failed to refresh count %s: %s", name, str(e))
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            await self.refresh()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+news_counts = CountCache(refresh_interval=int(os.getenv('NEWS_COUNT_REFRESH_INTERVAL', 30)))
@@ -1,49 +1,85 @@
+import asyncio
 from pymongo import DESCENDING
 from bson import ObjectId
 from database import db
+from common.metrics import measure
+from .counters import news_counts
+from .pagination import FEED_SORT, after_filter, encode_cursor
+from .serialization import projection
 import logging
 
 
 class NewsModel:
-    def __init__(self):
-        self.news_collection = db.get_news_collection()
-        self.news_list_collection = db.get_news_list_collection()
+    # 컬렉션은 lifespan 에서 연결된 뒤에 조회되도록 프로퍼티로 가져옴
+    @property
+    def news_collection(self):
+        return db.get_news_collection()
 
-    def get_news(self, skip: int, limit: int):
-        news_cursor = self.news_collection.find().sort([("published_at", DESCENDING)]).skip(skip).limit(limit)
-        total_items = self.news_collection.count_documents({})
-        return list(news_cursor), total_items
+    @property
+    def news_list_collection(self):
+        return db.get_news_list_collection()
 
-    def get_news_list(self):
+    async def get_news(self, skip: int, limit: int, collapse: bool = True, after: str = None,
+                       fields: tuple = None):
+        """Return one feed page, the (cached) total and the cursor of the next page.
+
+        With ``after`` the page starts right after that cursor using the
+        (published_at, _id) index, so any depth costs the same; otherwise
+        ``skip`` is applied as before. Only the served ``fields`` are loaded.
+        """
+        # collapse=True 이면 유사 기사 클러스터의 대표 기사만 반환
+        base_query = {"is_duplicate": {"$ne": True}} if collapse else {}
+        query = base_query
+        if after:
+            query = {"$and": [base_query, after_filter(after)]} if base_query else after_filter(after)
+        news_cursor = self.news_collection.find(query, projection(fields)).sort(FEED_SORT)
+        if not after:
+            news_cursor = news_cursor.skip(skip)
+        news_items, total_items = await asyncio.gather(
+            measure("db", news_cursor.limit(limit).to_list(length=limit)),
+            measure("count", news_counts.get("news:collapsed" if collapse else "news:all",
+                                             db.get_news_collection, base_query)),
+        )
+        next_cursor = encode_cursor(news_items[-1]) if len(news_items) == limit else None
+        return news_items, total_items, next_cursor
+
+    async def get_news_list(self):
         news_cursor = self.news_list_collection.find().sort([("published_at", DESCENDING)])
-        total_items = self.news_list_collection.count_documents({})
-        return list(news_cursor), total_items
-        
+        news_items, total_items = await asyncio.gather(
+            news_cursor.to_list(length=None),
+            self.news_list_collection.count_documents({}),
+        )
+        return news_items, total_items
+
+
+    async def find_by_id(self, news_id, fields: tuple = None):
+        return await self.news_collection.find_one({"_id": ObjectId(news_id)}, projection(fields))
 
-    def find_by_id(self, news_id):
-        return self.news_collection.find_one({"_id": ObjectId(news_id)})
+    async def find_by_ids(self, news_ids, fields: tuple = None):
+        """Fetch articles by id, returned in the order of ``news_ids``."""
+        docs = await self.news_collection.find({"_id": {"$in": list(news_ids)}}, projection(fields)).to_list(length=None)
+        by_id = {doc["_id"]: doc for doc in docs}
+        return [by_id[news_id] for news_id in news_ids if news_id in by_id]
 
-    def insert_one(self, news_data):
-        return self.news_collection.insert_one(news_data).inserted_id
+    async def insert_one(self, news_data):
+        result = await self.news_collection.insert_one(news_data)
+        return result.inserted_id
 
-    def update_one(self, news_id, news_data):
-        return self.news_collection.update_one({"_id": ObjectId(news_id)}, {"$set": news_data})
+    async def update_one(self, news_id, news_data):
+        return await self.news_collection.update_one({"_id": ObjectId(news_id)}, {"$set": news_data})
 
-    def delete_one(self, news_id):
-        return self.news_collection.delete_one({"_id": ObjectId(news_id)})
-    
-    def get_news_sources(self):
+    async def delete_one(self, news_id):
+        return await self.news_collection.delete_one({"_id": ObjectId(news_id)})
+
+    async def get_news_sources(self):
         try:
             # news_collection에서 고유한 source 값들을 가져옵니다.
-            sources = list(self.news_collection.distinct("source"))
-            
+            sources = await self.news_collection.distinct("source")
+
             # 결과를 원하는 형식으로 변환합니다.
             result = [{"source": source} for source in sources]
-            
-            # 결과 로깅
-            logging.info(f"Retrieved {len(result)} unique news sources")
-            
+
             return result
         except Exception as e:
-            logging.error(f"Error retrieving news sources: {str(e)}")
+            logging.error("Error retrieving news sources: %s", e)
             raise
@@ -0,0 +1,53 @@
+# data_api_service/news/pagination.py
+import base64
+import json
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import DESCENDING
+
+# 최신순 정렬 + 같은 시각이면 _id 로 순서를 고정 (keyset 페이지네이션의 기준)
+FEED_SORT = [("published_at", DESCENDING), ("_id", DESCENDING)]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(doc):
+    """Opaque token pointing just after ``doc`` in FEED_SORT order."""
+    published_at = doc.get("published_at")
+    payload = {"i": str(doc["_id"])}
+    if isinstance(published_at, datetime):
+        payload["d"] = published_at.isoformat()
+    elif published_at is not None:
+        payload["s"] = str(published_at)
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(token):
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        last_id = ObjectId(payload["i"])
+        if "d" in payload:
+            published_at = datetime.fromisoformat(payload["d"])
+        else:
+            published_at = payload.get("s")
+    except Exception as e:
+        raise InvalidCursor(f"Invalid cursor: {token}") from e
+    return published_at, last_id
+
+
+def after_filter(token):
+    """Query selecting the documents that come after ``token`` in FEED_SORT order."""
+    published_at, last_id = decode_cursor(token)
+    if published_at is None:
+        # published_at 이 없는 문서는 내림차순에서 가장 마지막
+        return {"published_at": None, "_id": {"$lt": last_id}}
+    return {"$or": [
+        {"published_at": {"$lt": published_at}},
+        {"published_at": published_at, "_id": {"$lt": last_id}},
+        {"published_at": None},
+    ]}
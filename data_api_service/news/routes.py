@@ -1,10 +1,20 @@
 # ## data_api_service/news/routes.py
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import datetime
+import asyncio
+import time
+from common.cache import cached_response
+from common.metrics import measure, timed
 from .models import NewsModel
-from .schemas import NewsResponse, NewsData
-from fastapi.encoders import jsonable_encoder
+from .pagination import InvalidCursor
+from .serialization import dumps, parse_fields
+from .search import search_index, to_timestamp
+from .stream import STREAM_HEARTBEAT_INTERVAL, news_stream
+from .trending import trending
+from .schemas import NewsResponse, NewsData, SearchResponse
 from typing import List
-from bson import ObjectId
 import logging
 from subscriptions.sources import router as sources_router
 
@@ -16,33 +26,133 @@ news_model = NewsModel()
 
 
 @router.get("/", response_model=NewsResponse)
-async def get_news(page: int = 1, page_size: int = 10):
+async def get_news(request: Request, page: int = 1, page_size: int = 10, collapse: bool = True,
+                   after: Optional[str] = None, fields: Optional[str] = None):
+    # after 가 있으면 커서 기반, 없으면 기존 page/page_size 방식
     skip = (page - 1) * page_size
-    news_items, total_items = news_model.get_news(skip, page_size)
-    news_list = [NewsData(**jsonable_encoder(news, custom_encoder={ObjectId: str})) for news in news_items]
-    return NewsResponse(newsList=news_list, totalItems=total_items)
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def build():
+        try:
+            news_items, total_items, next_cursor = await news_model.get_news(
+                skip, page_size, collapse, after, selected)
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        # Pydantic 검증 없이 Mongo 문서를 바로 JSON 바이트로 인코딩
+        with timed("encode"):
+            return dumps({"newsList": news_items, "totalItems": total_items, "nextCursor": next_cursor})
+
+    return await cached_response(request, build)
+
+@router.get("/search", response_model=SearchResponse)
+async def search_news(q: str = Query(..., min_length=1), limit: int = Query(10, ge=1, le=100),
+                      source: Optional[str] = None, since: Optional[datetime] = None,
+                      until: Optional[datetime] = None, fields: Optional[str] = None):
+    # source 는 쉼표로 여러 개 지정 가능
+    started = time.perf_counter()
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    sources = [s.strip() for s in source.split(',') if s.strip()] if source else None
+    with timed("search"):
+        hits, total_hits, exact = search_index.search(q, limit, sources, to_timestamp(since), to_timestamp(until))
+    scores = dict(hits)
+    news_items = await measure("db", news_model.find_by_ids([news_id for news_id, _ in hits], selected))
+    for news in news_items:
+        news["score"] = round(scores[news["_id"]], 4)
+    took_ms = round((time.perf_counter() - started) * 1000, 2)
+    # totalHitsRelation: "eq" 는 정확한 수, "gte" 는 가지치기로 얻은 하한
+    body = {"results": news_items, "totalHits": total_hits, "totalHitsRelation": "eq" if exact else "gte",
+            "tookMs": took_ms}
+    return Response(content=dumps(body), media_type="application/json")
+
+def split_param(value):
+    return [v.strip() for v in value.split(',') if v.strip()] if value else None
+
+@router.get("/stream")
+async def stream_news(request: Request, source: Optional[str] = None, topic: Optional[str] = None,
+                      last_event_id: Optional[str] = None):
+    """Server-Sent Events feed of newly stored articles, optionally filtered by source/topic."""
+    client = news_stream.register(split_param(source), split_param(topic))
+    if client is None:
+        raise HTTPException(status_code=503, detail="Too many stream clients")
+    # EventSource 는 재연결 시 Last-Event-ID 헤더를 보냄
+    resume_from = request.headers.get("last-event-id") or last_event_id
+
+    async def events():
+        try:
+            yield b"retry: 3000\n\n"
+            replayed = set()
+            if resume_from:
+                for doc_id, event in await news_stream.replay(client, resume_from, news_model.news_collection):
+                    replayed.add(doc_id)
+                    yield event
+            # 큐가 넘치거나 워커가 종료 중이면 남은 이벤트만 보내고 연결을 끊음
+            while not client.finished:
+                try:
+                    item = await asyncio.wait_for(client.queue.get(), STREAM_HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield b": ping\n\n"
+                    continue
+                if item is not None and item[0] not in replayed:
+                    yield item[1]
+        finally:
+            news_stream.unregister(client)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.get("/stream/stats")
+async def stream_stats():
+    return news_stream.stats()
+
+@router.get("/trending", response_model=List[NewsData])
+async def get_trending_news(source: Optional[str] = None, topic: Optional[str] = None,
+                            limit: int = Query(20, ge=1, le=100)):
+    # 클릭 스트림으로 미리 계산해 둔 목록을 메모리에서 바로 반환
+    try:
+        items = trending.get(source, topic, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=dumps(items), media_type="application/json")
+
+@router.get("/trending/stats")
+async def trending_stats():
+    return trending.stats()
 
 @router.get("/list", response_model=NewsResponse)
 async def get_news_list() :
-    news_items, total_items = news_model.get_news_list()
+    news_items, total_items = await news_model.get_news_list()
     news_list = [NewsData(**news) for news in news_items]
     return {"newsList": news_list, "totalItems": total_items}
 
 
 @router.get("/details/{news_id}", response_model=NewsData)
-async def get_news_by_id(news_id: str):
-    news_item = news_model.find_by_id(news_id)
-    if not news_item:
-        raise HTTPException(status_code=404, detail="News not found")
-    return NewsData(**jsonable_encoder(news_item, custom_encoder={ObjectId: str}))
+async def get_news_by_id(request: Request, news_id: str, fields: Optional[str] = None):
+    try:
+        selected = parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def build():
+        news_item = await news_model.find_by_id(news_id, selected)
+        if not news_item:
+            raise HTTPException(status_code=404, detail="News not found")
+        return dumps(news_item)
+
+    return await cached_response(request, build)
 
 
 
 @router.get("/news_sources", response_model=List[dict])
 async def get_news_sources():
     try:
-        sources = news_model.get_news_sources()
+        sources = await news_model.get_news_sources()
         return sources
     except Exception as e:
-        logging.error(f'Error fetching news sources: {str(e)}')
+        logging.error("Error fetching news sources: %s", e)
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
\ No newline at end of file
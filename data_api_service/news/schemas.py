@@ -33,6 +33,7 @@ class NewsData(BaseModel):
     language: Optional[str] = None  # 선택적으로 변경
     country: Optional[str] = None  # 선택적으로 변경
     published_at: Optional[datetime] = None  # 선택적으로 변경
+    cluster_id: Optional[str] = None  # 같은 기사를 묶는 유사 기사 클러스터 ID
 
  
     class Config:
@@ -43,6 +44,16 @@ class NewsData(BaseModel):
 class NewsResponse(BaseModel):
     newsList: List[NewsData]
     totalItems: int
+    nextCursor: Optional[str] = None  # 다음 페이지를 ?after= 로 요청할 때 사용
+
+class SearchHit(NewsData):
+    score: float
+
+class SearchResponse(BaseModel):
+    results: List[SearchHit]
+    totalHits: int
+    totalHitsRelation: str = "eq"  # "gte": 가지치기로 totalHits 가 하한값
+    tookMs: float
 
 class NewsCreate(NewsData):
     pass
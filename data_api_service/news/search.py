@@ -0,0 +1,309 @@
+# data_api_service/news/search.py
+import asyncio
+import heapq
+from bisect import bisect_left
+import logging
+import math
+import os
+import pickle
+import re
+from array import array
+from datetime import datetime, timezone
+from operator import itemgetter
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+STOPWORDS = frozenset((
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in', 'is',
+    'it', 'its', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'were', 'will', 'with',
+))
+MAX_TF = 65535  # array('H') 범위
+SNAPSHOT_VERSION = 1
+
+
+def tokenize(text):
+    if not text:
+        return []
+    # 영문 한 글자 토큰은 버리고, 한글 등은 한 글자도 유지
+    return [
+        token for token in TOKEN_RE.findall(text.lower())
+        if token not in STOPWORDS and (len(token) > 1 or not token.isascii())
+    ]
+
+
+def to_timestamp(value):
+    """Epoch seconds of a datetime; naive values are taken as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class SearchIndex:
+    """In-process BM25 index over article title, description and content.
+
+    Documents get dense integer numbers in insertion order, so every posting
+    list is a pair of compact arrays (document numbers, term frequencies)
+    that only ever grows at the end. Title terms count ``title_weight`` times.
+    Per-document length, source and publication time live in parallel arrays
+    for scoring and filtering.
+
+    Queries are scored term by term from the rarest term (MaxScore): once the
+    current top ``limit`` can no longer be overtaken by documents that only
+    contain the remaining common terms, those terms just update the existing
+    candidates by binary search instead of walking their whole posting list.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, title_weight=2):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        self._reset()
+
+    def _reset(self):
+        self.doc_ids = []  # 문서 번호 -> ObjectId
+        self._doc_numbers = {}
+        self.doc_lengths = array('I')
+        self.doc_sources = array('I')
+        self.doc_published = array('d')  # epoch 초, 날짜가 없으면 0
+        self.sources = []
+        self._source_numbers = {}
+        self.postings = {}  # term -> (array('I') 문서 번호, array('H') 빈도)
+        self.total_length = 0
+        self.last_id = None
+        self.dirty = False
+        # 문서별 BM25 길이 정규화 값 (평균 길이가 2% 이상 변하면 다시 계산)
+        self._norms = array('d')
+        self._norms_avg = None
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def _source_number(self, source):
+        number = self._source_numbers.get(source)
+        if number is None:
+            number = self._source_numbers[source] = len(self.sources)
+            self.sources.append(source)
+        return number
+
+    def add(self, doc):
+        """Index one article; returns False if it was skipped."""
+        doc_id = doc['_id']
+        if self.last_id is None or doc_id > self.last_id:
+            self.last_id = doc_id
+            self.dirty = True
+        # 유사 기사 클러스터의 대표 기사만 검색 대상
+        if doc_id in self._doc_numbers or doc.get('is_duplicate'):
+            return False
+
+        counts = {}
+        for token in tokenize(doc.get('title')):
+            counts[token] = counts.get(token, 0) + self.title_weight
+        for field in ('description', 'content'):
+            for token in tokenize(doc.get(field)):
+                counts[token] = counts.get(token, 0) + 1
+        if not counts:
+            return False
+
+        number = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self._doc_numbers[doc_id] = number
+        length = sum(counts.values())
+        self.doc_lengths.append(length)
+        self.total_length += length
+        self.doc_sources.append(self._source_number(doc.get('source') or ''))
+        published_at = doc.get('published_at')
+        self.doc_published.append(to_timestamp(published_at) if isinstance(published_at, datetime) else 0.0)
+        for token, tf in counts.items():
+            entry = self.postings.get(token)
+            if entry is None:
+                entry = self.postings[token] = (array('I'), array('H'))
+            entry[0].append(number)
+            entry[1].append(min(tf, MAX_TF))
+        return True
+
+    async def add_many(self, docs):
+        added = sum(self.add(doc) for doc in docs)
+        if added:
+            logger.debug("Indexed %d articles (%d total)", added, len(self.doc_ids))
+
+    def search(self, query, limit=10, sources=None, since=None, until=None):
+        """Top ``limit`` (ObjectId, score) pairs for ``query``, the number of
+        matches and whether that number is exact.
+
+        When pruning skipped the posting lists of common terms, only the
+        documents actually scored are counted, a lower bound of the matches.
+        ``sources`` restricts to those source names; ``since``/``until`` bound
+        the publication time (epoch seconds, inclusive).
+        """
+        terms = set(tokenize(query))
+        count = len(self.doc_ids)
+        if not terms or not count:
+            return [], 0, True
+
+        allowed = None
+        if sources:
+            allowed = {self._source_numbers[s] for s in sources if s in self._source_numbers}
+            if not allowed:
+                return [], 0, True
+        filtered = allowed is not None or since is not None or until is not None
+
+        def accepted(number):
+            if allowed is not None and self.doc_sources[number] not in allowed:
+                return False
+            published = self.doc_published[number]
+            if since is not None and published < since:
+                return False
+            return until is None or published <= until
+
+        norms = self._length_norms()
+        k1 = self.k1
+        # 드문 용어부터 처리 (상한 점수가 큰 순서)
+        weighted = []
+        for term in terms:
+            entry = self.postings.get(term)
+            if entry is not None:
+                df = len(entry[0])
+                weighted.append((math.log(1 + (count - df + 0.5) / (df + 0.5)), entry))
+        weighted.sort(key=itemgetter(0), reverse=True)
+        # 남은 용어들로 얻을 수 있는 최대 점수 (tf 가 무한대일 때 idf * (k1 + 1))
+        remaining = [0.0] * (len(weighted) + 1)
+        for i in range(len(weighted) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + weighted[i][0] * (k1 + 1)
+
+        scores = {}
+        pruned = False
+        for i, (idf, (numbers, tfs)) in enumerate(weighted):
+            if not pruned and len(scores) >= limit:
+                threshold = heapq.nlargest(limit, scores.values())[-1]
+                pruned = threshold > remaining[i]
+            if pruned:
+                # 후보 문서만 이진 탐색으로 갱신
+                size = len(numbers)
+                for number in scores:
+                    pos = bisect_left(numbers, number)
+                    if pos < size and numbers[pos] == number:
+                        tf = tfs[pos]
+                        scores[number] += idf * tf * (k1 + 1) / (tf + norms[number])
+                continue
+            for number, tf in zip(numbers, tfs):
+                if filtered and not accepted(number):
+                    continue
+                scores[number] = scores.get(number, 0.0) + idf * tf * (k1 + 1) / (tf + norms[number])
+
+        top = heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+        # 가지치기한 경우 건너뛴 목록을 다시 훑지 않고 점수를 매긴 문서 수만 반환 (하한)
+        return [(self.doc_ids[number], score) for number, score in top], len(scores), not pruned
+
+    def _length_norms(self):
+        avg_length = self.total_length / len(self.doc_ids)
+        norms = self._norms
+        if self._norms_avg is None or abs(avg_length - self._norms_avg) > 0.02 * self._norms_avg:
+            norms = self._norms = array('d')
+            self._norms_avg = avg_length
+        scale = self.k1 * self.b / self._norms_avg
+        base = self.k1 * (1 - self.b)
+        doc_lengths = self.doc_lengths
+        for number in range(len(norms), len(doc_lengths)):
+            norms.append(base + scale * doc_lengths[number])
+        return norms
+
+    def _state(self):
+        return {
+            'version': SNAPSHOT_VERSION,
+            'doc_ids': self.doc_ids,
+            'doc_lengths': self.doc_lengths,
+            'doc_sources': self.doc_sources,
+            'doc_published': self.doc_published,
+            'sources': self.sources,
+            'postings': self.postings,
+            'total_length': self.total_length,
+            'last_id': self.last_id,
+        }
+
+    def load(self, path):
+        """Restore a snapshot written by ``save``; returns False if there is none."""
+        try:
+            with open(path, 'rb') as file:
+                state = pickle.load(file)
+            if state.get('version') != SNAPSHOT_VERSION:
+                raise ValueError(f"unsupported snapshot version {state.get('version')}")
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning("Ignoring unreadable search snapshot %s: %s", path, str(e))
+            return False
+        self._reset()
+        for key in ('doc_ids', 'doc_lengths', 'doc_sources', 'doc_published', 'sources',
+                    'postings', 'total_length', 'last_id'):
+            setattr(self, key, state[key])
+        self._doc_numbers = {doc_id: number for number, doc_id in enumerate(self.doc_ids)}
+        self._source_numbers = {source: number for number, source in enumerate(self.sources)}
+        self._norms = array('d')
+        self._norms_avg = None
+        logger.info("Loaded search snapshot with %d articles", len(self.doc_ids))
+        return True
+
+    async def save(self, path):
+        """Write a snapshot; pickling runs on the loop, the file write in a thread."""
+        # 인덱스는 이벤트 루프에서만 변경되므로 직렬화는 루프 안에서 수행
+        data = pickle.dumps(self._state(), protocol=pickle.HIGHEST_PROTOCOL)
+        self.dirty = False
+        await asyncio.to_thread(_write_atomic, path, data)
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # 워커 여러 개가 같은 경로에 저장하므로 임시 파일은 프로세스마다 따로 씀
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+    os.replace(tmp_path, path)
+
+
+class SnapshotWriter:
+    """Periodically saves the search index while it has unsaved changes."""
+
+    def __init__(self, index, path, interval=300):
+        self.index = index
+        self.path = path
+        self.interval = interval
+        self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            if self.index.dirty:
+                try:
+                    await self.index.save(self.path)
+                except Exception as e:
+                    logger.warning("Failed to save search snapshot: %s", str(e))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        # 종료 시 마지막 상태 저장
+        if self.index.dirty:
+            await self.index.save(self.path)
+
+
+SEARCH_SNAPSHOT_PATH = os.getenv('SEARCH_SNAPSHOT_PATH', 'data/search_index.pkl')
+
+search_index = SearchIndex()
+search_snapshots = SnapshotWriter(
+    search_index, SEARCH_SNAPSHOT_PATH,
+    interval=float(os.getenv('SEARCH_SNAPSHOT_INTERVAL', 300)),
+)
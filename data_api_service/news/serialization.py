@@ -0,0 +1,44 @@
+# data_api_service/news/serialization.py
+import orjson
+from bson import ObjectId
+
+# 응답에 내보내는 기사 필드 (NewsData 와 동일)
+NEWS_FIELDS = (
+    'author', 'title', 'description', 'url', 'source', 'image',
+    'category', 'language', 'country', 'published_at', 'cluster_id',
+)
+# 커서 생성에 필요하므로 항상 조회하는 필드
+REQUIRED_FIELDS = ('_id', 'published_at')
+
+
+def parse_fields(value):
+    """Turn a ``fields=title,url`` parameter into a field tuple.
+
+    Raises ValueError for unknown fields; None means all fields.
+    """
+    if not value:
+        return None
+    fields = tuple(dict.fromkeys(f.strip() for f in value.split(',') if f.strip()))
+    unknown = [f for f in fields if f not in NEWS_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return fields
+
+
+def projection(fields=None):
+    """Mongo projection that only loads the served fields."""
+    selected = dict.fromkeys(fields or NEWS_FIELDS, 1)
+    for field in REQUIRED_FIELDS:
+        selected[field] = 1
+    return selected
+
+
+def _default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError
+
+
+def dumps(obj):
+    """Encode Mongo documents straight to JSON bytes (ObjectId as string)."""
+    return orjson.dumps(obj, default=_default)
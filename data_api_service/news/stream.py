@@ -0,0 +1,170 @@
+# data_api_service/news/stream.py
+import asyncio
+import logging
+import os
+from collections import deque
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from .serialization import dumps, projection
+
+logger = logging.getLogger(__name__)
+
+# 스트림 이벤트에 포함하는 필드 (topic 필터용으로 topic 포함)
+STREAM_FIELDS = projection() | {'topic': 1}
+
+
+def format_event(doc):
+    payload = {field: doc.get(field) for field in STREAM_FIELDS if field in doc}
+    return b'id: %s\nevent: article\ndata: %s\n\n' % (str(doc['_id']).encode('ascii'), dumps(payload))
+
+
+def format_reset(doc_id):
+    # id 를 건너뛴 구간의 마지막 기사로 두어, 이후 재연결은 그 다음부터 이어받음
+    return b'id: %s\nevent: reset\ndata: %s\n\n' % (str(doc_id).encode('ascii'), dumps({'reason': 'replay_limit'}))
+
+
+class StreamClient:
+    """One connected subscriber with its filters and bounded event queue."""
+
+    def __init__(self, sources=None, topics=None, queue_size=100):
+        self.sources = set(sources) if sources else None
+        self.topics = set(topics) if topics else None
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+        self.closed = False
+
+    @property
+    def finished(self):
+        # 넘쳤거나 닫힌 클라이언트는 큐에 남은 이벤트만 보내고 끝냄
+        return (self.overflowed or self.closed) and self.queue.empty()
+
+    def accepts(self, source, topic):
+        if self.sources is not None and source not in self.sources:
+            return False
+        return self.topics is None or topic in self.topics
+
+    def offer(self, doc_id, event):
+        if self.overflowed or self.closed:
+            return False
+        try:
+            self.queue.put_nowait((doc_id, event))
+            return True
+        except asyncio.QueueFull:
+            # 느린 클라이언트는 끊고, 재연결 시 Last-Event-ID 로 이어받게 함
+            self.overflowed = True
+            return False
+
+    def close(self):
+        self.closed = True
+        # 하트비트를 기다리는 응답을 바로 깨움
+        try:
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+
+class StreamHub:
+    """Fans new articles from the article tailer out to SSE clients.
+
+    Each article is encoded once into an SSE frame and offered to every
+    client whose filters match. A client whose queue fills up is
+    disconnected instead of slowing the others down; the last ``buffer_size``
+    frames are kept so a reconnect with ``Last-Event-ID`` can resume, and
+    older gaps of up to ``replay_limit`` articles are filled from Mongo; a
+    larger gap is answered with a ``reset`` event, telling the client to
+    reload the feed, before the buffered frames. Articles inserted more than
+    ``max_age`` seconds ago (e.g. while the tailer catches up after a
+    restart) are not pushed live. ``close()`` ends every stream when the worker drains;
+    EventSource clients then reconnect elsewhere and resume.
+    """
+
+    def __init__(self, max_clients=5000, queue_size=100, buffer_size=1000, max_age=300,
+                 replay_limit=500):
+        self.max_clients = max_clients
+        self.queue_size = queue_size
+        self.max_age = timedelta(seconds=max_age)
+        self.replay_limit = replay_limit
+        self.clients = set()
+        self.closing = False
+        self._buffer = deque(maxlen=buffer_size)  # (ObjectId, source, topic, event)
+        self.counters = {'published': 0, 'delivered': 0, 'overflows': 0, 'rejected': 0, 'resets': 0}
+
+    def register(self, sources=None, topics=None):
+        if self.closing or len(self.clients) >= self.max_clients:
+            self.counters['rejected'] += 1
+            return None
+        client = StreamClient(sources, topics, self.queue_size)
+        self.clients.add(client)
+        return client
+
+    def unregister(self, client):
+        self.clients.discard(client)
+        if client.overflowed:
+            self.counters['overflows'] += 1
+
+    def close(self):
+        self.closing = True
+        for client in self.clients:
+            client.close()
+
+    async def publish(self, docs):
+        cutoff = datetime.utcnow() - self.max_age
+        for doc in docs:
+            if doc.get('is_duplicate') or doc['_id'].generation_time.replace(tzinfo=None) < cutoff:
+                continue
+            source, topic = doc.get('source'), doc.get('topic')
+            event = format_event(doc)
+            self._buffer.append((doc['_id'], source, topic, event))
+            self.counters['published'] += 1
+            for client in self.clients:
+                if client.accepts(source, topic) and client.offer(doc['_id'], event):
+                    self.counters['delivered'] += 1
+
+    async def replay(self, client, last_event_id, collection):
+        """(id, frame) pairs after ``last_event_id`` that match the client, oldest first."""
+        try:
+            last_id = ObjectId(last_event_id)
+        except (InvalidId, TypeError):
+            return []
+        buffered = [item for item in self._buffer if item[0] > last_id]
+        events = []
+        oldest = self._buffer[0][0] if self._buffer else None
+        if oldest is None or oldest > last_id:
+            # 버퍼보다 오래된 구간은 DB 에서 채움
+            query = {'_id': {'$gt': last_id}, 'is_duplicate': {'$ne': True}}
+            if oldest is not None:
+                query['_id']['$lt'] = oldest
+            if client.sources is not None:
+                query['source'] = {'$in': list(client.sources)}
+            if client.topics is not None:
+                query['topic'] = {'$in': list(client.topics)}
+            # 한 건 더 읽어 구간이 replay_limit 을 넘는지 확인
+            cursor = collection.find(query, STREAM_FIELDS).sort('_id', 1).limit(self.replay_limit + 1)
+            docs = await cursor.to_list(length=self.replay_limit + 1)
+            if len(docs) > self.replay_limit:
+                # 일부만 보내면 나머지를 조용히 잃으므로, 구간을 건너뛰고 클라이언트에 다시 불러오도록 알림
+                newest = await collection.find(query, {'_id': 1}).sort('_id', -1).limit(1).to_list(length=1)
+                self.counters['resets'] += 1
+                events = [(newest[0]['_id'], format_reset(newest[0]['_id']))]
+            else:
+                events = [(doc['_id'], format_event(doc)) for doc in docs]
+        events += [(doc_id, event) for doc_id, source, topic, event in buffered if client.accepts(source, topic)]
+        return events
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats.update(clients=len(self.clients), buffered=len(self._buffer))
+        return stats
+
+
+news_stream = StreamHub(
+    max_clients=int(os.getenv('STREAM_MAX_CLIENTS', 5000)),
+    queue_size=int(os.getenv('STREAM_QUEUE_SIZE', 100)),
+    buffer_size=int(os.getenv('STREAM_BUFFER_SIZE', 1000)),
+    max_age=float(os.getenv('STREAM_MAX_AGE', 300)),
+    replay_limit=int(os.getenv('STREAM_REPLAY_LIMIT', 500)),
+)
+STREAM_HEARTBEAT_INTERVAL = float(os.getenv('STREAM_HEARTBEAT_INTERVAL', 15))
@@ -0,0 +1,111 @@
+# data_api_service/news/tailer.py
+import asyncio
+import logging
+import os
+from collections import deque
+from datetime import timedelta
+
+from bson import ObjectId
+
+logger = logging.getLogger(__name__)
+
+
+class ArticleTailer:
+    """Follows newly inserted documents by polling a collection on ``_id``.
+
+    Used for the news collection and, so that every API worker sees every
+    click, for the click event collection. ObjectIds from several writer
+    processes are only roughly ordered, so each
+    poll re-reads an ``overlap`` window behind the newest id and drops ids it
+    already delivered; after a full batch it reads strictly after the newest
+    id so a dense window can never stall it. Subscribers are coroutine
+    functions called with each batch of new documents, oldest first.
+    """
+
+    def __init__(self, poll_interval=1.0, batch_size=1000, overlap=5.0, recent_size=10000):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.overlap = timedelta(seconds=overlap)
+        self.last_id = None
+        self._catching_up = False
+        self._recent = deque(maxlen=recent_size)
+        self._recent_set = set()
+        self._subscribers = []
+        self._task = None
+
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _remember(self, doc_id):
+        if len(self._recent) == self._recent.maxlen:
+            self._recent_set.discard(self._recent[0])
+        self._recent.append(doc_id)
+        self._recent_set.add(doc_id)
+
+    def _query(self):
+        if self.last_id is None:
+            return {}
+        if self._catching_up:
+            return {'_id': {'$gt': self.last_id}}
+        floor = ObjectId.from_datetime(self.last_id.generation_time - self.overlap)
+        return {'_id': {'$gt': floor}}
+
+    async def poll(self, collection):
+        """Fetch one batch of new documents and hand it to the subscribers."""
+        docs = await collection.find(self._query()).sort('_id', 1).limit(self.batch_size).to_list(length=self.batch_size)
+        fresh = [doc for doc in docs if doc['_id'] not in self._recent_set]
+        for doc in fresh:
+            self._remember(doc['_id'])
+            if self.last_id is None or doc['_id'] > self.last_id:
+                self.last_id = doc['_id']
+        if fresh:
+            for callback in list(self._subscribers):
+                try:
+                    await callback(fresh)
+                except Exception as e:
+                    logger.error("Tail subscriber failed: %s", str(e))
+        # 배치가 가득 찼으면 아직 따라잡는 중
+        self._catching_up = len(docs) == self.batch_size
+        return self._catching_up
+
+    async def _run(self, get_collection):
+        while True:
+            try:
+                catching_up = await self.poll(get_collection())
+            except Exception as e:
+                logger.warning("Tail poll failed: %s", str(e))
+                catching_up = False
+            if not catching_up:
+                await asyncio.sleep(self.poll_interval)
+
+    def start(self, get_collection, start_after=None):
+        """Start following; with ``start_after`` only newer articles are delivered."""
+        if start_after is not None:
+            self.last_id = start_after
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(get_collection))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+article_tailer = ArticleTailer(
+    poll_interval=float(os.getenv('ARTICLE_TAIL_INTERVAL', 1.0)),
+    batch_size=int(os.getenv('ARTICLE_TAIL_BATCH_SIZE', 1000)),
+)
+click_tailer = ArticleTailer(
+    poll_interval=float(os.getenv('CLICK_TAIL_INTERVAL', 1.0)),
+    batch_size=int(os.getenv('CLICK_TAIL_BATCH_SIZE', 1000)),
+    # 겹쳐 읽는 구간의 클릭 수보다 커야 중복 집계가 없음
+    recent_size=int(os.getenv('CLICK_TAIL_RECENT_SIZE', 100_000)),
+)
@@ -0,0 +1,265 @@
+# data_api_service/news/trending.py
+import asyncio
+import hashlib
+import heapq
+import logging
+import math
+import os
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from .serialization import projection
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_SCOPE = 'all'
+# 전방 감쇠 가중치가 이 지수를 넘으면 기준 시각을 옮겨 float 범위를 유지
+MAX_EXPONENT = 60
+
+
+class CountMinSketch:
+    """Fixed-size frequency estimates for arbitrary keys (never underestimates)."""
+
+    def __init__(self, width=16384, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array('d', bytes(8 * width)) for _ in range(depth)]
+
+    def _cells(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=4 * self.depth).digest()
+        return [int.from_bytes(digest[4 * i:4 * i + 4], 'little') % self.width for i in range(self.depth)]
+
+    def add(self, key, weight):
+        """Add ``weight`` to ``key`` and return its new estimate."""
+        estimate = math.inf
+        for row, cell in zip(self.rows, self._cells(key)):
+            row[cell] += weight
+            estimate = min(estimate, row[cell])
+        return estimate
+
+    def scale(self, factor):
+        for i, row in enumerate(self.rows):
+            self.rows[i] = array('d', (value * factor for value in row))
+
+
+class TopK:
+    """The ``capacity`` keys with the highest estimates, kept in a min-heap.
+
+    Scores only grow (forward decay), so heap entries older than the current
+    score of their key are stale and skipped when they reach the top.
+    """
+
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self.scores = {}
+        self._heap = []
+
+    def _minimum(self):
+        while self._heap:
+            score, key = self._heap[0]
+            if self.scores.get(key) == score:
+                return score, key
+            heapq.heappop(self._heap)
+        return None
+
+    def offer(self, key, estimate):
+        if key in self.scores or len(self.scores) < self.capacity:
+            self.scores[key] = estimate
+            heapq.heappush(self._heap, (estimate, key))
+        else:
+            minimum = self._minimum()
+            if minimum is None or estimate <= minimum[0]:
+                return
+            heapq.heappop(self._heap)
+            del self.scores[minimum[1]]
+            self.scores[key] = estimate
+            heapq.heappush(self._heap, (estimate, key))
+        # 오래된 항목이 쌓이면 힙을 다시 만듦
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(score, key) for key, score in self.scores.items()]
+            heapq.heapify(self._heap)
+
+    def scale(self, factor):
+        self.scores = {key: score * factor for key, score in self.scores.items()}
+        self._heap = [(score, key) for key, score in self.scores.items()]
+        heapq.heapify(self._heap)
+
+    def top(self, limit):
+        return heapq.nlargest(limit, self.scores.items(), key=lambda item: item[1])
+
+
+class TrendingTracker:
+    """Time-decayed click popularity per scope, updated as clicks are written.
+
+    A click at time ``t`` weighs ``2 ** ((t - landmark) / half_life)`` (forward
+    decay), so older clicks never need to be touched; dividing by the weight
+    of "now" turns the stored totals into decayed click counts. One shared
+    count-min sketch holds the totals for every (scope, article) key and each
+    scope -- all articles, each source, each topic -- keeps a bounded top-K.
+    Clicks arrive from the click tailer, so every worker counts every click
+    and replays the last few half-lives on startup. A background task turns
+    the top-K lists into article lists that requests are served from.
+    """
+
+    def __init__(self, half_life=3600, top_k=100, sketch_width=16384, sketch_depth=4,
+                 refresh_interval=10, max_scopes=500, article_cache_size=50000):
+        self.half_life = half_life
+        self.top_k = top_k
+        self.refresh_interval = refresh_interval
+        self.max_scopes = max_scopes
+        self.article_cache_size = article_cache_size
+        self.sketch = CountMinSketch(sketch_width, sketch_depth)
+        self.scopes = {}
+        self.landmark = time.time()
+        self._articles = OrderedDict()  # news_id -> (source, topic)
+        self._lists = {}  # scope -> [article, ...] (최근 갱신 결과)
+        self._get_collection = None
+        self._task = None
+        self.counters = {'clicks': 0, 'unknown_articles': 0, 'rescales': 0}
+
+    def _weight(self, timestamp):
+        exponent = (timestamp - self.landmark) / self.half_life
+        if exponent > MAX_EXPONENT:
+            self._rescale(timestamp)
+            exponent = 0.0
+        return 2.0 ** exponent
+
+    def _rescale(self, timestamp):
+        factor = 2.0 ** (-(timestamp - self.landmark) / self.half_life)
+        self.sketch.scale(factor)
+        for top in self.scopes.values():
+            top.scale(factor)
+        self.landmark = timestamp
+        self.counters['rescales'] += 1
+
+    def _scope(self, name):
+        top = self.scopes.get(name)
+        if top is None:
+            if len(self.scopes) >= self.max_scopes:
+                return None
+            top = self.scopes[name] = TopK(self.top_k)
+        return top
+
+    def record(self, news_id, source, topic, timestamp):
+        weight = self._weight(timestamp)
+        for name in (GLOBAL_SCOPE, source and f'source:{source}', topic and f'topic:{topic}'):
+            if not name:
+                continue
+            top = self._scope(name)
+            if top is not None:
+                top.offer(news_id, self.sketch.add(f'{name}|{news_id}', weight))
+        self.counters['clicks'] += 1
+
+    async def _resolve(self, news_ids):
+        """(source, topic) of each article, from the LRU or one ``$in`` query."""
+        missing = [news_id for news_id in news_ids if news_id not in self._articles]
+        if missing:
+            object_ids = []
+            for news_id in missing:
+                try:
+                    object_ids.append(ObjectId(news_id))
+                except (InvalidId, TypeError):
+                    continue
+            docs = await self._get_collection().find(
+                {'_id': {'$in': object_ids}}, {'source': 1, 'topic': 1}
+            ).to_list(length=None)
+            for doc in docs:
+                self._articles[str(doc['_id'])] = (doc.get('source'), doc.get('topic'))
+            while len(self._articles) > self.article_cache_size:
+                self._articles.popitem(last=False)
+        found = {}
+        for news_id in news_ids:
+            info = self._articles.get(news_id)
+            if info is not None:
+                self._articles.move_to_end(news_id)
+                found[news_id] = info
+        return found
+
+    async def record_clicks(self, events):
+        """Feed stored click events, timed by the server-side ``_id``."""
+        articles = await self._resolve({event['news_id'] for event in events})
+        current = time.time()
+        for event in events:
+            info = articles.get(event['news_id'])
+            if info is None:
+                self.counters['unknown_articles'] += 1
+                continue
+            # 클라이언트가 보낸 timestamp 대신 저장 시 생성된 ObjectId 시각을 사용
+            timestamp = min(event['_id'].generation_time.timestamp(), current) if '_id' in event else current
+            self.record(event['news_id'], info[0], info[1], timestamp)
+
+    def replay_from(self):
+        """ObjectId to start tailing clicks from: a few half-lives back."""
+        return ObjectId.from_datetime(datetime.utcnow() - timedelta(seconds=5 * self.half_life))
+
+    async def refresh(self):
+        """Precompute the served list of every scope."""
+        decay = 2.0 ** (-(time.time() - self.landmark) / self.half_life)
+        ranked = {name: top.top(self.top_k) for name, top in self.scopes.items()}
+        ids = {news_id for entries in ranked.values() for news_id, _ in entries}
+        object_ids = [ObjectId(news_id) for news_id in ids]
+        docs = await self._get_collection().find(
+            {'_id': {'$in': object_ids}}, projection()
+        ).to_list(length=None)
+        by_id = {str(doc['_id']): doc for doc in docs}
+        lists = {}
+        for name, entries in ranked.items():
+            lists[name] = [
+                {**by_id[news_id], 'score': round(score * decay, 3)}
+                for news_id, score in entries if news_id in by_id
+            ]
+        self._lists = lists
+
+    def get(self, source=None, topic=None, limit=20):
+        """Top ``limit`` articles of one scope: a source, a topic or everything."""
+        if source and topic:
+            # source 와 topic 을 함께 거른 목록은 따로 계산하지 않음
+            raise ValueError("Filter trending news by source or by topic, not both")
+        if source:
+            name = f'source:{source}'
+        elif topic:
+            name = f'topic:{topic}'
+        else:
+            name = GLOBAL_SCOPE
+        return self._lists.get(name, [])[:limit]
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning("Failed to refresh trending lists: %s", str(e))
+            await asyncio.sleep(self.refresh_interval)
+
+    def start(self, get_collection):
+        self._get_collection = get_collection
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats.update(scopes=len(self.scopes), cached_articles=len(self._articles))
+        return stats
+
+
+trending = TrendingTracker(
+    half_life=float(os.getenv('TRENDING_HALF_LIFE', 3600)),
+    top_k=int(os.getenv('TRENDING_TOP_K', 100)),
+    sketch_width=int(os.getenv('TRENDING_SKETCH_WIDTH', 16384)),
+    sketch_depth=int(os.getenv('TRENDING_SKETCH_DEPTH', 4)),
+    refresh_interval=float(os.getenv('TRENDING_REFRESH_INTERVAL', 10)),
+)
@@ -0,0 +1,95 @@
+# data_api_service/serve.py
+"""Launch the API server.
+
+SERVER_MODE=production (default) runs WEB_CONCURRENCY uvicorn workers
+(defaults to the CPUs available to the container). Indexes are created
+once here before the workers start, and a stop signal drains the workers
+within GRACEFUL_SHUTDOWN_TIMEOUT seconds. SERVER_MODE=development runs a
+single auto-reloading process.
+
+Run from data_api_service:  python serve.py
+"""
+import asyncio
+import glob
+import logging
+import os
+import tempfile
+
+import uvicorn
+
+from common.logs import configure_logging
+
+HOST = os.getenv('HOST', '0.0.0.0')
+PORT = int(os.getenv('PORT', 8000))
+SERVER_MODE = os.getenv('SERVER_MODE', 'production')
+GRACEFUL_SHUTDOWN_TIMEOUT = int(os.getenv('GRACEFUL_SHUTDOWN_TIMEOUT', 20))
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'info').lower()
+# 요청 로그는 RequestLogMiddleware 가 표본으로 남기므로 uvicorn 접근 로그는 끔
+ACCESS_LOG = os.getenv('ACCESS_LOG', '0') == '1'
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count():
+    configured = int(os.getenv('WEB_CONCURRENCY', 0))
+    if configured > 0:
+        return configured
+    # 컨테이너에 할당된 CPU 수 (cpuset 기준), 없으면 전체 CPU 수
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+async def prepare():
+    """One-time startup work shared by all workers."""
+    from database import db
+    from database.indexes import apply_indexes
+
+    db.connect()
+    try:
+        await apply_indexes(db)
+    finally:
+        db.close()
+
+
+def prepare_metrics_dir():
+    """Give the workers an empty directory to share /metrics snapshots through."""
+    directory = os.getenv('METRICS_DIR')
+    if not directory:
+        os.environ['METRICS_DIR'] = tempfile.mkdtemp(prefix='newsflow-metrics-')
+        return
+    os.makedirs(directory, exist_ok=True)
+    # 이전 실행의 누적 값은 버림
+    for path in glob.glob(os.path.join(directory, '*.json')):
+        os.remove(path)
+
+
+def main():
+    configure_logging()
+    if SERVER_MODE == 'development':
+        uvicorn.run('main:app', host=HOST, port=PORT, reload=True, log_level=LOG_LEVEL,
+                    log_config=None, access_log=ACCESS_LOG)
+        return
+
+    asyncio.run(prepare())
+    # 워커는 시작 시 인덱스 생성을 건너뛰어 콜드 스타트를 줄임
+    os.environ['APPLY_INDEXES_ON_STARTUP'] = '0'
+    prepare_metrics_dir()
+    workers = worker_count()
+    logger.info("Starting %d workers on %s:%d", workers, HOST, PORT)
+    uvicorn.run(
+        'main:app',
+        host=HOST,
+        port=PORT,
+        workers=workers,
+        timeout_graceful_shutdown=GRACEFUL_SHUTDOWN_TIMEOUT,
+        proxy_headers=True,
+        log_level=LOG_LEVEL,
+        # 로깅은 common.logs 설정을 그대로 사용
+        log_config=None,
+        access_log=ACCESS_LOG,
+    )
+
+
+if __name__ == '__main__':
+    main()
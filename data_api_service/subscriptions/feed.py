@@ -0,0 +1,61 @@
+# data_api_service/subscriptions/feed.py
+import os
+import time
+from collections import OrderedDict
+
+from bson import ObjectId
+from bson.errors import InvalidId
+
+from database import db
+
+
+class SubscriptionSourceCache:
+    """Per-user set of subscribed source names, kept in a bounded LRU.
+
+    The set is resolved once (subscriptions -> source list) and reused for
+    every feed page until the user toggles a subscription, which invalidates
+    it; ``ttl`` bounds staleness for changes made through another worker.
+    """
+
+    def __init__(self, max_users=10000, ttl=60):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._entries = OrderedDict()  # user_id -> (sources, loaded_at)
+
+    async def _load(self, user_id):
+        subscriptions = await db.get_users_subscriptions_collection().find(
+            {"user_id": ObjectId(user_id), "is_subscribe": True}, {"news_id": 1, "_id": 0}
+        ).to_list(length=None)
+        source_ids = []
+        for sub in subscriptions:
+            try:
+                source_ids.append(ObjectId(sub["news_id"]))
+            except (InvalidId, TypeError, KeyError):
+                continue
+        if not source_ids:
+            return ()
+        sources = await db.get_subscriptions_list_collection().find(
+            {"_id": {"$in": source_ids}}, {"source": 1, "_id": 0}
+        ).to_list(length=None)
+        return tuple(sorted({source["source"] for source in sources if source.get("source")}))
+
+    async def get(self, user_id):
+        entry = self._entries.get(user_id)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            self._entries.move_to_end(user_id)
+            return entry[0]
+        sources = await self._load(user_id)
+        self._entries[user_id] = (sources, time.monotonic())
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+        return sources
+
+    def invalidate(self, user_id):
+        self._entries.pop(user_id, None)
+
+
+subscription_sources = SubscriptionSourceCache(
+    max_users=int(os.getenv('SUBSCRIPTION_CACHE_MAX_USERS', 10000)),
+    ttl=float(os.getenv('SUBSCRIPTION_CACHE_TTL', 60)),
+)
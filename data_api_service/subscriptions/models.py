@@ -1,16 +1,25 @@
 # data_api_service/subscriptions/models.py
+import asyncio
 import logging
 from datetime import datetime
-from pymongo import DESCENDING
 from bson import ObjectId
 from database import db
 from common import to_str_id 
+from common.metrics import measure
+from news.counters import news_counts
+from news.pagination import FEED_SORT, after_filter, encode_cursor
+from news.serialization import projection
+from .feed import subscription_sources
 from .schemas import SubscriptionCreate
 
+logger = logging.getLogger(__name__)
+
 class SubscriptionModel:
 
-    def __init__(self):
-        self.news_subscriptions = db.get_users_subscriptions_collection()
+    # 컬렉션은 lifespan 에서 연결된 뒤에 조회되도록 프로퍼티로 가져옴
+    @property
+    def news_subscriptions(self):
+        return db.get_users_subscriptions_collection()
 
     def object_id_to_str(self, item):
         if isinstance(item, list):
@@ -24,43 +33,33 @@ class SubscriptionModel:
                 item['user_id'] = str(item['user_id'])
         return item
 
-    def get_subscribed_news(self, user_id, skip: int, limit: int):
-        try:
-            logging.info(f'Start fetching subscribed news for user: {user_id}')
-            # Fetch subscribed news_ids for the user
-            subscribed_ids_cursor = list(self.news_subscriptions.find({"user_id": ObjectId(user_id), "is_subscribe": True}))
-            subscribed_ids = self.object_id_to_str(subscribed_ids_cursor)
-            logging.info(f'Subscribed IDs for user {user_id}: {subscribed_ids}')
-
-            if not subscribed_ids:
-                logging.info(f'No subscriptions found for user {user_id}')
-                return [], 0
-
-            news_ids = [sub['news_id'] for sub in subscribed_ids]
-            logging.info(f'News IDs for user {user_id}: {news_ids}')
-
-            # Fetch sources for the subscribed news_ids
-            news_sources_cursor = self.news_subscriptions.find({"_id": {"$in": [ObjectId(news_id) for news_id in news_ids]}})
-            news_sources = list(news_sources_cursor)
-            news_sources = self.object_id_to_str(news_sources)
-            sources = [news_source['source'] for news_source in news_sources]
-            logging.info(f'Sources for user {user_id}: {sources}')
+    async def get_subscribed_news(self, user_id, limit: int, after: str = None, fields: tuple = None):
+        """One page of articles from the user's subscribed sources.
 
-            # Fetch news articles matching the subscribed sources
-            news_cursor = self.news_subscriptions.find({"source": {"$in": sources}}).sort("published_at", DESCENDING).skip(skip).limit(limit)
-            news_list = list(news_cursor)
-            news_list = self.object_id_to_str(news_list)
-            logging.info(f'Fetched news articles for user {user_id}: {news_list}')
+        The source set comes from the per-user cache, so a page is a single
+        ``$in`` range read on the (source, published_at, _id) index; the total
+        is the sum of the cached per-source counts.
+        """
+        sources = await measure("sources", subscription_sources.get(user_id))
+        if not sources:
+            return [], 0, None
 
-            total_items = self.news_subscriptions.count_documents({"source": {"$in": sources}})
-            logging.info(f'Total news articles count for user {user_id}: {total_items}')
-
-            return news_list, total_items
-        except Exception as e:
-            logging.error(f'Error fetching subscribed news for user {user_id}: {str(e)}')
-            return [], 0
+        base_query = {"source": {"$in": list(sources)}, "is_duplicate": {"$ne": True}}
+        query = {"$and": [base_query, after_filter(after)]} if after else base_query
+        news_cursor = db.get_news_collection().find(query, projection(fields)).sort(FEED_SORT).limit(limit)
+        news_list, counts = await asyncio.gather(
+            measure("db", news_cursor.to_list(length=limit)),
+            measure("count", asyncio.gather(*(
+                news_counts.get(f"source:{source}", db.get_news_collection,
+                                {"source": source, "is_duplicate": {"$ne": True}})
+                for source in sources
+            ))),
+        )
+        next_cursor = encode_cursor(news_list[-1]) if len(news_list) == limit else None
+        logger.debug("Fetched %d subscribed articles from %d sources", len(news_list), len(sources))
+        return news_list, sum(counts), next_cursor
 
-    def find_subscriptions(self, user_id, sort):
+    async def find_subscriptions(self, user_id, sort):
         # 정렬 순서를 결정합니다.
         sort_order = -1 if sort.startswith('-') else 1
         sort_field = sort.lstrip('-+')  # '-' 또는 '+' 기호를 제거하여 순수 필드 이름을 추출합니다.
@@ -69,9 +68,7 @@ class SubscriptionModel:
             "user_id": ObjectId(user_id),
             "is_subscribe": True  # 구독 상태가 활성화된 뉴스만 조회
         }
-        subscriptions = list(
-            self.news_subscriptions.find(query).sort(sort_field, sort_order)
-        )
+        subscriptions = await self.news_subscriptions.find(query).sort(sort_field, sort_order).to_list(length=None)
         subscriptions = self.object_id_to_str(subscriptions)
         return [
             {
@@ -84,19 +81,19 @@ class SubscriptionModel:
             } for sub in subscriptions
         ]
 
-    def toggle_subscription(self, subscription_id, is_subscribe):
-        update_result = self.news_subscriptions.update_one(
+    async def toggle_subscription(self, subscription_id, is_subscribe):
+        update_result = await self.news_subscriptions.update_one(
             {"_id": ObjectId(subscription_id)},
             {"$set": {"is_subscribe": is_subscribe, "updated_at": datetime.utcnow()}}
         )
         return update_result.modified_count > 0
 
-    def find_one(self, query):
+    async def find_one(self, query):
         if '_id' in query:
             query['_id'] = ObjectId(query['_id'])
         if 'user_id' in query:
             query['user_id'] = ObjectId(query['user_id'])        
-        sub = self.news_subscriptions.find_one(query)
+        sub = await self.news_subscriptions.find_one(query)
         if sub:
             sub = self.object_id_to_str(sub)
             return {
@@ -109,9 +106,9 @@ class SubscriptionModel:
             }
         return None
 
-    def create_subscription(self, subscription_data: SubscriptionCreate):
+    async def create_subscription(self, subscription_data: SubscriptionCreate):
         new_subscription = subscription_data.dict()
         new_subscription["created_at"] = new_subscription["updated_at"] = datetime.utcnow()
         new_subscription["user_id"] = ObjectId(new_subscription["user_id"])
-        new_subscription_id = self.news_subscriptions.insert_one(new_subscription).inserted_id
+        new_subscription_id = (await self.news_subscriptions.insert_one(new_subscription)).inserted_id
         return to_str_id(new_subscription_id)
@@ -1,44 +1,64 @@
 # data_api_service/subscriptions/routes.py
 import logging
-from typing import List
-from fastapi import APIRouter, Query, HTTPException, Depends, Request
+from typing import List, Optional
+from fastapi import APIRouter, Query, HTTPException, Depends, Response
 from fastapi.security import OAuth2PasswordBearer
 from .models import SubscriptionModel
 from .schemas import Subscription, SubscriptionCreate
+from .feed import subscription_sources
+from common.metrics import timed
 from dependencies import decode_access_token
+from news.pagination import InvalidCursor
+from news.schemas import NewsResponse
+from news.serialization import dumps, parse_fields
 from .sources import router as sources_router
 
-logging.basicConfig(level=logging.DEBUG)
-logger = logging.getLogger("uvicorn")
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/token")
 router.include_router(sources_router)
 
+@router.get("/feed", response_model=NewsResponse)
+async def get_subscribed_feed(
+    page_size: int = Query(10, ge=1, le=100),
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    token: str = Depends(oauth2_scheme)
+):
+    # 구독한 소스의 기사만 최신순으로, 다음 페이지는 nextCursor 를 after 로 전달
+    with timed("auth"):
+        user_id = decode_access_token(token)
+    try:
+        selected = parse_fields(fields)
+        news_list, total_items, next_cursor = await SubscriptionModel().get_subscribed_news(
+            user_id, page_size, after, selected)
+    except (InvalidCursor, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    with timed("encode"):
+        content = dumps({"newsList": news_list, "totalItems": total_items, "nextCursor": next_cursor})
+    return Response(content=content, media_type="application/json")
+
 @router.patch("/{news_id}", response_model=Subscription)
 async def toggle_subscription(
-    request: Request,
     news_id: str,
     action: str = Query(..., regex="^(subscribed|unsubscribed)$"),
     token: str = Depends(oauth2_scheme)
 ):
-    logger.info(f"Received request to toggle subscription. News ID: {news_id}, Action: {action}")
-    logger.debug(f"Request headers: {request.headers}")
-    
+    logger.debug("Toggle subscription %s: %s", news_id, action)
+
     try:
-        logger.info(f'{token}')
         user_id = decode_access_token(token)
-        logger.info(f"Token decoded successfully. User ID: {user_id}")
     except Exception as e:
-        logger.error(f"Token decoding failed: {str(e)}")
+        logger.info("Token decoding failed: %s", e)
         raise HTTPException(status_code=401, detail=f"Invalid or expired token: {str(e)}")
 
     subscription_model = SubscriptionModel()
 
     try:
         # 사용자 ID와 뉴스 ID로 기존 구독 정보 확인
-        existing_subscription = subscription_model.find_one({"news_id": news_id, "user_id": user_id})
-        logger.info(f"Existing subscription: {existing_subscription}")
+        existing_subscription = await subscription_model.find_one({"news_id": news_id, "user_id": user_id})
+        logger.debug("Existing subscription found: %s", bool(existing_subscription))
 
         # 새로운 구독 상태 설정
         new_is_subscribe = action == "subscribed"
@@ -47,15 +67,17 @@ async def toggle_subscription(
             # 기존에 구독 중인 경우
             if existing_subscription["is_subscribe"] == new_is_subscribe:
                 detail_msg = f"Already {'subscribed' if new_is_subscribe else 'unsubscribed'} to news ID {news_id}."
-                logger.info(detail_msg)
+                logger.debug(detail_msg)
                 raise HTTPException(status_code=400, detail=detail_msg)
             else:
                 # 구독 상태 변경
-                successful_update = subscription_model.toggle_subscription(existing_subscription["_id"], new_is_subscribe)
+                successful_update = await subscription_model.toggle_subscription(existing_subscription["_id"], new_is_subscribe)
                 if successful_update:
-                    updated_subscription = subscription_model.find_one({"_id": existing_subscription["_id"]})
+                    # 구독 소스가 바뀌었으므로 캐시된 피드 소스 목록을 버림
+                    subscription_sources.invalidate(user_id)
+                    updated_subscription = await subscription_model.find_one({"_id": existing_subscription["_id"]})
                     if updated_subscription:
-                        logger.info(f"Subscription updated successfully: {updated_subscription}")
+                        logger.debug("Subscription %s updated", existing_subscription["_id"])
                         return Subscription(**updated_subscription)
                     else:
                         logger.error("Failed to find updated subscription")
@@ -68,22 +90,23 @@ async def toggle_subscription(
             if action == "subscribed":
                 new_subscription = SubscriptionCreate(user_id=user_id, news_id=news_id, is_subscribe=True)
                 try:
-                    created_subscription_id = subscription_model.create_subscription(new_subscription)
-                    logger.info(f"Created subscription ID: {created_subscription_id}")
-                    created_subscription = subscription_model.find_one({"_id": created_subscription_id})
+                    created_subscription_id = await subscription_model.create_subscription(new_subscription)
+                    subscription_sources.invalidate(user_id)
+
+                    created_subscription = await subscription_model.find_one({"_id": created_subscription_id})
                     if created_subscription:
-                        logger.info(f"New subscription created: {created_subscription}")
+                        logger.debug("Subscription %s created", created_subscription_id)
                         return Subscription(**created_subscription)
                     else:
                         logger.error("Failed to find created subscription")
                         raise HTTPException(status_code=500, detail="Failed to find created subscription")
                 except Exception as e:
-                    logger.error(f"Error creating subscription: {str(e)}")
+                    logger.error("Error creating subscription: %s", e)
                     raise HTTPException(status_code=500, detail=str(e))
             else:
                 detail_msg = f"This is News Id that has not already been subscribed. {news_id}."
-                logger.info(detail_msg)
+                logger.debug(detail_msg)
                 raise HTTPException(status_code=404, detail=detail_msg)
     except Exception as e:
-        logger.error(f"Unexpected error in toggle_subscription: {str(e)}")
+        logger.error("Unexpected error in toggle_subscription: %s", e)
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
\ No newline at end of file
@@ -1,9 +1,11 @@
 # data_api_service/subscriptions/sources.py
+import logging
 from fastapi import APIRouter, Depends, HTTPException
 
+from database import db
 from users.models import UserModel
 
-
+logger = logging.getLogger(__name__)
 
 user_model = UserModel()
 
@@ -11,11 +13,9 @@ user_model = UserModel()
 router = APIRouter()
 
 @router.get("/news_sources")
-async def get_news_sources(db=Depends(), current_user=Depends(user_model.get_current_user)):
-    logger.info(f"Attempting to fetch news sources for user: {current_user}")
+async def get_news_sources(current_user=Depends(user_model.get_current_user)):
     try:
-        news_sources = await db.news_source_list.find().to_list(length=None)
-        logger.info(f"Found {len(news_sources)} news sources")
+        news_sources = await db.get_subscriptions_list_collection().find().to_list(length=None)
         return [
             {
                 "_id": str(source["_id"]),
@@ -25,5 +25,5 @@ async def get_news_sources(db=Depends(), current_user=Depends(user_model.get_cur
             for source in news_sources
         ]
     except Exception as e:
-        logger.error(f"Error fetching news sources: {str(e)}")
+        logger.error("Error fetching news sources: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,153 @@
+# data_api_service/users/clicks.py
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+class ClickBufferFull(Exception):
+    pass
+
+
+class ClickBuffer:
+    """Bounded in-process buffer of click events drained by a bulk writer.
+
+    Requests only append to the buffer; a background task writes batches of
+    up to ``batch_size`` events, or whatever arrived within
+    ``flush_interval`` seconds, with one ``insert_many``. When the buffer
+    holds ``max_events`` events, producers wait up to ``enqueue_timeout``
+    seconds for room and are then rejected, so memory stays bounded.
+    Failed events are put back in front of the buffer and retried with the
+    ``_id`` that ``insert_many`` gave them, so an event the server already
+    stored comes back as a duplicate key error and is counted as written.
+    """
+
+    def __init__(self, max_events=100_000, batch_size=500, flush_interval=1.0, enqueue_timeout=0.1,
+                 retry_interval=2.0):
+        self.max_events = max_events
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enqueue_timeout = enqueue_timeout
+        self.retry_interval = retry_interval
+        self._events = deque()
+        # 이벤트 객체는 실행 중인 루프에서 만들어야 하므로 start() 에서 생성
+        self._ready = None
+        self._space = None
+        self._write_batch = None
+        self._stopping = False
+        self._task = None
+        self.counters = {'accepted': 0, 'rejected': 0, 'written': 0, 'batches': 0, 'failed_batches': 0, 'dropped': 0}
+
+    def __len__(self):
+        return len(self._events)
+
+    async def put_many(self, events):
+        """Append ``events`` as a whole or raise ClickBufferFull after waiting."""
+        deadline = time.monotonic() + self.enqueue_timeout
+        while self.max_events - len(self._events) < len(events):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.counters['rejected'] += len(events)
+                raise ClickBufferFull(f"click buffer is full ({len(self._events)} events)")
+            self._space.clear()
+            try:
+                await asyncio.wait_for(self._space.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        self._events.extend(events)
+        self.counters['accepted'] += len(events)
+        if len(self._events) >= self.batch_size:
+            self._ready.set()
+        return len(events)
+
+    def _take_batch(self):
+        count = min(self.batch_size, len(self._events))
+        batch = [self._events.popleft() for _ in range(count)]
+        self._space.set()
+        return batch
+
+    def _requeue(self, batch):
+        # 실패한 배치를 앞쪽에 되돌리되, 그 사이 새 이벤트로 공간이 부족하면 오래된 것부터 버림
+        room = self.max_events - len(self._events)
+        if room < len(batch):
+            self.counters['dropped'] += len(batch) - room
+            batch = batch[len(batch) - room:] if room > 0 else []
+        self._events.extendleft(reversed(batch))
+
+    async def _write(self, write, batch):
+        try:
+            await write(batch)
+        except BulkWriteError as e:
+            # 이전 시도에서 이미 저장된 이벤트(중복 키)는 성공으로 보고 나머지만 다시 시도
+            failed = sorted({error['index'] for error in e.details.get('writeErrors', [])
+                             if error.get('code') != DUPLICATE_KEY})
+            self.counters['written'] += len(batch) - len(failed)
+            if not failed:
+                self.counters['batches'] += 1
+                return True
+            self.counters['failed_batches'] += 1
+            logger.error("Failed to write %d of %d click events: %s", len(failed), len(batch), str(e))
+            self._requeue([batch[i] for i in failed])
+            return False
+        except Exception as e:
+            self.counters['failed_batches'] += 1
+            logger.error("Failed to write %d click events: %s", len(batch), str(e))
+            self._requeue(batch)
+            return False
+        self.counters['written'] += len(batch)
+        self.counters['batches'] += 1
+        return True
+
+    async def _run(self, write):
+        while not self._stopping:
+            if len(self._events) < self.batch_size:
+                self._ready.clear()
+                try:
+                    await asyncio.wait_for(self._ready.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            if not self._events:
+                continue
+            if not await self._write(write, self._take_batch()):
+                await asyncio.sleep(self.retry_interval)
+
+    def start(self, write):
+        """Start draining with ``write``, a coroutine function taking a list of events."""
+        self._write_batch = write
+        if self._task is None:
+            self._ready = asyncio.Event()
+            self._space = asyncio.Event()
+            self._task = asyncio.create_task(self._run(write))
+
+    async def stop(self):
+        if self._task is not None:
+            # 쓰기 도중 취소하면 배치를 잃으므로 현재 쓰기가 끝날 때까지 기다림
+            self._stopping = True
+            self._ready.set()
+            await self._task
+            self._task = None
+            # 종료 전에 남은 이벤트를 기록 (실패하면 한 번만 시도하고 포기)
+            while self._events:
+                if not await self._write(self._write_batch, self._take_batch()):
+                    logger.error("Discarding %d unwritten click events on shutdown", len(self._events))
+                    break
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats['buffered'] = len(self._events)
+        return stats
+
+
+click_buffer = ClickBuffer(
+    max_events=int(os.getenv('CLICK_BUFFER_MAX_EVENTS', 100_000)),
+    batch_size=int(os.getenv('CLICK_BATCH_SIZE', 500)),
+    flush_interval=float(os.getenv('CLICK_FLUSH_INTERVAL', 1.0)),
+    enqueue_timeout=float(os.getenv('CLICK_ENQUEUE_TIMEOUT', 0.1)),
+)
@@ -1,53 +1,74 @@
 # data_api_service/users/model.py
 import secrets
 import string
-import bcrypt
 from passlib.context import CryptContext
 from datetime import datetime
 import jwt
 from fastapi import Depends, HTTPException, status
-from .schemas import UserCreate, ClickEvent
+from .schemas import UserCreate
 from fastapi.security import OAuth2PasswordBearer
 from database import db
+from dependencies import verify_token
+from auth import AuthBusy, password_hasher
 from bson import ObjectId
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/token")
 
+
+async def _hash_password(password: str):
+    try:
+        return await password_hasher.hash(password)
+    except AuthBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
+async def _check_password(password: str, hashed):
+    try:
+        return await password_hasher.verify(password, hashed)
+    except AuthBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
 class UserModel:
-    def __init__(self):
-        self.collection = db.get_user_collection()
+    # 컬렉션은 lifespan 에서 연결된 뒤에 조회되도록 프로퍼티로 가져옴
+    @property
+    def collection(self):
+        return db.get_user_collection()
+
+    async def find_by_username(self, username: str):
+        return await self.collection.find_one({"username": username})
 
-    def find_by_username(self, username: str):
-        return self.collection.find_one({"username": username})
+    async def find_by_id(self, user_id: str):
+        return await self.collection.find_one({"_id": ObjectId(user_id)})
 
-    def create_user(self, user_data: UserCreate):
-        if self.collection.find_one({"email": user_data.email}):
+    async def create_user(self, user_data: UserCreate):
+        if await self.collection.find_one({"email": user_data.email}):
             raise HTTPException(status_code=400, detail="Email already registered")
 
-        hashed_password = bcrypt.hashpw(user_data.password.encode('utf-8'), bcrypt.gensalt())
+        hashed_password = await _hash_password(user_data.password)
         user_dict = user_data.dict(exclude={"password"})
         user_dict['password'] = hashed_password
         user_dict['created_at'] = user_dict['updated_at'] = datetime.utcnow()
-        result = self.collection.insert_one(user_dict)
+        result = await self.collection.insert_one(user_dict)
         user_dict['user_id'] = str(result.inserted_id)
         return user_dict
 
-    def authenticate_user(self, email: str, password: str):
-        user = self.collection.find_one({"email": email})
+    async def authenticate_user(self, email: str, password: str):
+        user = await self.collection.find_one({"email": email})
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
-        if not bcrypt.checkpw(password.encode('utf-8'), user['password']):
+        if not await _check_password(password, user['password']):
             raise HTTPException(status_code=401, detail="Incorrect password")
         return user
 
-    def reset_password(self, email: str):
-        user = self.collection.find_one({"email": email})
+    async def reset_password(self, email: str):
+        user = await self.collection.find_one({"email": email})
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         new_password = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(10))
-        hashed_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
-        self.collection.update_one({"_id": user['_id']}, {"$set": {"password": hashed_password}})
+        hashed_password = await _hash_password(new_password)
+        await self.collection.update_one({"_id": user['_id']}, {"$set": {"password": hashed_password}})
         return new_password
 
     async def get_current_user(self, token: str = Depends(oauth2_scheme)):
@@ -57,7 +78,7 @@ class UserModel:
             headers={"WWW-Authenticate": "Bearer"},
         )
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = verify_token(token)
             user_id: str = payload.get("sub")
             if user_id is None:
                 raise credentials_exception
@@ -70,19 +91,20 @@ class UserModel:
         return user
 
 class SubscriptionModel:
-    def __init__(self):
-        self.collection = db.get_user_subscription()
+    @property
+    def collection(self):
+        return db.get_user_subscription()
 
-    def get_user_subscriptions(self, user_id: ObjectId):
+    async def get_user_subscriptions(self, user_id: ObjectId):
         subscriptions = self.collection.find({
             "user_id": user_id,
             "is_subscribe": True
         }, {"news_source_id": 1, "_id": 0})
 
-        return list(subscriptions)
+        return await subscriptions.to_list(length=None)
 
-    def update_user_subscription(self, user_id: str, news_source_id: str, is_subscribe: bool):
-        result = self.collection.update_one(
+    async def update_user_subscription(self, user_id: str, news_source_id: str, is_subscribe: bool):
+        result = await self.collection.update_one(
             {"user_id": ObjectId(user_id), "news_source_id": news_source_id},
             {"$set": {"is_subscribe": is_subscribe}},
             upsert=True
@@ -95,10 +117,10 @@ class SubscriptionModel:
         }
 
 class ClickEventModel:
-    def __init__(self):
-        self.collection = db.get_click_event_collection()
+    @property
+    def collection(self):
+        return db.get_click_event_collection()
 
-    def record_click_event(self, click_data: ClickEvent):
-        click_dict = click_data.dict()
-        result = self.collection.insert_one(click_dict)
-        return {"status": "success", "inserted_id": str(result.inserted_id)}
\ No newline at end of file
+    async def insert_many(self, click_dicts):
+        # 클릭 버퍼의 백그라운드 writer 가 배치 단위로 호출
+        await self.collection.insert_many(click_dicts, ordered=False)
\ No newline at end of file
@@ -1,32 +1,44 @@
 # data_api_service/users/routes.py
 import os
 from datetime import timedelta, datetime
+from typing import List, Union
 from fastapi import APIRouter, status, HTTPException, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
 from .schemas import UserCreate, UserDisplay, UserLogin, LoginResponse, ClickEvent, UserSubscriptions
 from .models import UserModel, SubscriptionModel, ClickEventModel
+from .clicks import ClickBufferFull, click_buffer
 from .schemas import Token, User
 from dependencies import create_access_token, decode_access_token
 import logging
 from bson import ObjectId
+
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+MAX_CLICK_BATCH = int(os.getenv('CLICK_MAX_REQUEST_BATCH', 1000))  # 요청 하나에 담을 수 있는 최대 클릭 수
 
 user_model = UserModel()
 subscription_model = SubscriptionModel()
 click_model = ClickEventModel()
 
-@router.post("/click", status_code=status.HTTP_201_CREATED)
-def record_click(click_data: ClickEvent):
-    result = click_model.record_click_event(click_data)
-    return result
+@router.post("/click", status_code=status.HTTP_202_ACCEPTED)
+async def record_click(click_data: Union[List[ClickEvent], ClickEvent]):
+    # 단건 또는 배열로 받아 버퍼에 넣고 바로 응답 (DB 쓰기는 백그라운드 writer 가 배치로 처리)
+    events = click_data if isinstance(click_data, list) else [click_data]
+    if len(events) > MAX_CLICK_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_CLICK_BATCH} click events per request")
+    try:
+        accepted = await click_buffer.put_many([event.dict() for event in events])
+    except ClickBufferFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    return {"status": "accepted", "accepted": accepted}
 
 @router.post("/signup", response_model=UserDisplay, status_code=status.HTTP_201_CREATED)
-def signup(user_data: UserCreate):
+async def signup(user_data: UserCreate):
     try:
-        user_dict = user_model.create_user(user_data)
+        user_dict = await user_model.create_user(user_data)
         return UserDisplay(**user_dict)
     except HTTPException as e:
         raise e
@@ -36,26 +48,26 @@ def signup(user_data: UserCreate):
     
 @router.post("/login", response_model=LoginResponse)
 async def login(user_credentials: UserLogin):
-    logging.info(f"Login attempt for email: {user_credentials.email}")
     try:
-        user_doc = user_model.authenticate_user(user_credentials.email, user_credentials.password)
+        user_doc = await user_model.authenticate_user(user_credentials.email, user_credentials.password)
         if user_doc:
-            logging.info(f"User authenticated: {user_doc['_id']}")
             access_token = create_access_token(data={"sub": str(user_doc['_id'])})
-            logging.info("Access token created successfully")
+            logger.debug("User %s logged in", user_doc['_id'])
             return {"message": "Login successful", "token": access_token, "user_id": str(user_doc['_id'])}
         else:
-            logging.warning(f"Authentication failed for email: {user_credentials.email}")
             raise HTTPException(status_code=401, detail="Invalid username or password")
+    except HTTPException:
+        # 401/404/503 은 그대로 전달
+        raise
     except Exception as e:
-        logging.error(f"Error during login process: {str(e)}")
+        logger.error("Error during login process: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = user_model.find_by_username(form_data.username)
+    user = await user_model.find_by_username(form_data.username)
     if not user or not user_model.verify_password(form_data.password, user["hashed_password"]):
         raise HTTPException(status_code=400, detail="Incorrect username or password")
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -66,15 +78,15 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
 
 @router.post("/register")
 async def register_user(user: User):
-    existing_user = user_model.find_by_username(user.username)
+    existing_user = await user_model.find_by_username(user.username)
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already taken")
-    user_id = user_model.create_user(user.username, user.password)
+    user_id = await user_model.create_user(user.username, user.password)
     return {"message": "User registered successfully", "user_id": user_id}
 
 @router.get("/me", response_model=User)
 async def read_users_me(token: str = Depends(decode_access_token)):
-    user = user_model.find_by_id(token)
+    user = await user_model.find_by_id(token)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return User(**user)
@@ -83,7 +95,7 @@ async def read_users_me(token: str = Depends(decode_access_token)):
 @router.get("/user_subscriptions", response_model=UserSubscriptions)
 async def get_user_subscriptions(token: str = Depends(decode_access_token)):
     user_id = token
-    subscriptions = subscription_model.get_user_subscriptions(user_id)
+    subscriptions = await subscription_model.get_user_subscriptions(user_id)
     return {"subscriptions": [{"news_source_id": sub["news_source_id"]} for sub in subscriptions]}
 
 
@@ -94,5 +106,5 @@ async def toggle_subscription(
     token: str = Depends(decode_access_token)
 ):
     user_id = token  # token이 user_id를 포함한다고 가정
-    result = subscription_model.update_user_subscription(user_id, news_source_id, action == 'subscribed')
+    result = await subscription_model.update_user_subscription(user_id, news_source_id, action == 'subscribed')
     return {"message": f"Subscription {action} successful", "result": result}
\ No newline at end of file
@@ -43,4 +43,26 @@ export const NewsList = async () => {
     console.error('Failed to fetch news details:', error);
     throw error;
   }
-};
\ No newline at end of file
+};
+export const searchNews = async (query, limit = 20) => {
+  try {
+    const response = await axios.get(`${API_ENDPOINT}/search`, { params: { q: query, limit } });
+    return response.data;
+  } catch (error) {
+    console.error('Failed to search news:', error);
+    throw error;
+  }
+};
+
+// 새 기사를 SSE 로 받음 (연결이 끊기면 브라우저가 Last-Event-ID 로 자동 재연결)
+// 끊긴 동안 놓친 기사가 너무 많으면 서버가 reset 을 보내므로 목록을 처음부터 다시 불러와야 함
+export const openNewsStream = (onArticle, onReset) => {
+  const source = new EventSource(`${API_ENDPOINT}/stream`);
+  source.addEventListener('article', (event) => {
+    onArticle(JSON.parse(event.data));
+  });
+  source.addEventListener('reset', () => {
+    if (onReset) onReset();
+  });
+  return source;
+};
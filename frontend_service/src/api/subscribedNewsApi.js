@@ -162,6 +162,16 @@ export const fetchSubscribedNewsApi = async () => {
 };
 
 
+// 구독한 소스의 기사 피드 (after 에 이전 응답의 nextCursor 를 전달)
+export const fetchSubscribedFeed = async (after = null, pageSize = 10) => {
+  const params = new URLSearchParams({ page_size: pageSize });
+  if (after) {
+    params.append('after', after);
+  }
+  return apiRequest('get', `/subscriptions/feed?${params.toString()}`);
+};
+
+
 export const toggleNewsSubscriptionApi = async (newsId, action) => {
   try {
     console.log(`Attempting to ${action} news source: ${newsId}`);  
@@ -2,6 +2,7 @@
 import React, { useState, useEffect } from 'react';
 import { Grid, TextField, Box, Typography } from '@mui/material';
 import NewsCard from '../components/NewsCard';
+import { searchNews } from '../api/newsApi';
 
 function SearchPage({ newsData }) {
     const [searchQuery, setSearchQuery] = useState("");
@@ -12,18 +13,33 @@ function SearchPage({ newsData }) {
         setFilteredData(newsData);
     }, [newsData]);  // newsData가 변경되면 반응
 
-    const handleSearchChange = (event) => {
-        const query = event.target.value.toLowerCase();
-        setSearchQuery(query);
-        if (query) {
-            const filtered = newsData.filter(news =>
-                (news.title && news.title.toLowerCase().includes(query)) ||
-                (news.description && news.description.toLowerCase().includes(query))
-            );
-            setFilteredData(filtered);
-        } else {
+    useEffect(() => {
+        if (!searchQuery.trim()) {
             setFilteredData(newsData);
+            return;
         }
+        // 입력이 멈춘 뒤 서버의 /news/search 로 검색
+        let cancelled = false;
+        const timer = setTimeout(async () => {
+            try {
+                const data = await searchNews(searchQuery);
+                if (!cancelled) {
+                    setFilteredData(data.results);
+                }
+            } catch (error) {
+                if (!cancelled) {
+                    setFilteredData([]);
+                }
+            }
+        }, 300);
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [searchQuery, newsData]);
+
+    const handleSearchChange = (event) => {
+        setSearchQuery(event.target.value);
     };
 
     return (
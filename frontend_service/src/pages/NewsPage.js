@@ -3,8 +3,8 @@ import React, { useEffect, useState, useRef } from 'react';
 import { useNavigate } from 'react-router-dom';
 import NewsCard from '../components/NewsCard';
 import SearchPage from '../components/SearchPage';
-import { fetchNews } from '../api/newsApi';
-import { fetchSubscribedNewsApi } from '../api/subscribedNewsApi';
+import { fetchNews, openNewsStream } from '../api/newsApi';
+import { fetchSubscribedFeed } from '../api/subscribedNewsApi';
 import { Container, Typography, Tabs, Tab, Box, Grid, Button } from '@mui/material';
 // NewsPage 컴포넌트 정의
 function NewsPage() {
@@ -14,6 +14,7 @@ function NewsPage() {
     const [tabValue, setTabValue] = useState(0); // 현재 선택된 탭 인덱스 저장
     const [page, setPage] = useState(1); // 현재 뉴스 페이지 번호 저장
     const [subscribedPage, setSubscribedPage] = useState(1); // 현재 구독 뉴스 페이지 번호 저장
+    const [subscribedCursor, setSubscribedCursor] = useState(null); // 다음 구독 뉴스 페이지 커서 저장
     const [loading, setLoading] = useState(false); // 데이터 로딩 상태 저장
     const [hasMore, setHasMore] = useState(true); // 추가 뉴스 데이터 존재 여부 저장
     const [subscribedHasMore, setSubscribedHasMore] = useState(true); // 추가 구독 뉴스 데이터 존재 여부 저장
@@ -68,6 +69,26 @@ function NewsPage() {
         loadData(); // 데이터 로드 함수 호출
     }, [page, hasMore, loading, tabValue]);
 
+    // 새로 저장된 기사를 실시간으로 받아 목록 맨 앞에 추가
+    useEffect(() => {
+        if (tabValue !== 0) return;
+        // 재연결 사이의 누락분을 서버가 다 보내지 못하면(reset) 첫 페이지를 다시 불러와 목록을 교체
+        const reloadFirstPage = async () => {
+            try {
+                const data = await fetchNews(1);
+                setNewsData(data && data.newsList ? data.newsList : []);
+                setHasMore(true);
+                setPage(2); // 다음 스크롤은 두 번째 페이지부터
+            } catch (error) {
+                console.error('뉴스 목록 새로고침 실패:', error);
+            }
+        };
+        const stream = openNewsStream(article => {
+            setNewsData(prev => (prev.some(news => news._id === article._id) ? prev : [article, ...prev]));
+        }, reloadFirstPage);
+        return () => stream.close();
+    }, [tabValue]);
+
     // 뉴스 무한 스크롤을 위한 IntersectionObserver 설정
     useEffect(() => {
         const observer = new IntersectionObserver(
@@ -95,11 +116,15 @@ function NewsPage() {
         setLoading(true); // 로딩 상태 설정
         const loadSubscribedData = async () => {
             try {
-                const data = await fetchSubscribedNewsApi(subscribedPage); // 구독 뉴스 데이터 가져오기
-                if (data && data.length > 0) {
-                    // setSubscribedNews(prev => [...prev, ...data]); // 구독 뉴스 데이터 업데이트
-                    setSubscribedNews(prev => (subscribedPage === 1 ? data : [...prev, ...data])); // 구독 뉴스 데이터 업데이트
-                    setSubscribedPage(prev => prev + 1);  // 데이터 로딩 후 페이지 번호 증가
+                const data = await fetchSubscribedFeed(subscribedPage === 1 ? null : subscribedCursor); // 구독 뉴스 데이터 가져오기
+                if (data && data.newsList.length > 0) {
+                    setSubscribedNews(prev => (subscribedPage === 1 ? data.newsList : [...prev, ...data.newsList])); // 구독 뉴스 데이터 업데이트
+                    setSubscribedCursor(data.nextCursor);
+                    if (data.nextCursor) {
+                        setSubscribedPage(prev => prev + 1);  // 데이터 로딩 후 페이지 번호 증가
+                    } else {
+                        setSubscribedHasMore(false); // 마지막 페이지
+                    }
                 } else {
                     setSubscribedHasMore(false); // 추가 데이터 없음 설정
                 }
@@ -110,7 +135,7 @@ function NewsPage() {
             }
         };
         loadSubscribedData(); // 데이터 로드 함수 호출
-    }, [subscribedPage, subscribedHasMore, loading, tabValue]);
+    }, [subscribedPage, subscribedCursor, subscribedHasMore, loading, tabValue]);
 
     // 구독 뉴스 무한 스크롤을 위한 IntersectionObserver 설정
     useEffect(() => {
@@ -141,6 +166,7 @@ function NewsPage() {
             setHasMore(true); // 더 가져올 데이터가 있다고 설정
         } else if (newValue === 2) {
             setSubscribedPage(1); // 구독 뉴스 페이지 초기화
+            setSubscribedCursor(null); // 구독 뉴스 커서 초기화
             setSubscribedNews([]); // 구독 뉴스 데이터 초기화
             setSubscribedHasMore(true); // 더 가져올 구독 뉴스가 있다고 설정
         }
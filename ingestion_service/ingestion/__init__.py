@@ -0,0 +1 @@
+# ingestion/__init__.py
@@ -0,0 +1,56 @@
+# ingestion/config.py
+import os
+
+# 환경 변수 또는 설정 파일에서 Kafka 서버 및 토픽 로드
+KAFKA_SERVER = os.getenv('KAFKA_SERVER')
+KAFKA_TOPICS = [t for t in os.getenv('KAFKA_TOPICS', '').replace(' ', '').split(',') if t]
+
+# Kafka Producer 설정
+KAFKA_LINGER_MS = int(os.getenv('KAFKA_LINGER_MS', 50))  # 배치를 모으기 위해 기다리는 시간 (ms)
+KAFKA_BATCH_SIZE = int(os.getenv('KAFKA_BATCH_SIZE', 65536))  # 파티션별 최대 배치 크기 (bytes)
+KAFKA_COMPRESSION = os.getenv('KAFKA_COMPRESSION', 'lz4')  # lz4, zstd, gzip, snappy 또는 빈 값
+KAFKA_ACKS = os.getenv('KAFKA_ACKS', 'all')
+KAFKA_FLUSH_TIMEOUT = float(os.getenv('KAFKA_FLUSH_TIMEOUT', 10))  # 호출 사이클 종료 시 flush 최대 대기 (초)
+SPOOL_PATH = os.getenv('INGESTION_SPOOL_PATH', 'data/failed_sends.jsonl')  # 전송 실패 메시지 보관 파일
+if KAFKA_ACKS not in ('all', '0', '1'):
+    raise ValueError(f"Invalid KAFKA_ACKS: {KAFKA_ACKS}")
+if KAFKA_ACKS != 'all':
+    KAFKA_ACKS = int(KAFKA_ACKS)
+
+# 사용할 제공자 목록 (비어 있으면 API 키가 설정된 모든 제공자)
+INGESTION_PROVIDERS = [p for p in os.getenv('INGESTION_PROVIDERS', '').replace(' ', '').split(',') if p]
+
+# 토픽별 호출 간격은 새 기사 수율에 따라 MIN ~ MAX 사이에서 조정됨
+BASE_INTERVAL = int(os.getenv('INGESTION_BASE_INTERVAL', 3600))  # 시작 호출 간격 (초)
+MIN_INTERVAL = int(os.getenv('INGESTION_MIN_INTERVAL', 600))  # 최소 호출 간격 (초)
+MAX_INTERVAL = int(os.getenv('INGESTION_MAX_INTERVAL', 21600))  # 최대 호출 간격 (초)
+TARGET_YIELD = float(os.getenv('INGESTION_TARGET_YIELD', 3))  # 호출당 목표 새 기사 수
+RETRY_BASE = int(os.getenv('INGESTION_RETRY_BASE', 60))  # 첫 재시도 간격 (초), 실패마다 2배
+RETRY_MAX = int(os.getenv('INGESTION_RETRY_MAX', 3600))  # 최대 재시도 간격 (초)
+BREAKER_THRESHOLD = int(os.getenv('INGESTION_BREAKER_THRESHOLD', 5))  # 서킷 오픈까지 연속 실패 수
+BREAKER_COOLDOWN = int(os.getenv('INGESTION_BREAKER_COOLDOWN', 1800))  # 서킷 오픈 유지 시간 (초)
+QUOTA_BURST = int(os.getenv('INGESTION_QUOTA_BURST', 10))  # 일일 쿼터 중 연달아 쓸 수 있는 최대 호출 수
+TICK_INTERVAL = int(os.getenv('INGESTION_TICK_INTERVAL', 10))  # 호출 대상 확인 주기 (초)
+STATE_PATH = os.getenv('INGESTION_STATE_PATH', 'data/ingestion_state.db')  # 스케줄러 상태 저장 위치 (SQLite)
+RESTORE_SPREAD = int(os.getenv('INGESTION_RESTORE_SPREAD', 300))  # 재시작 시 밀린 호출을 분산할 시간 (초)
+SEEN_TTL = int(os.getenv('INGESTION_SEEN_TTL', 7 * 86400))  # 이미 보낸 기사 URL 을 기억하는 기간 (초)
+SEEN_MAX_ENTRIES = int(os.getenv('INGESTION_SEEN_MAX_ENTRIES', 500_000))  # 기억할 최대 URL 수
+STATUS_PORT = int(os.getenv('INGESTION_STATUS_PORT', 8080))  # 스케줄러 상태 조회용 HTTP 포트
+
+HTTP_POOL_SIZE = int(os.getenv('INGESTION_HTTP_POOL_SIZE', 50))  # 전체 HTTP 커넥션 풀 크기
+HTTP_TIMEOUT = float(os.getenv('INGESTION_HTTP_TIMEOUT', 20))  # 요청당 타임아웃 (초)
+
+
+def provider_concurrency(name, default):
+    """Per-provider concurrency limit, e.g. GNEWS_MAX_CONCURRENCY=2."""
+    return int(os.getenv(f'{name.upper()}_MAX_CONCURRENCY', default))
+
+
+def provider_daily_quota(name, default):
+    """Per-provider daily request quota, e.g. GNEWS_DAILY_QUOTA=100."""
+    return int(os.getenv(f'{name.upper()}_DAILY_QUOTA', default))
+
+
+def provider_quota_burst(name):
+    """Per-provider number of calls allowed back to back, e.g. GNEWS_QUOTA_BURST=5."""
+    return int(os.getenv(f'{name.upper()}_QUOTA_BURST', QUOTA_BURST))
@@ -0,0 +1,171 @@
+# ingestion/engine.py
+import asyncio
+import logging
+import time
+from collections import defaultdict
+
+import aiohttp
+from aiohttp import web
+
+from . import config
+from .producer import TrackedProducer
+from .providers import ProviderError, load_providers
+from .scheduler import PollScheduler
+from .seen import SeenCache, url_hash
+from .state import StateStore
+
+logger = logging.getLogger(__name__)
+
+
+class IngestionEngine:
+    """Polls every (provider, topic) pair concurrently and produces to Kafka.
+
+    One pooled HTTP session is shared by all providers; a semaphore per
+    provider caps how many of its requests are in flight at once. Which pairs
+    are due is decided by the PollScheduler, whose state is served as JSON on
+    ``/scheduler`` of the status port. Articles already published for a topic
+    are filtered out by the SeenCache before producing and recorded there
+    only once Kafka acknowledged them (or they were spooled); per
+    (provider, topic) duplicate ratios are served on ``/duplicates``.
+    """
+
+    def __init__(self, providers=None, topics=None):
+        self.providers = providers if providers is not None else load_providers(config.INGESTION_PROVIDERS)
+        self.topics = topics if topics is not None else config.KAFKA_TOPICS
+        self.semaphores = {
+            provider.name: asyncio.Semaphore(config.provider_concurrency(provider.name, provider.default_concurrency))
+            for provider in self.providers
+        }
+        self.store = StateStore(config.STATE_PATH)
+        self.seen = SeenCache(self.store.conn, ttl=config.SEEN_TTL, max_entries=config.SEEN_MAX_ENTRIES)
+        self.scheduler = PollScheduler(
+            [p.name for p in self.providers],
+            self.topics,
+            quotas={p.name: config.provider_daily_quota(p.name, p.default_daily_quota) for p in self.providers},
+            bursts={p.name: config.provider_quota_burst(p.name) for p in self.providers},
+            base_interval=config.BASE_INTERVAL,
+            min_interval=config.MIN_INTERVAL,
+            max_interval=config.MAX_INTERVAL,
+            target_yield=config.TARGET_YIELD,
+            retry_base=config.RETRY_BASE,
+            retry_max=config.RETRY_MAX,
+            breaker_threshold=config.BREAKER_THRESHOLD,
+            breaker_cooldown=config.BREAKER_COOLDOWN,
+            store=self.store,
+            restore_spread=config.RESTORE_SPREAD,
+        )
+        self.providers_by_name = {p.name: p for p in self.providers}
+        self.settled = defaultdict(list)  # topic -> 전달이 끝나 아직 SeenCache 에 기록하지 않은 URL 해시
+        self.session = None
+        self.producer = None
+        self.status_runner = None
+
+    async def start(self):
+        connector = aiohttp.TCPConnector(limit=config.HTTP_POOL_SIZE, ttl_dns_cache=300)
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=config.HTTP_TIMEOUT),
+        )
+        self.producer = TrackedProducer(
+            config.KAFKA_SERVER,
+            spool_path=config.SPOOL_PATH,
+            linger_ms=config.KAFKA_LINGER_MS,
+            batch_size=config.KAFKA_BATCH_SIZE,
+            compression_type=config.KAFKA_COMPRESSION,
+            acks=config.KAFKA_ACKS,
+        )
+        await self.producer.start()
+        await self.start_status_server()
+        logger.info("Ingestion engine started: providers=%s topics=%s",
+                    [p.name for p in self.providers], self.topics)
+
+    async def start_status_server(self):
+        app = web.Application()
+        app.router.add_get('/scheduler', self.handle_scheduler_status)
+        app.router.add_get('/duplicates', self.handle_duplicate_status)
+        app.router.add_get('/producer', self.handle_producer_status)
+        self.status_runner = web.AppRunner(app, access_log=None)
+        await self.status_runner.setup()
+        await web.TCPSite(self.status_runner, '0.0.0.0', config.STATUS_PORT).start()
+
+    async def handle_scheduler_status(self, request):
+        return web.json_response(self.scheduler.snapshot())
+
+    async def handle_duplicate_status(self, request):
+        return web.json_response(self.seen.duplicate_ratios())
+
+    async def handle_producer_status(self, request):
+        return web.json_response(self.producer.stats())
+
+    async def stop(self):
+        if self.status_runner is not None:
+            await self.status_runner.cleanup()
+        if self.producer is not None:
+            await self.producer.flush(config.KAFKA_FLUSH_TIMEOUT)
+            await self.producer.stop()
+            self.mark_settled()
+        if self.session is not None:
+            await self.session.close()
+        self.store.close()
+
+    async def fetch_articles(self, provider, topic):
+        url, params = provider.build_request(topic)
+        async with self.semaphores[provider.name]:
+            async with self.session.get(url, params=params) as response:
+                if response.status != 200:
+                    raise ProviderError(f"{provider.name} returned HTTP {response.status} for {topic}")
+                payload = await response.json(content_type=None)
+        return provider.extract_articles(payload)
+
+    def on_settled(self, topic, article):
+        self.settled[topic].append(url_hash(article['url']))
+
+    def mark_settled(self):
+        # 전송이 확정된 기사만 기록해, 전달 전에 죽어도 다음 수집에서 다시 보냄
+        settled, self.settled = self.settled, defaultdict(list)
+        for topic, hashes in settled.items():
+            self.seen.mark_seen(topic, hashes)
+
+    async def fetch_and_send_articles(self, provider, topic):
+        articles = [provider.standardize(article) for article in await self.fetch_articles(provider, topic)]
+        # 이전 호출에서 이미 보낸 기사는 Kafka 로 다시 보내지 않음
+        unseen, seen_hashes = self.seen.filter_unseen(provider.name, topic, articles)
+        self.seen.mark_seen(topic, seen_hashes)
+        for article in unseen:
+            await self.producer.send(topic, article, on_settled=self.on_settled)
+        logger.info("Data collection complete for %s/%s: %d articles, %d new",
+                    provider.name, topic, len(articles), len(unseen))
+        return len(unseen)
+
+    async def run_cycle(self):
+        """Fetch every due (provider, topic) pair concurrently."""
+        await self.producer.replay_spool()
+        due = [(self.providers_by_name[name], topic) for name, topic in self.scheduler.due()]
+        if not due:
+            return 0
+        started = time.monotonic()
+        results = await asyncio.gather(
+            *(self.fetch_and_send_articles(provider, topic) for provider, topic in due),
+            return_exceptions=True,
+        )
+        sent = 0
+        for (provider, topic), result in zip(due, results):
+            if isinstance(result, BaseException):
+                logger.error("API call failed for %s/%s: %s", provider.name, topic, str(result))
+                self.scheduler.record_failure(provider.name, topic, str(result) or type(result).__name__)
+            else:
+                sent += result
+                # 토픽 수율은 실제로 새로 보낸 기사 수 기준
+                self.scheduler.record_success(provider.name, topic, result)
+        # 사이클마다 전송 완료를 기다리되 최대 KAFKA_FLUSH_TIMEOUT 초까지만
+        await self.producer.flush(config.KAFKA_FLUSH_TIMEOUT)
+        self.mark_settled()
+        self.seen.evict()
+        logger.info("Polling cycle finished: %d calls, %d articles in %.1fs",
+                    len(due), sent, time.monotonic() - started)
+        return sent
+
+    async def run_forever(self):
+        while True:
+            await self.run_cycle()
+            await asyncio.sleep(config.TICK_INTERVAL)
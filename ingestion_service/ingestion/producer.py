@@ -0,0 +1,113 @@
+# ingestion/producer.py
+import asyncio
+import hashlib
+import json
+import logging
+import os
+
+from aiokafka import AIOKafkaProducer
+
+logger = logging.getLogger(__name__)
+
+
+def article_key(article):
+    # 같은 URL 은 항상 같은 파티션으로 가도록 URL 해시를 메시지 키로 사용
+    return hashlib.sha1(article['url'].encode('utf-8')).hexdigest().encode('ascii')
+
+
+class TrackedProducer:
+    """Kafka producer wrapper that counts deliveries and spools failures.
+
+    Every send gets a delivery callback; acknowledged and failed messages are
+    counted, and failed ones are appended to a local JSON-lines spool that is
+    replayed on the next cycle. ``on_settled`` passed to ``send`` is called
+    once the article is acknowledged or spooled, i.e. will not be lost.
+    """
+
+    def __init__(self, bootstrap_servers, spool_path, linger_ms=50, batch_size=65536,
+                 compression_type='lz4', acks='all'):
+        self.spool_path = spool_path
+        self.producer = AIOKafkaProducer(
+            bootstrap_servers=bootstrap_servers,
+            value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+            linger_ms=linger_ms,
+            max_batch_size=batch_size,
+            compression_type=compression_type or None,
+            acks=acks,
+        )
+        # sent: 버퍼에 들어간 메시지, rejected: send 자체가 실패한 메시지
+        self.counters = {'sent': 0, 'acked': 0, 'failed': 0, 'rejected': 0, 'spooled': 0, 'replayed': 0}
+
+    async def start(self):
+        directory = os.path.dirname(self.spool_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        await self.producer.start()
+
+    async def stop(self):
+        await self.producer.stop()
+
+    def _spool(self, topic, article):
+        with open(self.spool_path, 'a') as file:
+            file.write(json.dumps({'topic': topic, 'article': article}) + '\n')
+        self.counters['spooled'] += 1
+
+    def _on_delivery(self, topic, article, on_settled, future):
+        if future.cancelled() or future.exception() is not None:
+            self.counters['failed'] += 1
+            error = 'cancelled' if future.cancelled() else future.exception()
+            logger.error("Delivery failed for %s (%s): %s", topic, article.get('url'), error)
+            self._spool(topic, article)
+        else:
+            self.counters['acked'] += 1
+        if on_settled is not None:
+            on_settled(topic, article)
+
+    async def send(self, topic, article, on_settled=None):
+        try:
+            future = await self.producer.send(topic, article, key=article_key(article))
+        except Exception as e:
+            # 버퍼가 가득 찼거나 브로커에 연결할 수 없는 경우
+            self.counters['rejected'] += 1
+            logger.error("Send failed for %s (%s): %s", topic, article.get('url'), str(e))
+            self._spool(topic, article)
+            if on_settled is not None:
+                on_settled(topic, article)
+            return
+        self.counters['sent'] += 1
+        future.add_done_callback(lambda f: self._on_delivery(topic, article, on_settled, f))
+
+    async def flush(self, timeout):
+        """Wait up to ``timeout`` seconds for buffered messages to be delivered."""
+        try:
+            await asyncio.wait_for(self.producer.flush(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Producer flush did not finish within %ss", timeout)
+
+    async def replay_spool(self):
+        """Resend spooled messages; ones that fail again are spooled anew."""
+        replay_path = self.spool_path + '.replay'
+        if not os.path.exists(replay_path):
+            if not os.path.exists(self.spool_path):
+                return 0
+            # 재전송 중 새로 실패한 메시지가 같은 파일에 섞이지 않도록 먼저 이름을 바꿈
+            os.replace(self.spool_path, replay_path)
+        count = 0
+        with open(replay_path) as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                await self.send(entry['topic'], entry['article'])
+                count += 1
+        os.remove(replay_path)
+        self.counters['replayed'] += count
+        if count:
+            logger.info("Replayed %d spooled messages", count)
+        return count
+
+    def stats(self):
+        stats = dict(self.counters)
+        stats['pending'] = stats['sent'] - stats['acked'] - stats['failed']
+        return stats
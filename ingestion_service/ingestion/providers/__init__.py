@@ -0,0 +1,18 @@
+# ingestion/providers/__init__.py
+from .base import NewsProvider, ProviderError
+from .gnews import GNewsProvider
+from .newsapi import NewsAPIProvider
+from .mediastack import MediaStackProvider
+
+PROVIDER_CLASSES = {
+    cls.name: cls for cls in (GNewsProvider, NewsAPIProvider, MediaStackProvider)
+}
+
+
+def load_providers(names=None):
+    """Instantiate the requested providers, or every provider with an API key."""
+    selected = names or list(PROVIDER_CLASSES)
+    unknown = [name for name in selected if name not in PROVIDER_CLASSES]
+    if unknown:
+        raise ValueError(f"Unknown providers: {unknown}")
+    return [provider for provider in (PROVIDER_CLASSES[name]() for name in selected) if provider.enabled]
@@ -0,0 +1,38 @@
+# ingestion/providers/base.py
+import os
+
+
+class ProviderError(Exception):
+    pass
+
+
+class NewsProvider:
+    """Base class for news API plugins.
+
+    A provider knows how to build the request for one topic, pull the
+    article list out of the response and map each article onto the
+    standardized shape that is sent to Kafka. All HTTP and Kafka work is
+    done by the engine.
+    """
+
+    name = None
+    api_key_env = None
+    default_concurrency = 2
+    default_daily_quota = 100  # 무료 요금제 기준 하루 호출 한도
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key if api_key is not None else os.getenv(self.api_key_env or '')
+
+    @property
+    def enabled(self):
+        return bool(self.api_key)
+
+    def build_request(self, topic):
+        """Return ``(url, params)`` for fetching ``topic``."""
+        raise NotImplementedError
+
+    def extract_articles(self, payload):
+        raise NotImplementedError
+
+    def standardize(self, article):
+        raise NotImplementedError
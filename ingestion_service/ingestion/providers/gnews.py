@@ -0,0 +1,27 @@
+# ingestion/providers/gnews.py
+from .base import NewsProvider
+
+
+class GNewsProvider(NewsProvider):
+    name = 'GNews'
+    api_key_env = 'GNEWS_API_KEY'
+
+    def build_request(self, topic):
+        params = {'q': topic, 'lang': 'en', 'country': 'us', 'max': 10, 'token': self.api_key}
+        return "https://gnews.io/api/v4/search", params
+
+    def extract_articles(self, payload):
+        return payload.get("articles", [])
+
+    def standardize(self, article):
+        # 데이터 표준화
+        return {
+            'title': article.get('title'),
+            'description': article.get('description'),
+            'url': article.get('url'),
+            'image': article.get('image'),
+            'published_at': article.get('publishedAt'),
+            'source': self.name,  # 소스 정보 추가
+            'publisher': (article.get('source') or {}).get('name'),  # 원래 언론사 이름
+            'content': article.get('content'),  # 원본 API 응답에서 제공되는 경우
+        }
@@ -0,0 +1,30 @@
+# ingestion/providers/mediastack.py
+from .base import NewsProvider
+
+
+class MediaStackProvider(NewsProvider):
+    name = 'MediaStack'
+    api_key_env = 'MEDIASTACK_API_KEY'
+    default_daily_quota = 16  # 무료 요금제는 월 500회
+
+    def build_request(self, topic):
+        params = {'access_key': self.api_key, 'keywords': topic, 'countries': 'us,kr'}
+        return "http://api.mediastack.com/v1/news", params
+
+    def extract_articles(self, payload):
+        return payload.get('data', [])
+
+    def standardize(self, article):
+        return {
+            'title': article.get('title'),
+            'description': article.get('description'),
+            'url': article.get('url'),
+            'image': article.get('image'),
+            'published_at': article.get('published_at'),
+            'source': self.name,
+            'publisher': article.get('source'),  # 원래 언론사 이름 보존
+            'author': article.get('author'),
+            'category': article.get('category'),
+            'language': article.get('language'),
+            'country': article.get('country'),
+        }
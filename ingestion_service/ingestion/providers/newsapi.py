@@ -0,0 +1,27 @@
+# ingestion/providers/newsapi.py
+from .base import NewsProvider
+
+
+class NewsAPIProvider(NewsProvider):
+    name = 'NewsAPI'
+    api_key_env = 'NEWS_API_KEY'
+
+    def build_request(self, topic):
+        params = {'apiKey': self.api_key, 'q': topic, 'language': 'en'}
+        return "https://newsapi.org/v2/everything", params
+
+    def extract_articles(self, payload):
+        return payload.get('articles', [])
+
+    def standardize(self, article):
+        return {
+            'title': article.get('title'),
+            'description': article.get('description'),
+            'url': article.get('url'),
+            'image': article.get('urlToImage'),
+            'published_at': article.get('publishedAt'),
+            'source': self.name,
+            'publisher': (article.get('source') or {}).get('name'),  # 원래 언론사 이름 보존
+            'author': article.get('author'),
+            'content': article.get('content'),
+        }
@@ -0,0 +1,259 @@
+# ingestion/scheduler.py
+import logging
+import random
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# 서킷 브레이커 상태
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class TokenBucket:
+    """Spreads a provider's daily request quota evenly over the day.
+
+    At most ``burst`` calls can be made back to back; after that calls are
+    paced at ``daily_quota`` per day, so no 24h window exceeds the quota by
+    more than the burst.
+    """
+
+    def __init__(self, daily_quota, burst=10, now=None):
+        self.daily_quota = max(1, daily_quota)
+        self.capacity = max(1, min(self.daily_quota, burst))
+        self.rate = self.daily_quota / 86400  # 초당 보충되는 토큰 수
+        self.tokens = float(self.capacity)
+        self.updated_at = now if now is not None else time.time()
+
+    def _refill(self, now):
+        if now > self.updated_at:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+    def try_take(self, now):
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def seconds_until_token(self, now):
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class CircuitBreaker:
+    """Stops calling a provider after repeated failures, then probes it again."""
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def allow(self, now):
+        if self.state == OPEN and now - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+            self.probing = False
+        if self.state == HALF_OPEN:
+            # half-open 상태에서는 한 번의 시험 호출만 허용
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+        return self.state == CLOSED
+
+    def record_success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.probing = False
+
+    def record_failure(self, now):
+        self.failures += 1
+        self.probing = False
+        if self.state == HALF_OPEN or self.failures >= self.threshold:
+            self.state = OPEN
+            self.opened_at = now
+
+
+class TopicState:
+    def __init__(self, provider, topic, interval):
+        self.provider = provider
+        self.topic = topic
+        self.interval = interval
+        self.next_run = 0.0
+        self.failures = 0
+        self.yield_avg = None   # 호출당 새 기사 수의 지수 이동 평균
+        self.last_yield = None
+        self.last_run = None
+
+    def as_dict(self):
+        return {
+            'provider': self.provider,
+            'topic': self.topic,
+            'interval': round(self.interval),
+            'next_run': self.next_run,
+            'failures': self.failures,
+            'yield_avg': self.yield_avg,
+            'last_yield': self.last_yield,
+            'last_run': self.last_run,
+        }
+
+
+class PollScheduler:
+    """Decides which (provider, topic) pairs to poll and when.
+
+    Each pair's interval adapts to how many new articles its polls return:
+    topics that keep yielding are polled more often, dead topics back off up
+    to ``max_interval``. Every call spends a token from the provider's daily
+    quota bucket, which allows a burst of ``bursts[provider]`` calls. Failures back off exponentially with jitter, and repeated
+    failures open a per-provider circuit breaker. Recent decisions are kept
+    for inspection through ``snapshot()``.
+
+    With a ``store``, every state change is persisted and the state is
+    restored on startup; pairs that became due while the process was down
+    are spread over ``restore_spread`` seconds instead of firing at once.
+    """
+
+    def __init__(self, providers, topics, quotas, bursts=None, base_interval=3600, min_interval=600,
+                 max_interval=21600, target_yield=3, retry_base=60, retry_max=3600,
+                 breaker_threshold=5, breaker_cooldown=1800, clock=time.time, rng=None,
+                 store=None, restore_spread=300):
+        self.base_interval = base_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.target_yield = target_yield
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.clock = clock
+        self.rng = rng or random.Random()
+        now = clock()
+        bursts = bursts or {}
+        self.buckets = {p: TokenBucket(quotas[p], bursts.get(p, 10), now) for p in providers}
+        self.breakers = {p: CircuitBreaker(breaker_threshold, breaker_cooldown) for p in providers}
+        self.states = {
+            (p, t): TopicState(p, t, base_interval) for p in providers for t in topics
+        }
+        self.decisions = deque(maxlen=200)
+        self.store = store
+        if store is not None:
+            self._restore(now, restore_spread)
+
+    def _restore(self, now, spread):
+        topics, providers = self.store.load()
+        for name, saved in providers.items():
+            if name not in self.buckets:
+                continue
+            bucket, breaker = self.buckets[name], self.breakers[name]
+            bucket.tokens = min(bucket.capacity, saved['tokens'])
+            bucket.updated_at = saved['updated_at']
+            breaker.state = saved['circuit']
+            breaker.failures = saved['breaker_failures']
+            breaker.opened_at = saved['opened_at']
+        restored = 0
+        for key, saved in topics.items():
+            state = self.states.get(key)
+            if state is None:
+                continue
+            for field, value in saved.items():
+                setattr(state, field, value)
+            if state.next_run < now:
+                # 재시작 직후 밀린 호출이 한꺼번에 몰리지 않도록 분산
+                state.next_run = now + self.rng.uniform(0, spread)
+            restored += 1
+        # 새로 추가된 토픽도 동시에 몰리지 않도록 분산
+        for key, state in self.states.items():
+            if key not in topics:
+                state.next_run = now + self.rng.uniform(0, spread)
+        logger.info("Restored scheduler state for %d of %d pairs", restored, len(self.states))
+
+    def _persist(self, state):
+        if self.store is None:
+            return
+        try:
+            self.store.save_topic(state)
+            self.store.save_provider(state.provider, self.buckets[state.provider], self.breakers[state.provider])
+        except Exception as e:
+            logger.error("Failed to persist scheduler state for %s/%s: %s", state.provider, state.topic, str(e))
+
+    def _decide(self, state, action, reason, now):
+        decision = {
+            'time': now, 'provider': state.provider, 'topic': state.topic,
+            'action': action, 'reason': reason, 'next_run': state.next_run,
+        }
+        self.decisions.append(decision)
+        self._persist(state)
+        logger.debug("Scheduler %s %s/%s: %s", action, state.provider, state.topic, reason)
+
+    def due(self):
+        """Return the pairs to poll now, most productive topics first."""
+        now = self.clock()
+        ready = [s for s in self.states.values() if now >= s.next_run]
+        # 새 기사가 많이 나오는 토픽이 쿼터를 먼저 사용
+        ready.sort(key=lambda s: (-(s.yield_avg if s.yield_avg is not None else self.target_yield), s.next_run))
+        selected = []
+        for state in ready:
+            breaker = self.breakers[state.provider]
+            if not breaker.allow(now):
+                # open 이면 쿨다운 종료 시점, half-open 이면 시험 호출 결과를 기다림
+                state.next_run = breaker.opened_at + breaker.cooldown if breaker.state == OPEN else now + self.retry_base
+                self._decide(state, 'skip', 'circuit open', now)
+                continue
+            bucket = self.buckets[state.provider]
+            if not bucket.try_take(now):
+                state.next_run = now + bucket.seconds_until_token(now)
+                self._decide(state, 'defer', 'daily quota exhausted', now)
+                if breaker.state == HALF_OPEN:
+                    breaker.probing = False
+                continue
+            self._decide(state, 'poll', f'interval {state.interval:.0f}s elapsed', now)
+            selected.append((state.provider, state.topic))
+        return selected
+
+    def record_success(self, provider, topic, new_articles):
+        now = self.clock()
+        state = self.states[(provider, topic)]
+        self.breakers[provider].record_success()
+        state.failures = 0
+        state.last_run = now
+        state.last_yield = new_articles
+        state.yield_avg = new_articles if state.yield_avg is None else 0.5 * state.yield_avg + 0.5 * new_articles
+        # 목표 수율 대비 실제 수율로 간격을 조정 (한 번에 최대 2배씩)
+        factor = self.target_yield / state.yield_avg if state.yield_avg > 0 else 2.0
+        factor = min(2.0, max(0.5, factor))
+        state.interval = min(self.max_interval, max(self.min_interval, state.interval * factor))
+        state.next_run = now + state.interval
+        self._decide(state, 'success', f'{new_articles} new articles, interval -> {state.interval:.0f}s', now)
+
+    def record_failure(self, provider, topic, error):
+        now = self.clock()
+        state = self.states[(provider, topic)]
+        self.breakers[provider].record_failure(now)
+        state.failures += 1
+        state.last_run = now
+        # 지수 백오프 + jitter (delay/2 ~ delay)
+        delay = min(self.retry_max, self.retry_base * 2 ** (state.failures - 1))
+        state.next_run = now + self.rng.uniform(delay / 2, delay)
+        self._decide(state, 'failure', f'{error}; retry #{state.failures} in {state.next_run - now:.0f}s', now)
+
+    def snapshot(self):
+        now = self.clock()
+        return {
+            'time': now,
+            'providers': {
+                name: {
+                    'tokens': round(bucket.tokens, 2),
+                    'daily_quota': bucket.daily_quota,
+                    'burst': bucket.capacity,
+                    'circuit': self.breakers[name].state,
+                    'consecutive_failures': self.breakers[name].failures,
+                }
+                for name, bucket in self.buckets.items()
+            },
+            'topics': [state.as_dict() for state in self.states.values()],
+            'recent_decisions': list(self.decisions),
+        }
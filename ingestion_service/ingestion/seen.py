@@ -0,0 +1,121 @@
+# ingestion/seen.py
+import hashlib
+import logging
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen_urls (
+    topic    TEXT NOT NULL,
+    url_hash BLOB NOT NULL,
+    seen_at  REAL NOT NULL,
+    PRIMARY KEY (topic, url_hash)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS seen_urls_seen_at ON seen_urls (seen_at);
+"""
+
+
+def url_hash(url):
+    return hashlib.blake2b(url.encode('utf-8'), digest_size=16).digest()
+
+
+class SeenCache:
+    """Persistent per-topic set of already published article URLs.
+
+    ``filter_unseen`` only reads; URLs are recorded with ``mark_seen`` once
+    their articles are handed off, so a crash before delivery does not hide
+    them for the whole TTL. Entries expire after ``ttl`` seconds without
+    being seen again and the table is capped at ``max_entries`` rows (oldest
+    evicted first), so each hourly poll only publishes the articles that are
+    new for its topic.
+    """
+
+    def __init__(self, conn, ttl=7 * 86400, max_entries=500_000, clock=time.time):
+        self.conn = conn
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.conn.executescript(_SCHEMA)
+        # 매 사이클 COUNT(*) 전체 스캔을 피하려고 행 수를 직접 유지 (시작 시 한 번만 셈)
+        self.count = self.conn.execute("SELECT COUNT(*) FROM seen_urls").fetchone()[0]
+        self.stats = defaultdict(lambda: {'fetched': 0, 'duplicates': 0})  # (provider, topic) -> 카운터
+
+    def filter_unseen(self, provider, topic, articles):
+        """Return ``(unseen, seen_hashes)``: the articles of ``topic`` not
+        published within the TTL, and the URL hashes of the others."""
+        now = self.clock()
+        keyed = [(url_hash(a['url']), a) for a in articles if a.get('url')]
+        if not keyed:
+            return [], []
+        hashes = [h for h, _ in keyed]
+        placeholders = ', '.join('?' for _ in hashes)
+        seen = {
+            row[0] for row in self.conn.execute(
+                f"SELECT url_hash FROM seen_urls WHERE topic = ? AND seen_at >= ? AND url_hash IN ({placeholders})",
+                (topic, now - self.ttl, *hashes),
+            )
+        }
+        unseen, batch_hashes = [], set()
+        for h, article in keyed:
+            if h not in seen and h not in batch_hashes:
+                unseen.append(article)
+            batch_hashes.add(h)
+
+        stats = self.stats[(provider, topic)]
+        stats['fetched'] += len(keyed)
+        stats['duplicates'] += len(keyed) - len(unseen)
+        return unseen, list(seen)
+
+    def mark_seen(self, topic, hashes):
+        """Record ``hashes`` of ``topic`` as published now."""
+        hashes = set(hashes)
+        if not hashes:
+            return
+        now = self.clock()
+        rows = [(topic, h, now) for h in hashes]
+        self.conn.execute("BEGIN")
+        try:
+            inserted = self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_urls (topic, url_hash, seen_at) VALUES (?, ?, ?)", rows,
+            ).rowcount
+            # 계속 상위에 노출되는 기사는 seen_at 을 갱신해 TTL 이 연장되도록 함
+            self.conn.executemany(
+                "UPDATE seen_urls SET seen_at = ? WHERE topic = ? AND url_hash = ?",
+                [(now, topic, h) for h in hashes],
+            )
+            self.conn.execute("COMMIT")
+        except BaseException:
+            # 같은 연결을 쓰는 스케줄러 상태 저장이 열린 트랜잭션에 섞이지 않도록 되돌림
+            self.conn.execute("ROLLBACK")
+            raise
+        self.count += inserted
+
+    def evict(self):
+        now = self.clock()
+        expired = self.conn.execute("DELETE FROM seen_urls WHERE seen_at < ?", (now - self.ttl,)).rowcount
+        self.count -= expired
+        overflow = 0
+        if self.count > self.max_entries:
+            overflow = self.conn.execute(
+                "DELETE FROM seen_urls WHERE (topic, url_hash) IN "
+                "(SELECT topic, url_hash FROM seen_urls ORDER BY seen_at LIMIT ?)",
+                (self.count - self.max_entries,),
+            ).rowcount
+            self.count -= overflow
+        if expired or overflow:
+            logger.info("Evicted %d expired and %d overflow seen urls", expired, overflow)
+
+    def duplicate_ratios(self):
+        return [
+            {
+                'provider': provider,
+                'topic': topic,
+                'fetched': stats['fetched'],
+                'duplicates': stats['duplicates'],
+                'duplicate_ratio': stats['duplicates'] / stats['fetched'] if stats['fetched'] else 0.0,
+            }
+            for (provider, topic), stats in sorted(self.stats.items())
+        ]
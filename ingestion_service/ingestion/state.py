@@ -0,0 +1,82 @@
+# ingestion/state.py
+import logging
+import os
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS topic_state (
+    provider   TEXT NOT NULL,
+    topic      TEXT NOT NULL,
+    interval   REAL NOT NULL,
+    next_run   REAL NOT NULL,
+    failures   INTEGER NOT NULL,
+    yield_avg  REAL,
+    last_yield INTEGER,
+    last_run   REAL,
+    PRIMARY KEY (provider, topic)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS provider_state (
+    provider         TEXT PRIMARY KEY,
+    tokens           REAL NOT NULL,
+    updated_at       REAL NOT NULL,
+    circuit          TEXT NOT NULL,
+    breaker_failures INTEGER NOT NULL,
+    opened_at        REAL
+) WITHOUT ROWID;
+"""
+
+TOPIC_FIELDS = ('interval', 'next_run', 'failures', 'yield_avg', 'last_yield', 'last_run')
+PROVIDER_FIELDS = ('tokens', 'updated_at', 'circuit', 'breaker_failures', 'opened_at')
+
+
+class StateStore:
+    """Crash-safe scheduler state in SQLite (WAL mode).
+
+    Every update is a single-row upsert on the primary key, committed on its
+    own, so a crash can never leave a half-written file behind and startup
+    only has to read two small tables.
+    """
+
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: 각 문장이 자체 트랜잭션으로 즉시 커밋됨
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(_SCHEMA)
+
+    def load(self):
+        """Return ``(topics, providers)`` as dicts keyed by (provider, topic) and provider."""
+        topics = {}
+        for row in self.conn.execute(f"SELECT provider, topic, {', '.join(TOPIC_FIELDS)} FROM topic_state"):
+            topics[(row[0], row[1])] = dict(zip(TOPIC_FIELDS, row[2:]))
+        providers = {}
+        for row in self.conn.execute(f"SELECT provider, {', '.join(PROVIDER_FIELDS)} FROM provider_state"):
+            providers[row[0]] = dict(zip(PROVIDER_FIELDS, row[1:]))
+        return topics, providers
+
+    def save_topic(self, state):
+        self.conn.execute(
+            f"""INSERT INTO topic_state (provider, topic, {', '.join(TOPIC_FIELDS)})
+                VALUES (?, ?, {', '.join('?' for _ in TOPIC_FIELDS)})
+                ON CONFLICT (provider, topic) DO UPDATE SET
+                {', '.join(f'{f} = excluded.{f}' for f in TOPIC_FIELDS)}""",
+            (state.provider, state.topic, *(getattr(state, f) for f in TOPIC_FIELDS)),
+        )
+
+    def save_provider(self, name, bucket, breaker):
+        self.conn.execute(
+            f"""INSERT INTO provider_state (provider, {', '.join(PROVIDER_FIELDS)})
+                VALUES (?, {', '.join('?' for _ in PROVIDER_FIELDS)})
+                ON CONFLICT (provider) DO UPDATE SET
+                {', '.join(f'{f} = excluded.{f}' for f in PROVIDER_FIELDS)}""",
+            (name, bucket.tokens, bucket.updated_at, breaker.state, breaker.failures, breaker.opened_at),
+        )
+
+    def close(self):
+        self.conn.close()
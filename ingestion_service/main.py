@@ -0,0 +1,20 @@
+# ingestion_service/main.py
+import asyncio
+import logging
+
+from ingestion.engine import IngestionEngine
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+
+async def main():
+    engine = IngestionEngine()
+    await engine.start()
+    try:
+        await engine.run_forever()
+    finally:
+        await engine.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -17,6 +17,6 @@ IFS=',' read -r -a topics <<< "$KAFKA_TOPICS"
 
 for topic in "${topics[@]}"
 do
-  kafka-topics --create --topic "$topic" --partitions 1 --replication-factor 1 --if-not-exists --bootstrap-server localhost:9092
+  kafka-topics --create --topic "$topic" --partitions "${KAFKA_TOPIC_PARTITIONS:-1}" --replication-factor 1 --if-not-exists --bootstrap-server localhost:9092
   echo "Topic $topic created."
 done